@@ -0,0 +1,145 @@
+"""
+Нагрузочный тест асинхронных конвертеров: count одновременных
+convert() по маленьким файлам, задержка каждого вызова (p50/p99) и
+отзывчивость цикла событий (насколько опаздывает тик раз в 10 мс).
+
+python -m benchmarks.bench_async --count 1000 --kind csv2json
+python -m benchmarks.bench_async --count 1000 --inline-bytes 0  # всё через процессы
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import save_results
+from src.lib.convert_async import INLINE_BYTES, AsyncConverter
+from src.lib.convert_batch import KINDS
+
+TICK = 0.01
+
+
+def percentile(values: list[float], q: float) -> float:
+    "по ближайшему рангу: p99 из 1000 замеров — 990-й по возрастанию"
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def write_inputs(root: Path, count: int, rows: int, kind: str) -> list[Path]:
+    "count файлов по rows строк в форме data/samples/people"
+    people = [
+        {"name": f"user{i}", "age": 20 + i % 50, "city": ("Москва", "SPB")[i % 2]}
+        for i in range(rows)
+    ]
+    suffix = KINDS[kind][0].lstrip("*")
+    paths = []
+    for n in range(count):
+        path = root / f"in{n:05d}{suffix}"
+        if suffix == ".json":
+            path.write_text(json.dumps(people, ensure_ascii=False), encoding="utf-8")
+        else:
+            with path.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(people[0]))
+                writer.writeheader()
+                writer.writerows(people)
+        paths.append(path)
+    return paths
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        planned = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, loop.time() - planned))
+
+
+async def run_load(
+    paths: list[Path], out_dir: Path, kind: str, converter: AsyncConverter
+) -> dict:
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+    suffix = KINDS[kind][1]
+
+    async def one(src: Path) -> None:
+        start = time.perf_counter()
+        await converter.convert(src, out_dir / src.with_suffix(suffix).name, kind)
+        latencies.append(time.perf_counter() - start)
+
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(src) for src in paths))
+    total = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    ms = [x * 1000 for x in latencies]
+    return {
+        "count": len(paths),
+        "seconds": round(total, 3),
+        "per_s": round(len(paths) / total, 1),
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2),
+        "loop_lag_max_ms": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=20, help="строк в файле")
+    parser.add_argument("--kind", choices=sorted(KINDS), default="csv2json")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument(
+        "--inline-bytes",
+        type=int,
+        default=INLINE_BYTES,
+        help="файлы меньше конвертируются в потоках, а не в процессах",
+    )
+    parser.add_argument("--out", help="записать результат в JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "out").mkdir()
+        paths = write_inputs(root, args.count, args.rows, args.kind)
+
+        async def session() -> dict:
+            async with AsyncConverter(
+                jobs=args.jobs,
+                max_concurrency=args.max_concurrency,
+                inline_bytes=args.inline_bytes,
+            ) as converter:
+                return await run_load(paths, root / "out", args.kind, converter)
+
+        result = asyncio.run(session())
+
+    result.update(
+        kind=args.kind,
+        rows=args.rows,
+        jobs=args.jobs,
+        inline_bytes=args.inline_bytes,
+    )
+    print(
+        f"{result['count']} x {args.kind} за {result['seconds']:.2f} с"
+        f" ({result['per_s']:.0f}/с): p50 {result['p50_ms']:.1f} мс,"
+        f" p99 {result['p99_ms']:.1f} мс, max {result['max_ms']:.1f} мс;"
+        f" задержка цикла событий до {result['loop_lag_max_ms']:.1f} мс"
+    )
+    if args.out:
+        save_results(args.out, [result])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+"""
+Бенчмарк конвертеров json_to_csv, csv_to_json, csv_to_xlsx (src.lib) по
+режимам, с исходными версиями из lab05 для сравнения, на синтетических
+наборах в форме data/samples (см. benchmarks/datasets.py).
+
+Каждый замер идёт в отдельном процессе: строк/с, MB/s входа и пиковый RSS.
+
+python -m benchmarks.bench_convert run --rows 1k 100k --columns 3 20 \\
+    --nested 0.2 --ragged 0.05 --out benchmarks/results/convert.json
+python -m benchmarks.bench_convert run --cases csv2json/compact csv2json/lab05 \\
+    --rows 1M --baseline benchmarks/results/convert-baseline.json
+python -m benchmarks.bench_convert compare OLD.json NEW.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.datasets import SHAPES, ensure_dataset, parse_rows
+from benchmarks.harness import (
+    best_time,
+    compare,
+    load_results,
+    run_isolated,
+    save_results,
+)
+
+# конвертер/режим -> (формат входа, суффикс результата)
+CASES = {
+    "json2csv/spill": ("json", ".csv"),
+    "json2csv/two-pass": ("json", ".csv"),
+    "json2csv/ndjson": ("ndjson", ".csv"),
+    "json2csv/lab05": ("json", ".csv"),
+    "csv2json/indent": ("csv", ".json"),
+    "csv2json/compact": ("csv", ".json"),
+    "csv2json/ndjson": ("csv", ".ndjson"),
+    "csv2json/typed": ("csv", ".json"),
+    "csv2json/lab05": ("csv", ".json"),
+    "csv2xlsx/sample": ("csv", ".xlsx"),
+    "csv2xlsx/scan": ("csv", ".xlsx"),
+    "csv2xlsx/lab05": ("csv", ".xlsx"),
+}
+KEYS = ("case", "shape", "rows", "columns", "nested", "ragged")
+DEFAULT_DATA_DIR = Path("benchmarks/.corpus/tables")
+
+
+def _converter(case: str) -> Callable[[str, str], Any]:
+    "функция (вход, выход) для случая; импорт здесь — он не входит в замер"
+    converter, mode = case.split("/")
+    if mode == "lab05":
+        if converter == "csv2xlsx":
+            from src.lab05.csv_xlsx import csv_to_xlsx
+
+            return csv_to_xlsx
+        from src.lab05 import json_csv as lab05
+
+        return lab05.json_to_csv if converter == "json2csv" else lab05.csv_to_json
+
+    if converter == "json2csv":
+        from src.lib.json_csv import json_to_csv
+
+        schema = "two-pass" if mode == "two-pass" else "spill"
+        return lambda src, dst: json_to_csv(src, dst, schema=schema)
+    if converter == "csv2json":
+        from src.lib.json_csv import csv_to_json
+
+        indent = 2 if mode == "indent" else None
+        typed = mode == "typed"
+        return lambda src, dst: csv_to_json(src, dst, indent=indent, types=typed)
+
+    from src.lib.csv_xlsx import csv_to_xlsx
+
+    return lambda src, dst: csv_to_xlsx(src, dst, widths=mode)
+
+
+def measure_case(path: str, case: str, rows: int, repeat: int) -> Dict[str, Any]:
+    "выполняется в дочернем процессе (см. harness.run_isolated)"
+    convert = _converter(case)
+    with tempfile.TemporaryDirectory() as tmp:
+        dst = str(Path(tmp) / f"out{CASES[case][1]}")
+        seconds = best_time(lambda: convert(path, dst), repeat)
+        out_mb = os.path.getsize(dst) / (1024 * 1024)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    return {
+        "seconds": seconds,
+        "rows_s": rows / seconds if seconds else None,
+        "mb_s": size_mb / seconds if seconds else None,
+        "in_mb": round(size_mb, 3),
+        "out_mb": round(out_mb, 3),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'случай':>18} {'строк':>8} {'колонок':>7} {'сек':>8}"
+        f" {'строк/с':>10} {'MB/s':>7} {'RSS MB':>8}"
+    )
+    for rows_text in args.rows:
+        rows = parse_rows(rows_text)
+        for columns in args.columns:
+            for case in args.cases:
+                path = ensure_dataset(
+                    args.data_dir,
+                    CASES[case][0],
+                    args.shape,
+                    rows,
+                    columns=columns,
+                    nested=args.nested,
+                    ragged=args.ragged,
+                    seed=args.seed,
+                )
+                result = run_isolated(measure_case, str(path), case, rows, args.repeat)
+                result.update(
+                    case=case,
+                    shape=args.shape,
+                    rows=rows,
+                    columns=columns,
+                    nested=args.nested,
+                    ragged=args.ragged,
+                )
+                results.append(result)
+                prefix = f"{case:>18} {rows:>8} {columns:>7}"
+                if "error" in result:
+                    print(f"{prefix} ошибка: {result['error']}")
+                    continue
+                rss = result["peak_rss_mb"]
+                print(
+                    f"{prefix} {result['seconds']:>8.3f} {result['rows_s']:>10.0f}"
+                    f" {result['mb_s']:>7.1f} {rss if rss is None else f'{rss:.1f}':>8}"
+                )
+
+    if args.out:
+        save_results(args.out, results)
+        print(f"результаты: {args.out}")
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"baseline обновлён: {args.baseline}")
+        return 0
+    if args.baseline and Path(args.baseline).exists():
+        return report(load_results(args.baseline), results, args.threshold)
+    return 0
+
+
+def report(
+    baseline: List[Dict[str, Any]], current: List[Dict[str, Any]], threshold: float
+) -> int:
+    problems = compare(baseline, current, KEYS, speed="rows_s", threshold=threshold)
+    if not problems:
+        print(f"регрессий нет (порог {threshold:.0%})")
+        return 0
+    print(f"регрессии (порог {threshold:.0%}):")
+    for line in problems:
+        print(f"  {line}")
+    return 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="прогнать бенчмарк")
+    p_run.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    p_run.add_argument("--rows", nargs="+", default=["1k", "100k"])
+    p_run.add_argument("--columns", type=int, nargs="+", default=[3])
+    p_run.add_argument("--shape", choices=SHAPES, default="people")
+    p_run.add_argument(
+        "--nested", type=float, default=0.0, help="доля записей с вложенным meta"
+    )
+    p_run.add_argument(
+        "--ragged", type=float, default=0.0, help="доля строк короче/длиннее заголовка"
+    )
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    p_run.add_argument("--out", help="куда записать результаты (JSON)")
+    p_run.add_argument("--baseline", help="JSON с прошлым прогоном для сравнения")
+    p_run.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="записать этот прогон как baseline вместо сравнения",
+    )
+    p_run.add_argument("--threshold", type=float, default=0.1)
+
+    p_cmp = sub.add_parser("compare", help="сравнить два сохранённых прогона")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "compare":
+        return report(
+            load_results(args.baseline), load_results(args.current), args.threshold
+        )
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline требует --baseline")
+    return run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
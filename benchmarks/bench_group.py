@@ -0,0 +1,169 @@
+"""
+Бенчмарк хранилищ студентов из lab09: Group (CSV), WalGroup (CSV с
+журналом) и SqliteGroup на одном и том же списке fio,birthdate,group,gpa.
+
+Каждый бэкенд мерится в отдельном процессе: загрузка (для SQLite —
+import_csv), точечные запросы, find по длинной и короткой подстроке и
+по префиксу, первый stats и изменения по одной записи; в мс на
+операцию, плюс пиковый RSS. Запросы — лучшее из --repeat: построение
+триграммного индекса при первом find у CSV-бэкендов в них не входит.
+
+python -m benchmarks.bench_group --rows 10k 1M
+python -m benchmarks.bench_group --rows 10M --backends sqlite wal --out r.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.datasets import parse_rows
+from benchmarks.harness import best_time, run_isolated, save_results
+
+BACKENDS = ("csv", "wal", "sqlite")
+OPS = (
+    "load",
+    "get",
+    "by_group",
+    "find",
+    "find_short",
+    "find_prefix",
+    "stats",
+    "add",
+    "update",
+    "remove",
+)
+DEFAULT_DATA_DIR = Path("benchmarks/.corpus/groups")
+
+_SURNAMES = "Иванов Петров Сидоров Смирнов Кузнецов Попов Соколов Лебедев".split()
+_NAMES = "Иван Анна Пётр Мария Алексей Ольга Тимофей Ёжик".split()
+
+
+def _fio(n: int) -> str:
+    "fio уникален: номер строки в конце"
+    return f"{_SURNAMES[n % 8]} {_NAMES[n // 8 % 8]} {n}"
+
+
+def ensure_roster(data_dir: Path, rows: int, seed: int = 42) -> Path:
+    "CSV на rows студентов; уже сгенерированный используем повторно"
+    path = Path(data_dir) / f"students-{rows}-{seed}.csv"
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rnd = random.Random(seed)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("fio", "birthdate", "group", "gpa"))
+        for n in range(rows):
+            writer.writerow(
+                (
+                    _fio(n),
+                    f"{rnd.randint(1998, 2006)}-{rnd.randint(1, 12):02d}-"
+                    f"{rnd.randint(1, 28):02d}",
+                    f"БИВТ-{rnd.randint(20, 25)}-{rnd.randint(1, 12)}",
+                    f"{rnd.uniform(2, 5):.2f}",
+                )
+            )
+    tmp.replace(path)
+    return path
+
+
+def _open(backend: str, src: Path, work: Path) -> Any:
+    if backend == "sqlite":
+        from src.lab09.sqlite_group import SqliteGroup
+
+        group = SqliteGroup(work / "students.db")
+        group.import_csv(src)
+        return group
+
+    from src.lab09 import Group, WalGroup
+
+    path = work / "students.csv"
+    shutil.copyfile(src, path)
+    group = (WalGroup if backend == "wal" else Group)(path)
+    group.get("")  # разбор файла и индексы
+    return group
+
+
+def measure_backend(src: str, backend: str, rows: int, repeat: int) -> Dict[str, Any]:
+    "выполняется в дочернем процессе (см. harness.run_isolated)"
+    from src.lab08.models import Student
+
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        group = _open(backend, Path(src), Path(tmp))
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        group.stats()  # первый: у CSV-бэкендов потом он из кэша
+        timings["stats"] = time.perf_counter() - start
+
+        middle = _fio(rows // 2)
+        queries: Dict[str, Callable[[], Any]] = {
+            "get": lambda: group.get(middle),
+            "by_group": lambda: group.by_group("БИВТ-22-7"),
+            "find": lambda: group.find(str(rows // 2 + 1)),
+            "find_short": lambda: group.find("ёж"),
+            "find_prefix": lambda: group.find("сидоров п", prefix=True, limit=10),
+        }
+        for op, fn in queries.items():
+            timings[op] = best_time(fn, repeat)
+
+        new = Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7)
+        timings["add"] = best_time(lambda: group.add(new), repeat)
+        gpas = iter([3.0, 4.0, 5.0] * repeat)
+        timings["update"] = best_time(
+            lambda: group.update(middle, gpa=next(gpas)), repeat
+        )
+        timings["remove"] = best_time(lambda: group.remove("Беляев Тимофей"), 1)
+
+    return {f"{op}_ms": round(timings[op] * 1000, 3) for op in OPS}
+
+
+def run(args: argparse.Namespace) -> int:
+    results: List[Dict[str, Any]] = []
+    print(f"{'бэкенд':>7} {'строк':>9} " + " ".join(f"{op:>10}" for op in OPS))
+    for rows_text in args.rows:
+        rows = parse_rows(rows_text)
+        src = ensure_roster(args.data_dir, rows, args.seed)
+        for backend in args.backends:
+            result = run_isolated(measure_backend, str(src), backend, rows, args.repeat)
+            result.update(backend=backend, rows=rows)
+            results.append(result)
+            prefix = f"{backend:>7} {rows:>9}"
+            if "error" in result:
+                print(f"{prefix} ошибка: {result['error']}")
+                continue
+            cells = " ".join(f"{result[f'{op}_ms']:>10.2f}" for op in OPS)
+            rss = result["peak_rss_mb"]
+            print(f"{prefix} {cells}  RSS {rss if rss is None else f'{rss:.0f}'} MB")
+
+    if args.out:
+        save_results(args.out, results)
+        print(f"результаты: {args.out}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", nargs="+", default=["10k", "1M"])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", help="куда записать результаты (JSON)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
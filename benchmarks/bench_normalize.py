@@ -0,0 +1,68 @@
+"""
+normalize(): табличная версия (src.lib.text) против исходной посимвольной
+(src.lab03.text, копия до оптимизации).
+
+python -m benchmarks.bench_normalize --size-mb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from src.lab03.text import normalize as normalize_legacy
+from src.lib.text import normalize
+
+SAMPLES = {
+    "ascii": "Hello World log ERROR warning 2025 data-set user_id \t\r\n ,.!?",
+    "cyrillic": "Привет мир Ёлка ёжик по-настоящему ГОД данные \t\r\n ,.!?",
+    "mixed": "Привет World Ёлка emoji 😀 \u200b soft\u00adhyphen \x00ctl\x85 ǅ Straße ,.",
+}
+
+
+def make_text(alphabet: str, size_mb: float, seed: int = 42) -> str:
+    "случайные слова из символов alphabet, примерно size_mb мегабайт"
+    rnd = random.Random(seed)
+    words = alphabet.split(" ")
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    length = 0
+    while length < target:
+        word = rnd.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+def best_of(fn: Callable[[str], str], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'корпус':>10} {'старый, с':>10} {'новый, с':>10} {'ускорение':>10}")
+    for name, alphabet in SAMPLES.items():
+        text = make_text(alphabet, args.size_mb)
+        if normalize(text) != normalize_legacy(text):
+            raise SystemExit(f"{name}: результаты normalize различаются")
+
+        legacy = best_of(normalize_legacy, text, args.repeat)
+        fast = best_of(normalize, text, args.repeat)
+        print(f"{name:>10} {legacy:>10.3f} {fast:>10.3f} {legacy / fast:>9.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""
+Масштабирование count_freq_parallel по числу процессов.
+
+python -m benchmarks.bench_parallel --size-mb 200 --jobs 1 2 4 8 16 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import write_corpus
+from src.lib.text_parallel import count_freq_parallel
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--input", help="готовый файл вместо синтетического")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.input) if args.input else Path(tmp) / "corpus.txt"
+        if not args.input:
+            write_corpus(path, args.size_mb * 1024 * 1024)
+        size_mb = path.stat().st_size / (1024 * 1024)
+
+        print(f"файл: {path} ({size_mb:.1f} MB), CPU: {os.cpu_count()}")
+        print(f"{'jobs':>5} {'сек':>8} {'MB/s':>8} {'ускорение':>10}")
+
+        baseline = None
+        reference = None
+        for jobs in sorted(set(args.jobs)):
+            start = time.perf_counter()
+            freq = count_freq_parallel(path, jobs)
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference = freq
+            elif freq != reference:
+                raise SystemExit(f"jobs={jobs}: результат отличается от jobs=1")
+            if baseline is None:
+                baseline = elapsed
+
+            print(
+                f"{jobs:>5} {elapsed:>8.2f} {size_mb / elapsed:>8.1f}"
+                f" {baseline / elapsed:>9.2f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
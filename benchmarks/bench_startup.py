@@ -0,0 +1,144 @@
+"""
+Время холодного старта CLI: стена (лучший из N запусков) и разбор
+`python -X importtime` — сколько занял импорт и какие модули самые тяжёлые.
+Бюджеты лежат в benchmarks/startup_budget.json; код возврата 1, если
+бюджет превышен или подкоманда загрузила запрещённый модуль.
+
+python -m benchmarks.bench_startup
+python -m benchmarks.bench_startup --repeat 20 --top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BUDGET = Path(__file__).with_name("startup_budget.json")
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    строки -X importtime -> [(модуль, вложенность, собственные мкс, всего мкс)];
+    вложенность 0 — импорт не изнутри другого модуля (в т.ч. ленивый в функции)
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        name = name[1:]
+        level = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), level, int(own), int(cumulative)))
+    return modules
+
+
+def package_import_ms(modules: list[tuple[str, int, int, int]]) -> float:
+    """
+    Импорт, за который отвечает пакет src: всё, что загружено верхнеуровневыми
+    импортами src.* вместе с их зависимостями. Старт самого интерпретатора
+    (encodings, site, runpy) сюда не входит — его не ускорить.
+    """
+    return (
+        sum(
+            total
+            for name, level, _, total in modules
+            if level == 0 and (name == "src" or name.startswith("src."))
+        )
+        / 1000
+    )
+
+
+def wall_ms(argv: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *argv],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure(argv: list[str], repeat: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(proc.stderr)
+    return {
+        "wall_ms": wall_ms(argv, repeat),
+        "import_ms": package_import_ms(modules),
+        "modules": modules,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--budget", type=Path, default=BUDGET)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=0, help="показать N тяжёлых модулей")
+    parser.add_argument("--out", help="записать замеры в JSON")
+    args = parser.parse_args(argv)
+
+    budget = json.loads(args.budget.read_text(encoding="utf-8"))
+    problems = []
+    results = {}
+    # пол: сам интерпретатор с argparse/pathlib — ниже него CLI не стартует
+    floor = wall_ms(["-c", "import argparse, pathlib"], args.repeat)
+    print(f"python + argparse + pathlib: {floor:.1f} мс (ниже стена не опустится)")
+    print(
+        f"{'команда':<22} {'стена, мс':>10} {'бюджет':>7} {'импорт, мс':>11} {'бюджет':>7}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, spec in budget["commands"].items():
+            cmd = [arg.replace("{tmp}", tmp) for arg in spec["argv"]]
+            res = measure(cmd, args.repeat)
+            print(
+                f"{name:<22} {res['wall_ms']:>10.1f} {spec['wall_ms']:>7}"
+                f" {res['import_ms']:>11.1f} {spec['import_ms']:>7}"
+            )
+
+            if res["wall_ms"] > spec["wall_ms"]:
+                problems.append(
+                    f"{name}: старт {res['wall_ms']:.1f} мс > {spec['wall_ms']}"
+                )
+            if res["import_ms"] > spec["import_ms"]:
+                problems.append(
+                    f"{name}: импорт {res['import_ms']:.1f} мс > {spec['import_ms']}"
+                )
+            loaded = {module for module, *_ in res["modules"]}
+            for module in spec.get("forbid", []):
+                if module in loaded:
+                    problems.append(f"{name}: загружен {module}")
+
+            if args.top:
+                heavy = sorted(res["modules"], key=lambda m: m[2], reverse=True)
+                for module, _, own, _ in heavy[: args.top]:
+                    print(f"{'':<24}{module}: {own / 1000:.1f} мс")
+            results[name] = {k: res[k] for k in ("wall_ms", "import_ms")}
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    for line in problems:
+        print(f"превышение: {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
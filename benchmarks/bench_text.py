@@ -0,0 +1,177 @@
+"""
+Бенчмарк текстового пайплайна: normalize, specials2Space, tokenize,
+count_freq, top_n по отдельности и целиком, на синтетических корпусах
+(латиница, кириллица, эмодзи, управляющие символы).
+
+Каждый замер идёт в отдельном процессе: скорость в MB/s и пиковый RSS.
+
+python -m benchmarks.bench_text run --sizes 1MB 10MB --kinds mixed cyrillic \\
+    --out benchmarks/results/text.json --baseline benchmarks/results/baseline.json
+python -m benchmarks.bench_text compare OLD.json NEW.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import KINDS, ensure_corpus, parse_size
+from benchmarks.harness import (
+    best_time,
+    compare,
+    load_results,
+    run_isolated,
+    save_results,
+)
+from src.lib.text import (
+    count_freq,
+    iter_tokens,
+    normalize,
+    specials2Space,
+    tokenize,
+    top_n,
+)
+
+STAGES = (
+    "normalize",
+    "specials2Space",
+    "tokenize",
+    "count_freq",
+    "top_n",
+    "end_to_end",
+    "stream",
+)
+KEYS = ("kind", "size", "stage")
+DEFAULT_CORPUS_DIR = Path("benchmarks/.corpus")
+
+
+def _prepare(path: str, stage: str) -> Callable[[], Any]:
+    """
+    Готовим вход для стадии (он не входит в замер) и отдаём замеряемую
+    функцию. Для end_to_end и stream файл читается внутри замера.
+    """
+    if stage == "end_to_end":
+        return lambda: top_n(
+            count_freq(tokenize(normalize(Path(path).read_text(encoding="utf-8"))))
+        )
+    if stage == "stream":
+
+        def run() -> Any:
+            with open(path, encoding="utf-8") as f:
+                return top_n(count_freq(iter_tokens(f)))
+
+        return run
+
+    raw = Path(path).read_text(encoding="utf-8")
+    if stage == "normalize":
+        return lambda: normalize(raw)
+    if stage == "specials2Space":
+        return lambda: specials2Space(raw)
+
+    text = normalize(raw)
+    if stage == "tokenize":
+        return lambda: tokenize(text)
+    tokens = tokenize(text)
+    if stage == "count_freq":
+        return lambda: count_freq(tokens)
+    freq = count_freq(tokens)
+    if stage == "top_n":
+        return lambda: top_n(freq)
+    raise ValueError(f"неизвестная стадия: {stage}")
+
+
+def measure_stage(path: str, stage: str, repeat: int) -> Dict[str, Any]:
+    "выполняется в дочернем процессе (см. harness.run_isolated)"
+    fn = _prepare(path, stage)
+    seconds = best_time(fn, repeat)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    return {"seconds": seconds, "mb_s": size_mb / seconds if seconds else None}
+
+
+def run(args: argparse.Namespace) -> int:
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'корпус':>9} {'размер':>7} {'стадия':>15} {'сек':>8} {'MB/s':>8} {'RSS MB':>8}"
+    )
+    for kind in args.kinds:
+        for size in args.sizes:
+            path = ensure_corpus(args.corpus_dir, parse_size(size), kind, args.seed)
+            for stage in args.stages:
+                result = run_isolated(measure_stage, str(path), stage, args.repeat)
+                result.update(kind=kind, size=size, stage=stage)
+                results.append(result)
+                if "error" in result:
+                    print(f"{kind:>9} {size:>7} {stage:>15} ошибка: {result['error']}")
+                    continue
+                rss = result["peak_rss_mb"]
+                print(
+                    f"{kind:>9} {size:>7} {stage:>15} {result['seconds']:>8.3f}"
+                    f" {result['mb_s']:>8.1f} {rss if rss is None else f'{rss:.1f}':>8}"
+                )
+
+    if args.out:
+        save_results(args.out, results)
+        print(f"результаты: {args.out}")
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"baseline обновлён: {args.baseline}")
+        return 0
+    if args.baseline and Path(args.baseline).exists():
+        return report(load_results(args.baseline), results, args.threshold)
+    return 0
+
+
+def report(
+    baseline: List[Dict[str, Any]], current: List[Dict[str, Any]], threshold: float
+) -> int:
+    problems = compare(baseline, current, KEYS, threshold=threshold)
+    if not problems:
+        print(f"регрессий нет (порог {threshold:.0%})")
+        return 0
+    print(f"регрессии (порог {threshold:.0%}):")
+    for line in problems:
+        print(f"  {line}")
+    return 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="прогнать бенчмарк")
+    p_run.add_argument("--sizes", nargs="+", default=["1MB", "10MB"])
+    p_run.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    p_run.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    p_run.add_argument("--out", help="куда записать результаты (JSON)")
+    p_run.add_argument("--baseline", help="JSON с прошлым прогоном для сравнения")
+    p_run.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="записать этот прогон как baseline вместо сравнения",
+    )
+    p_run.add_argument("--threshold", type=float, default=0.1)
+
+    p_cmp = sub.add_parser("compare", help="сравнить два сохранённых прогона")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "compare":
+        return report(
+            load_results(args.baseline), load_results(args.current), args.threshold
+        )
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline требует --baseline")
+    return run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
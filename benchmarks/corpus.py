@@ -0,0 +1,120 @@
+"""
+Воспроизводимые синтетические корпуса для бенчмарков текстового пайплайна.
+
+Слова берутся из псевдословаря с распределением Ципфа, так что частоты
+похожи на настоящий текст; один и тот же (kind, size, seed) всегда даёт
+один и тот же файл.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator
+
+KINDS = ("latin", "cyrillic", "emoji", "control", "mixed")
+
+_UNITS = {"": 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+_SYLLABLES = {
+    "latin": "ka to ri en th er on an re in ed nd ha at es st".split(),
+    "cyrillic": "ко то ри ен ст ер он ан ре ин ёл ни па ёж ла ми".split(),
+}
+_EMOJI = list("\U0001f600\U0001f602\U0001f44d\U0001f525\U0001f389❤✨\U0001f680")
+_CONTROL = ["\x00", "\x07", "\x85", "\u200b", "\u00ad", "\ufeff", "\t", "\r\n", "\x1f"]
+_PUNCT = [",", ".", "!", "?", ";", ":", " -", "«", "»", "(", ")"]
+
+
+def parse_size(text: str) -> int:
+    "'512KB', '10MB', '1GB' или число байт"
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", text.upper())
+    if not m:
+        raise ValueError(f"непонятный размер: {text!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2)])
+
+
+def _vocabulary(alphabet: str, rnd: random.Random, size: int = 5000) -> list[str]:
+    syllables = _SYLLABLES[alphabet]
+    words = []
+    for i in range(size):
+        word = "".join(rnd.choice(syllables) for _ in range(rnd.randint(1, 4)))
+        if i % 17 == 0:
+            word += "-" + rnd.choice(syllables) * 2  # слова через дефис
+        if i % 5 == 0:
+            word = word.capitalize()
+        words.append(word)
+    return words
+
+
+def iter_lines(kind: str = "mixed", seed: int = 42) -> Iterator[str]:
+    "бесконечный поток строк корпуса заданного вида"
+    if kind not in KINDS:
+        raise ValueError(f"неизвестный вид корпуса: {kind}")
+    rnd = random.Random(f"{kind}:{seed}")
+
+    words = []
+    if kind in ("latin", "emoji", "control", "mixed"):
+        words += _vocabulary("latin", rnd)
+    if kind in ("cyrillic", "emoji", "control", "mixed"):
+        words += _vocabulary("cyrillic", rnd)
+    rnd.shuffle(words)
+    # Ципф: вес слова ~ 1 / ранг
+    cum_weights = list(accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+
+    extras = []
+    if kind in ("emoji", "mixed"):
+        extras += _EMOJI
+    if kind in ("control", "mixed"):
+        extras += _CONTROL
+
+    while True:
+        line = rnd.choices(words, cum_weights=cum_weights, k=rnd.randint(5, 20))
+        for i in range(len(line)):
+            roll = rnd.random()
+            if roll < 0.08:
+                line[i] += rnd.choice(_PUNCT)
+            elif extras and roll < 0.14:
+                line[i] += rnd.choice(extras)
+        yield " ".join(line) + "\n"
+
+
+def make_text(kind: str, size: int, seed: int = 42) -> str:
+    "корпус в памяти, не меньше size байт в UTF-8"
+    parts = []
+    written = 0
+    for line in iter_lines(kind, seed):
+        if written >= size:
+            break
+        parts.append(line)
+        written += len(line.encode("utf-8"))
+    return "".join(parts)
+
+
+def write_corpus(path: Path, size: int, kind: str = "mixed", seed: int = 42) -> Path:
+    "пишем корпус в файл потоково (для гигабайтных размеров)"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    batch = []
+    with path.open("w", encoding="utf-8", newline="") as f:
+        for line in iter_lines(kind, seed):
+            if written >= size:
+                break
+            batch.append(line)
+            written += len(line.encode("utf-8"))
+            if len(batch) >= 10_000:
+                f.write("".join(batch))
+                batch.clear()
+        f.write("".join(batch))
+    return path
+
+
+def ensure_corpus(corpus_dir: Path, size: int, kind: str, seed: int = 42) -> Path:
+    "файл корпуса в corpus_dir; уже сгенерированный используем повторно"
+    path = Path(corpus_dir) / f"{kind}-{size}-{seed}.txt"
+    if not path.exists() or path.stat().st_size < size:
+        tmp = path.with_suffix(".tmp")
+        write_corpus(tmp, size, kind, seed)
+        tmp.replace(path)
+    return path
@@ -0,0 +1,177 @@
+"""
+Воспроизводимые табличные наборы для бенчмарков конвертеров: записи в
+форме data/samples/people.* и cities.*, дополнительные колонки,
+вложенные значения и «рваные» строки. Один и тот же набор параметров
+всегда даёт один и тот же файл.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+SHAPES = ("people", "cities")
+FORMATS = ("csv", "json", "ndjson")
+
+_BASE = {"people": ["name", "age", "city"], "cities": ["city", "country", "population"]}
+_NAMES = "Alice Bob Carol Dave Eve Иван Мария Пётр Анна Ёжик Zoë Noël".split()
+_CITIES = [
+    ("Moscow", "Russia"),
+    ("SPB", "Russia"),
+    ("Казань", "Россия"),
+    ("Berlin", "Germany"),
+    ("São Paulo", "Brazil"),
+    ("New York, NY", "USA"),  # запятая внутри: поле в кавычках
+]
+_WORDS = "alpha beta gamma дельта эпсилон zeta «эта» theta".split()
+_UNITS = {"": 1, "K": 1_000, "M": 1_000_000}
+
+
+def parse_rows(text: str) -> int:
+    "'1k', '100K', '10M' или число строк"
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KM]?)\s*", text.upper())
+    if not m:
+        raise ValueError(f"непонятное число строк: {text!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2)])
+
+
+def fieldnames(shape: str, columns: int, nested: float) -> List[str]:
+    "колонки набора: базовые, extra1.. до columns, meta при вложенных значениях"
+    names = list(_BASE[shape])
+    names += [f"extra{i}" for i in range(1, columns - len(names) + 1)]
+    if nested:
+        names.append("meta")
+    return names
+
+
+def _extra(rnd: random.Random, i: int) -> Any:
+    kind = i % 3
+    if kind == 0:
+        return rnd.randint(-1000, 10**6)
+    if kind == 1:
+        return round(rnd.uniform(0, 1000), 3)
+    return rnd.choice(_WORDS)
+
+
+def iter_records(
+    shape: str,
+    rows: int,
+    *,
+    columns: int = 3,
+    nested: float = 0.0,
+    ragged: float = 0.0,
+    seed: int = 42,
+) -> Iterator[Dict[str, Any]]:
+    """
+    rows записей-словарей. nested — доля записей, где meta — объект со
+    списком внутри (иначе строка); ragged — доля записей без одного
+    ключа или с поздним ключом note.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"неизвестная форма набора: {shape}")
+    rnd = random.Random(seed)
+    names = fieldnames(shape, columns, nested)
+    for n in range(rows):
+        city, country = rnd.choice(_CITIES)
+        if shape == "people":
+            record: Dict[str, Any] = {
+                "name": f"{rnd.choice(_NAMES)}{n}",
+                "age": rnd.randint(18, 90),
+                "city": city,
+            }
+        else:
+            record = {
+                "city": city,
+                "country": country,
+                "population": rnd.randint(10**4, 2 * 10**7),
+            }
+        for i, name in enumerate(names[3 : len(names) - bool(nested)]):
+            record[name] = _extra(rnd, i)
+        if nested:
+            if rnd.random() < nested:
+                record["meta"] = {"tags": rnd.sample(_WORDS, 2), "score": rnd.random()}
+            else:
+                record["meta"] = rnd.choice(_WORDS)
+        if ragged and rnd.random() < ragged:
+            if rnd.random() < 0.5:
+                del record[rnd.choice(names[1:])]
+            else:
+                record["note"] = rnd.choice(_WORDS)
+        yield record
+
+
+def _cell(value: Any) -> str:
+    # вложенные значения — так же, как их пишет json_to_csv
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def write_dataset(path: Path, fmt: str, shape: str, rows: int, **options: Any) -> Path:
+    """
+    Набор в файл потоково. В CSV рваная запись — строка короче или
+    длиннее заголовка (поле note без колонки).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"неизвестный формат: {fmt}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = iter_records(shape, rows, **options)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            names = fieldnames(
+                shape, options.get("columns", 3), options.get("nested", 0)
+            )
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for record in records:
+                row = [_cell(record.get(k, "")) for k in names]
+                if len(row) > sum(k in record for k in names):
+                    row.pop()  # запись без ключа — строка на поле короче
+                if "note" in record:
+                    row.append(record["note"])
+                writer.writerow(row)
+        elif fmt == "ndjson":
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            f.write("[")
+            for n, record in enumerate(records):
+                f.write(
+                    ("\n" if n == 0 else ",\n") + json.dumps(record, ensure_ascii=False)
+                )
+            f.write("\n]\n")
+    return path
+
+
+def ensure_dataset(
+    data_dir: Path,
+    fmt: str,
+    shape: str,
+    rows: int,
+    *,
+    columns: int = 3,
+    nested: float = 0.0,
+    ragged: float = 0.0,
+    seed: int = 42,
+) -> Path:
+    "файл набора в data_dir; уже сгенерированный используем повторно"
+    name = f"{shape}-{rows}-c{columns}-n{nested}-r{ragged}-{seed}.{fmt}"
+    path = Path(data_dir) / name
+    if not path.exists():
+        tmp = path.with_suffix(".tmp")
+        write_dataset(
+            tmp,
+            fmt,
+            shape,
+            rows,
+            columns=columns,
+            nested=nested,
+            ragged=ragged,
+            seed=seed,
+        )
+        tmp.replace(path)
+    return path
@@ -0,0 +1,144 @@
+"""
+Общие части бенчмарков: замер в отдельном процессе (время и пиковый RSS),
+запись результатов в JSON и сравнение с сохранённым baseline.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+Result = Dict[str, Any]
+
+
+def peak_rss_mb() -> Optional[float]:
+    "пиковый RSS текущего процесса в MB (None, если платформа не умеет)"
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def best_time(fn: Callable[[], Any], repeat: int = 3) -> float:
+    "лучшее из repeat запусков, секунды"
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _child(conn: Any, fn: Callable[..., Result], args: Sequence[Any]) -> None:
+    try:
+        result = fn(*args)
+        result["peak_rss_mb"] = peak_rss_mb()
+        conn.send(result)
+    except BaseException as exc:  # noqa: BLE001 — отдаём родителю любой сбой
+        conn.send({"error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def run_isolated(fn: Callable[..., Result], *args: Any) -> Result:
+    """
+    Запускаем fn(*args) в свежем процессе (spawn), чтобы пиковый RSS
+    относился только к этому замеру. fn должна быть функцией модуля.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(child, fn, args))
+    proc.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = {"error": f"процесс завершился с кодом {proc.exitcode}"}
+    proc.join()
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    "где и на чём мерили: чтобы сравнивать только сравнимое"
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(path: str | Path, results: List[Result]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"environment": environment(), "results": results}
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_results(path: str | Path) -> List[Result]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+
+def compare(
+    baseline: Iterable[Result],
+    current: Iterable[Result],
+    keys: Sequence[str],
+    *,
+    speed: str = "mb_s",
+    threshold: float = 0.1,
+) -> List[str]:
+    """
+    Сравниваем замеры с одинаковыми keys. Регрессия — скорость упала или
+    пиковый RSS вырос больше чем на threshold, а также ошибка в замере,
+    который в базовом прогоне прошёл. Возвращаем описания регрессий.
+    """
+    base = {tuple(r.get(k) for k in keys): r for r in baseline if "error" not in r}
+    problems = []
+    for r in current:
+        key = tuple(r.get(k) for k in keys)
+        old = base.get(key)
+        if old is None:
+            continue
+        name = "/".join(str(k) for k in key)
+        if "error" in r:
+            problems.append(f"{name}: ошибка {r['error']} (в базовом прогоне прошёл)")
+            continue
+
+        if old.get(speed) and r.get(speed) is not None:
+            change = r[speed] / old[speed] - 1
+            if change < -threshold:
+                problems.append(
+                    f"{name}: {speed} {old[speed]:.2f} -> {r[speed]:.2f} ({change:+.0%})"
+                )
+        if old.get("peak_rss_mb") and r.get("peak_rss_mb") is not None:
+            change = r["peak_rss_mb"] / old["peak_rss_mb"] - 1
+            if change > threshold:
+                problems.append(
+                    f"{name}: peak RSS {old['peak_rss_mb']:.1f} -> "
+                    f"{r['peak_rss_mb']:.1f} MB ({change:+.0%})"
+                )
+    return problems
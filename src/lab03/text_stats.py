@@ -7,17 +7,14 @@ from __future__ import annotations
 import sys
 from typing import List
 
-from src.lab03.text import normalize, tokenize, count_freq, top_n  # type: ignore
+from src.lib.text import iter_tokens, count_freq, top_n  # type: ignore
 
 
 def main(argv: List[str]) -> int:
-    data = sys.stdin.read()
+    # stdin читаем кусками, весь текст в память не собираем
+    freq = count_freq(iter_tokens(sys.stdin))
 
-    norm = normalize(data)
-    tokens = tokenize(norm)
-    freq = count_freq(tokens)
-
-    print(f"Всего слов: {len(tokens)}")
+    print(f"Всего слов: {sum(freq.values())}")
     print(f"Уникальных слов: {len(freq)}")
     print("Топ-5:")
 
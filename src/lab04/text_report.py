@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import sys
+import time
 import argparse
+from collections import Counter
 from pathlib import Path
 
 # python3 src/lab04/text_report.py --in data/input.txt --encoding cp1251
+# python3 src/lab04/text_report.py --in data/input.txt --stream
+# python3 src/lab04/text_report.py --in data/input.txt --jobs 8
+# python3 src/lab04/text_report.py --in data/input.txt --no-cache
+# python3 src/lab04/text_report.py --in data/logs "data/extra/*.txt" --jobs 8 --per-file-dir data/reports
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent  # корень
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from src.lab04.io_txt_csv import read_text, write_csv
-from src.lab03 import normalize, tokenize, count_freq, top_n
-
+from src.lib.io_txt_csv import (
+    CHUNK_SIZE,
+    has_magic,
+    positive_int,
+    read_text,
+    read_text_chunks,
+    write_csv,
+)
+from src.lib.text import normalize, tokenize, count_freq, count_freq_stream
+from src.lib.text_cache import FreqCache, count_freq_cached, default_cache_dir
 
 HEADER = ("word", "count")
 
@@ -25,32 +38,137 @@ def newPath(p: str | Path) -> Path:
 
 def betterParser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--in", dest="in_path", default="data/input1.txt")
+    parser.add_argument(
+        "--in",
+        dest="in_paths",
+        nargs="+",
+        default=["data/input1.txt"],
+        help="файлы, каталоги или glob-шаблоны",
+    )
     parser.add_argument("--out", dest="out_path", default="data/report.csv")
     parser.add_argument("--encoding", dest="encoding", default="utf-8")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="читать файл кусками, не загружая его в память целиком",
+    )
+    parser.add_argument("--chunk-size", type=positive_int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="число процессов для подсчёта частот",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="не использовать кэш частот на диске",
+    )
+    parser.add_argument("--cache-dir", help="каталог кэша частот")
+    parser.add_argument(
+        "--pattern",
+        default="*.txt",
+        help="какие файлы брать из каталогов (по умолчанию *.txt)",
+    )
+    parser.add_argument(
+        "--per-file-dir",
+        help="дополнительно писать CSV по каждому файлу в этот каталог",
+    )
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = betterParser().parse_args(argv)
-
-    in_path = newPath(args.in_path)
-    out_path = newPath(args.out_path)
+def countFile(in_path: Path, args: argparse.Namespace) -> dict[str, int]:
+    "частоты слов файла: параллельно, потоково или целиком"
+    if args.jobs > 1:
+        # multiprocessing грузим, только если правда нужны процессы
+        from src.lib.text_parallel import count_freq_parallel
 
-    try:
-        text = read_text(in_path, encoding=args.encoding)
-    except FileNotFoundError:
-        print(f"файл не найден: {in_path}", file=sys.stderr)
-        return 1
-    except UnicodeDecodeError:
+        return count_freq_parallel(in_path, args.jobs, encoding=args.encoding)
+    if args.stream:
+        chunks = read_text_chunks(
+            in_path, encoding=args.encoding, chunk_size=args.chunk_size
+        )
+        return count_freq_stream(chunks)
+    return count_freq(tokenize(normalize(read_text(in_path, encoding=args.encoding))))
+
+
+def corpusFreq(
+    args: argparse.Namespace, cache_dir: str | None
+) -> tuple[dict[str, int], int, int]:
+    """
+    Частоты по всем файлам корпуса; время и скорость по файлам — в stderr.
+    Возвращает (частоты, число файлов, число файлов с ошибкой).
+    """
+    # корпусный режим (и его пул процессов) грузим, только когда он нужен
+    from src.lib.text_corpus import count_corpus, iter_input_files
+
+    files = iter_input_files((newPath(p) for p in args.in_paths), args.pattern)
+    per_file_dir = newPath(args.per_file_dir) if args.per_file_dir else None
+
+    freq: Counter = Counter()
+    count = failed = 0
+    started = time.perf_counter()
+    for res in count_corpus(
+        files,
+        jobs=args.jobs,
+        encoding=args.encoding,
+        cache_dir=cache_dir,
+        per_file_dir=per_file_dir,
+        header=HEADER,
+    ):
+        count += 1
+        if res.error is not None:
+            failed += 1
+            print(f"{res.path}: ошибка: {res.error}", file=sys.stderr)
+            continue
+        freq.update(res.freq)
+        mb = res.size / (1024 * 1024)
+        speed = mb / res.seconds if res.seconds else 0.0
         print(
-            "Ошибка декода. Укажите кодировку, examp: --encoding cp1251",
+            f"{res.path}: {mb:.2f} MB, {res.seconds:.3f} с, {speed:.1f} MB/s",
             file=sys.stderr,
         )
-        return 1
 
-    tokens = tokenize(normalize(text))
-    freq = count_freq(tokens)
+    print(
+        f"Файлов: {count}, с ошибками: {failed},"
+        f" за {time.perf_counter() - started:.2f} с",
+        file=sys.stderr,
+    )
+    return dict(freq), count, failed
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = betterParser().parse_args(argv)
+
+    out_path = newPath(args.out_path)
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+
+    failed = 0
+    single = args.in_paths[0]
+    if len(args.in_paths) > 1 or has_magic(single) or newPath(single).is_dir():
+        freq, count, failed = corpusFreq(args, cache_dir)
+        if not count:
+            print("Не найдено ни одного входного файла", file=sys.stderr)
+            return 1
+        total = sum(freq.values())
+    else:
+        in_path = newPath(single)
+        cache = FreqCache(cache_dir) if cache_dir else None
+        try:
+            freq = count_freq_cached(
+                in_path, lambda: countFile(in_path, args), cache, encoding=args.encoding
+            )
+            total = sum(freq.values())
+        except FileNotFoundError:
+            print(f"файл не найден: {in_path}", file=sys.stderr)
+            return 1
+        except UnicodeDecodeError:
+            print(
+                "Ошибка декода. Укажите кодировку, examp: --encoding cp1251",
+                file=sys.stderr,
+            )
+            return 1
+
     rows = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
 
     try:
@@ -60,13 +178,13 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     # 5) Краткое резюме в консоль
-    print(f"Всего слов: {len(tokens)}")
+    print(f"Всего слов: {total}")
     print(f"Уникальных слов: {len(freq)}")
     print("Топ-5:")
-    for w, c in top_n(freq, 5):
+    for w, c in rows[:5]:
         print(f"{w}:{c}")
 
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -3,15 +3,27 @@
 python -m src.lab06.cli_convert json2csv --in data/samples/people.json --out data/out/people.csv
 python -m src.lab06.cli_convert csv2json --in data/samples/people.csv --out data/out/people.json
 python -m src.lab06.cli_convert csv2xlsx --in data/samples/people.csv --out data/out/people.xlsx
+python -m src.lab06.cli_convert batch json2csv --in data/samples --out-dir data/out/csv --jobs 4
+python -m src.lab06.cli_convert cache build --in data/samples/people.csv --out data/out/people.col
+python -m src.lab06.cli_convert cache info --in data/out/people.col
+python -m src.lab06.cli_convert csv2json --in data/samples/people.csv --out data/out/people.json --cache
 """
 
 from __future__ import annotations
 
 import argparse
+import os
+import sys
+import time
 from pathlib import Path
 
-from src.lab05.json_csv import json_to_csv, csv_to_json
-from src.lab05.csv_xlsx import csv_to_xlsx
+from src.lib.io_txt_csv import positive_int
+
+# Конвертеры импортируются в своих подкомандах: json2csv/csv2json из cron
+# не должны платить за XLSX и пул процессов (см. benchmarks/bench_startup.py).
+# Виды пакетной конвертации — те же имена, что у одиночных подкоманд
+# (src.lib.convert_batch.KINDS), чтобы не грузить модуль ради choices.
+BATCH_KINDS = ("csv2json", "csv2xlsx", "json2csv")
 
 
 def ensure_input_file(path_str: str) -> Path:
@@ -32,12 +44,41 @@ def ensure_output_dir(path_str: str) -> Path:
     return path
 
 
+def dialect_options(args: argparse.Namespace) -> dict:
+    """Переопределения формата CSV из флагов (--delimiter, --quotechar, ...)."""
+    from src.lib.csv_dialect import parse_char
+
+    try:
+        return {
+            "delimiter": parse_char(args.delimiter),
+            "quotechar": parse_char(args.quotechar),
+            "header_check": not args.no_header_check,
+        }
+    except ValueError as exc:
+        raise SystemExit(f"Ошибка: {exc}")
+
+
+def cached_input(args: argparse.Namespace, path: Path, options: dict) -> Path:
+    """С --cache вход читается из колоночного кэша (строится при изменении файла)."""
+    if not args.cache or path.suffix.lower() == ".col":
+        return path
+    from src.lib.columnar import cached
+
+    try:
+        return cached(path, args.cache_dir, **options)
+    except Exception as exc:
+        raise SystemExit(f"Ошибка построения кэша для '{path}': {exc}")
+
+
 def cmd_json2csv(args: argparse.Namespace) -> int:
     input_path = ensure_input_file(args.input)
     output_path = ensure_output_dir(args.output)
+    source = cached_input(args, input_path, {})
+
+    from src.lib.json_csv import json_to_csv
 
     try:
-        json_to_csv(str(input_path), str(output_path))
+        json_to_csv(str(source), str(output_path))
     except Exception as exc:
         raise SystemExit(f"Ошибка конвертации JSON -> CSV: {exc}")
 
@@ -49,8 +90,26 @@ def cmd_csv2json(args: argparse.Namespace) -> int:
     input_path = ensure_input_file(args.input)
     output_path = ensure_output_dir(args.output)
 
+    options = dialect_options(args)
+    source = cached_input(args, input_path, options)
+
+    from src.lib.json_csv import csv_to_json
+
+    types = args.types
     try:
-        csv_to_json(str(input_path), str(output_path))
+        if args.schema:
+            from src.lib.csv_schema import Schema
+
+            types = Schema.load(args.schema)
+        schema = csv_to_json(
+            str(source),
+            str(output_path),
+            indent=None if args.compact else 2,
+            types=types,
+            **options,
+        )
+        if args.save_schema and schema is not None:
+            schema.dump(ensure_output_dir(args.save_schema))
     except Exception as exc:
         raise SystemExit(f"Ошибка конвертации CSV -> JSON: {exc}")
 
@@ -62,8 +121,13 @@ def cmd_csv2xlsx(args: argparse.Namespace) -> int:
     input_path = ensure_input_file(args.input)
     output_path = ensure_output_dir(args.output)
 
+    options = dialect_options(args)
+    source = cached_input(args, input_path, options)
+
+    from src.lib.csv_xlsx import csv_to_xlsx
+
     try:
-        csv_to_xlsx(str(input_path), str(output_path))
+        csv_to_xlsx(str(source), str(output_path), **options)
     except Exception as exc:
         raise SystemExit(f"Ошибка конвертации CSV -> XLSX: {exc}")
 
@@ -71,6 +135,117 @@ def cmd_csv2xlsx(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_batch(args: argparse.Namespace) -> int:
+    """
+    Пакетная конвертация: ошибки по файлам печатаются в stderr и не
+    прерывают пакет, в конце — сводка. Код возврата 1, если были ошибки.
+    """
+    from src.lib.convert_batch import KINDS, convert_batch
+    from src.lib.text_corpus import iter_input_files
+
+    pattern = args.pattern or KINDS[args.kind][0]
+    files = iter_input_files(args.inputs, pattern)
+    options = {}
+    if args.kind in ("csv2json", "csv2xlsx"):
+        options.update(dialect_options(args))
+    if args.kind == "csv2json" and args.compact:
+        options["indent"] = None
+    if args.kind == "csv2json" and args.types:
+        options["types"] = True
+
+    ok = failed = 0
+    started = time.perf_counter()
+    for res in convert_batch(files, args.out_dir, args.kind, jobs=args.jobs, **options):
+        if res.error is not None:
+            failed += 1
+            print(f"Ошибка: {res.src}: {res.error}", file=sys.stderr)
+            continue
+        ok += 1
+        if args.verbose:
+            print(f"Успешно: {res.src} -> {res.dst} ({res.seconds:.3f} с)")
+
+    print(
+        f"Успешно: {ok}, с ошибками: {failed},"
+        f" за {time.perf_counter() - started:.2f} с"
+    )
+    return 1 if failed else 0
+
+
+def cmd_cache_build(args: argparse.Namespace) -> int:
+    input_path = ensure_input_file(args.input)
+    options = dialect_options(args) if input_path.suffix.lower() == ".csv" else {}
+
+    from src.lib import columnar
+
+    try:
+        if args.output:
+            output_path = columnar.build(
+                input_path, ensure_output_dir(args.output), **options
+            )
+        else:
+            output_path = columnar.cached(input_path, args.cache_dir, **options)
+    except Exception as exc:
+        raise SystemExit(f"Ошибка построения кэша: {exc}")
+
+    print(f"Успешно: {input_path} -> {output_path}")
+    return 0
+
+
+def cmd_cache_info(args: argparse.Namespace) -> int:
+    input_path = ensure_input_file(args.input)
+
+    from src.lib.columnar import read_schema
+
+    try:
+        n_rows, schema, _ = read_schema(input_path)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"Ошибка: {exc}")
+
+    source = schema.get("source", {})
+    print(f"Файл: {input_path} ({input_path.stat().st_size} байт)")
+    if source:
+        print(f"Источник: {source.get('path')} ({source.get('size')} байт)")
+    print(f"Строк: {n_rows}, колонок: {len(schema['columns'])}")
+    for column in schema["columns"]:
+        extra = ""
+        if column["type"] == "str":
+            extra = f", различных значений: {column['count']}"
+        elif column.get("nulls"):
+            extra = ", есть пропуски"
+        print(f"  {column['name']}: {column['type']}{extra}")
+    return 0
+
+
+def add_cache_args(parser: argparse.ArgumentParser) -> None:
+    """Флаги колоночного кэша входного файла (src.lib.columnar)."""
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="читать вход через колоночный кэш: повторные конвертации без разбора файла",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="каталог кэша (по умолчанию ~/.cache/labsproga/columnar)",
+    )
+
+
+def add_dialect_args(parser: argparse.ArgumentParser) -> None:
+    """Флаги формата входного CSV (по умолчанию он определяется по образцу)."""
+    parser.add_argument(
+        "--delimiter",
+        help="разделитель полей CSV вместо автоопределения ('\\t' или tab — табуляция)",
+    )
+    parser.add_argument(
+        "--quotechar",
+        help="символ кавычек CSV вместо автоопределения",
+    )
+    parser.add_argument(
+        "--no-header-check",
+        action="store_true",
+        help="не проверять эвристикой, что первая строка — заголовок",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="CLI-конвертеры данных (JSON/CSV/XLSX) для ЛР6 (на основе lab05)."
@@ -90,7 +265,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--in",
         dest="input",
         required=True,
-        help="путь к входному JSON-файлу (.json)",
+        help="путь к входному JSON-файлу (.json, .ndjson, .jsonl) или кэшу .col",
     )
     p_json2csv.add_argument(
         "--out",
@@ -98,6 +273,7 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
         help="путь к выходному CSV-файлу (.csv)",
     )
+    add_cache_args(p_json2csv)
     p_json2csv.set_defaults(func=cmd_json2csv)
 
     p_csv2json = subparsers.add_parser(
@@ -108,14 +284,34 @@ def build_parser() -> argparse.ArgumentParser:
         "--in",
         dest="input",
         required=True,
-        help="путь к входному CSV-файлу (.csv)",
+        help="путь к входному CSV-файлу (.csv) или кэшу .col",
     )
     p_csv2json.add_argument(
         "--out",
         dest="output",
         required=True,
-        help="путь к выходному JSON-файлу (.json)",
+        help="путь к выходному JSON-файлу (.json, либо .ndjson/.jsonl для NDJSON)",
+    )
+    p_csv2json.add_argument(
+        "--compact",
+        action="store_true",
+        help="без отступов (меньше файл и быстрее запись)",
+    )
+    p_csv2json.add_argument(
+        "--types",
+        action="store_true",
+        help="числа, логические значения и null вместо строк (типы выводятся по файлу)",
+    )
+    p_csv2json.add_argument(
+        "--schema",
+        help="готовая схема типов (JSON, см. --save-schema) вместо вывода",
+    )
+    p_csv2json.add_argument(
+        "--save-schema",
+        help="сохранить использованную схему типов в JSON-файл",
     )
+    add_dialect_args(p_csv2json)
+    add_cache_args(p_csv2json)
     p_csv2json.set_defaults(func=cmd_csv2json)
 
     p_csv2xlsx = subparsers.add_parser(
@@ -126,7 +322,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--in",
         dest="input",
         required=True,
-        help="путь к входному CSV-файлу (.csv)",
+        help="путь к входному CSV-файлу (.csv) или кэшу .col",
     )
     p_csv2xlsx.add_argument(
         "--out",
@@ -134,8 +330,90 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
         help="путь к выходному XLSX-файлу (.xlsx)",
     )
+    add_dialect_args(p_csv2xlsx)
+    add_cache_args(p_csv2xlsx)
     p_csv2xlsx.set_defaults(func=cmd_csv2xlsx)
 
+    p_batch = subparsers.add_parser(
+        "batch",
+        help="пакетная конвертация каталогов и glob-шаблонов в пуле процессов",
+    )
+    p_batch.add_argument("kind", choices=BATCH_KINDS, help="вид конвертации")
+    p_batch.add_argument(
+        "--in",
+        dest="inputs",
+        nargs="+",
+        required=True,
+        help="входные файлы, каталоги (обходятся рекурсивно) или glob-шаблоны",
+    )
+    p_batch.add_argument(
+        "--out-dir",
+        required=True,
+        help="каталог результатов (структура подкаталогов сохраняется)",
+    )
+    p_batch.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="число процессов (по умолчанию — по числу CPU)",
+    )
+    p_batch.add_argument(
+        "--pattern",
+        help="шаблон файлов при обходе каталогов (по умолчанию *.json или *.csv)",
+    )
+    p_batch.add_argument(
+        "--compact",
+        action="store_true",
+        help="для csv2json: JSON без отступов",
+    )
+    p_batch.add_argument(
+        "--types",
+        action="store_true",
+        help="для csv2json: типизированные значения, схема выводится по каждому файлу",
+    )
+    p_batch.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="печатать каждый успешно сконвертированный файл",
+    )
+    add_dialect_args(p_batch)
+    p_batch.set_defaults(func=cmd_batch)
+
+    p_cache = subparsers.add_parser(
+        "cache",
+        help="колоночный кэш CSV/JSON: построение и просмотр",
+    )
+    cache_commands = p_cache.add_subparsers(dest="cache_command", required=True)
+
+    p_build = cache_commands.add_parser("build", help="построить кэш для файла")
+    p_build.add_argument(
+        "--in",
+        dest="input",
+        required=True,
+        help="путь к входному CSV или JSON-файлу",
+    )
+    p_build.add_argument(
+        "--out",
+        dest="output",
+        help="путь к файлу кэша (.col); без него — в каталоге кэша",
+    )
+    p_build.add_argument(
+        "--cache-dir",
+        help="каталог кэша (по умолчанию ~/.cache/labsproga/columnar)",
+    )
+    add_dialect_args(p_build)
+    p_build.set_defaults(func=cmd_cache_build)
+
+    p_info = cache_commands.add_parser("info", help="схема и размер файла кэша")
+    p_info.add_argument(
+        "--in",
+        dest="input",
+        required=True,
+        help="путь к файлу кэша (.col)",
+    )
+    p_info.set_defaults(func=cmd_cache_info)
+
     return parser
 
 
@@ -148,3 +426,7 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,12 @@
 
 python -m src.lab06.cli_text stats --input data/samples/text.txt
 python -m src.lab06.cli_text stats --input data/samples/text.txt --top 10
+python -m src.lab06.cli_text stats --input data/samples/text.txt --stream
+python -m src.lab06.cli_text stats --input data/samples/text.txt --jobs 8
+python -m src.lab06.cli_text stats --input data/samples/text.txt --mmap
+python -m src.lab06.cli_text stats --input data/samples/text.txt --no-cache
+python -m src.lab06.cli_text stats --input logs/app.log --incremental
+python -m src.lab06.cli_text stats --input data/samples/text.txt --approx --capacity 1000
 python -m src.lab06.cli_text cat --input data/samples/text.txt
 python -m src.lab06.cli_text cat --input data/samples/text.txt -n
 """
@@ -10,27 +16,96 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import List
 
-from src.lab03 import normalize, tokenize, count_freq, top_n
+from src.lib.io_txt_csv import CHUNK_SIZE, positive_int, read_text_chunks
+from src.lib.text import (
+    SpaceSaving,
+    count_freq,
+    iter_tokens,
+    normalize,
+    tokenize,
+    top_n,
+)
+from src.lib.text_cache import FreqCache, count_freq_cached, default_cache_dir
 
+# движки --jobs/--mmap/--incremental импортируются в ветках, которые их
+# используют: CLI запускают часто, и платить за multiprocessing каждый раз
+# незачем (см. benchmarks/bench_startup.py)
 
-def cmd_stats(args: argparse.Namespace) -> int:
 
-    input_path = Path(args.input)
+def stats_approx(input_path: Path, args: argparse.Namespace) -> int:
+    """Приближённый топ с ограниченной памятью (Space-Saving)."""
+    summary = SpaceSaving(max(args.capacity, args.top))
 
     try:
-        raw = input_path.read_text(encoding="utf-8")
+        chunks = read_text_chunks(input_path, chunk_size=args.chunk_size)
+        summary.update(iter_tokens(chunks))
     except FileNotFoundError:
         raise SystemExit(f"Ошибка: файл '{input_path}' не найден")
     except OSError as exc:
         raise SystemExit(f"Ошибка при чтении файла '{input_path}': {exc}")
 
+    print(f"Всего слов: {summary.total}")
+    if summary.exact:
+        print(f"Уникальных слов: {len(summary.counts)}")
+    else:
+        print(f"Уникальных слов: больше {summary.capacity}")
+
+    top_n_value = args.top
+    print(f"Топ-{top_n_value}:" if summary.exact else f"Топ-{top_n_value} (оценка):")
+
+    for word, count in summary.top(top_n_value):
+        print(f"{word}:{count}")
+
+    return 0
+
+
+def count_file(input_path: Path, args: argparse.Namespace) -> dict[str, int]:
+    """Частоты слов файла выбранным способом (результат у всех одинаковый)."""
+    if args.jobs > 1:
+        from src.lib.text_parallel import count_freq_parallel
+
+        return count_freq_parallel(input_path, args.jobs)
+    if args.mmap:
+        from src.lib.text_mmap import count_freq_mmap
+
+        return count_freq_mmap(input_path)
+    if args.stream:
+        chunks = read_text_chunks(input_path, chunk_size=args.chunk_size)
+        return count_freq(iter_tokens(chunks))
+
+    raw = input_path.read_text(encoding="utf-8")
     norm = normalize(raw)
-    tokens: List[str] = tokenize(norm)
-    freq = count_freq(tokens)
+    tokens: list[str] = tokenize(norm)
+    return count_freq(tokens)
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+
+    input_path = Path(args.input)
+    if args.approx:
+        return stats_approx(input_path, args)
+
+    cache_dir = args.cache_dir or default_cache_dir()
+    cache = None if args.no_cache else FreqCache(cache_dir)
+
+    try:
+        if args.incremental:
+            from src.lib.text_incremental import count_freq_incremental, state_path_for
+
+            state_path = state_path_for(cache_dir, input_path)
+            freq = count_freq_incremental(input_path, state_path)
+        else:
+            freq = count_freq_cached(
+                input_path, lambda: count_file(input_path, args), cache
+            )
+    except FileNotFoundError:
+        raise SystemExit(f"Ошибка: файл '{input_path}' не найден")
+    except OSError as exc:
+        raise SystemExit(f"Ошибка при чтении файла '{input_path}': {exc}")
 
-    print(f"Всего слов: {len(tokens)}")
+    total = sum(freq.values())
+    print(f"Всего слов: {total}")
     print(f"Уникальных слов: {len(freq)}")
 
     top_n_value = args.top
@@ -86,10 +161,57 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_stats.add_argument(
         "--top",
-        type=int,
+        type=positive_int,
         default=5,
         help="сколько наиболее частых слов вывести (по умолчанию 5)",
     )
+    p_stats.add_argument(
+        "--stream",
+        action="store_true",
+        help="читать файл кусками, не загружая его в память целиком",
+    )
+    p_stats.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=CHUNK_SIZE,
+        help=f"размер куска в символах для --stream (по умолчанию {CHUNK_SIZE})",
+    )
+    p_stats.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="число процессов для подсчёта частот (по умолчанию 1)",
+    )
+    p_stats.add_argument(
+        "--mmap",
+        action="store_true",
+        help="отобразить файл в память и разбирать байты, не декодируя весь текст",
+    )
+    p_stats.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="не использовать кэш частот на диске",
+    )
+    p_stats.add_argument(
+        "--cache-dir",
+        help=f"каталог кэша и --incremental (по умолчанию {default_cache_dir()})",
+    )
+    p_stats.add_argument(
+        "--incremental",
+        action="store_true",
+        help="для дописываемых логов: считать только новые байты с прошлого запуска",
+    )
+    p_stats.add_argument(
+        "--approx",
+        action="store_true",
+        help="приближённый топ с ограниченной памятью (для огромных потоков)",
+    )
+    p_stats.add_argument(
+        "--capacity",
+        type=positive_int,
+        default=10_000,
+        help="сколько слов помнить в режиме --approx (по умолчанию 10000)",
+    )
     p_stats.set_defaults(func=cmd_stats)
 
     # ---- cat ----
@@ -121,3 +243,7 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,5 @@
 from .group import Group
+from .sqlite_group import SqliteGroup
+from .wal import WalGroup
 
-__all__ = ["Group"]
\ No newline at end of file
+__all__ = ["Group", "SqliteGroup", "WalGroup"]
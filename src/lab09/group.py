@@ -1,16 +1,47 @@
 from __future__ import annotations
 
 import csv
+import os
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 from src.lab08.models import Student
 
+# триграммный индекс для find: ключ — 3 символа casefold(fio), значение —
+# позиции строк по возрастанию. Перед fio — GRAM-1 меток начала строки:
+# тогда и короткий префикс («и», «ив») покрыт триграммами
+GRAM = 3
+_PREFIX_MARK = "\x02" * (GRAM - 1)
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _index_grams(index: dict[str, array], i: int, fio: str) -> None:
+    # из триграмм не удаляем: устаревшие позиции отсеет проверка в iter_find
+    for gram in _grams(_PREFIX_MARK + fio.casefold()):
+        positions = index.setdefault(gram, array("I"))
+        if not positions or positions[-1] < i:
+            positions.append(i)  # добавление в конец таблицы — обычный случай
+            continue
+        k = bisect_left(positions, i)
+        if positions[k] != i:
+            positions.insert(k, i)
+
 
 class StorageFormatError(ValueError):
     """Ошибки формата CSV-хранилища (заголовок/колонки/битые строки)."""
 
 
+class ConcurrentModificationError(RuntimeError):
+    """Файл хранилища изменили снаружи, пока в batch копились изменения."""
+
+
 class Group:
     """
     CSV-хранилище студентов (CRUD).
@@ -23,6 +54,20 @@ class Group:
 
     def __init__(self, storage_path: str | Path):
         self.path = Path(storage_path)
+        # разобранная таблица и индексы; перечитываем, только когда файл
+        # сменился: (mtime, размер, inode) не совпали с запомненными
+        # (None на месте строки — удалена после чтения файла: позиции в
+        # индексах не сдвигаются)
+        self._rows: list[dict[str, str] | None] = []
+        self._by_fio: dict[str, set[int]] = {}
+        self._by_group: dict[str, set[int]] = {}
+        # триграммы строим при первом find, дальше поддерживаем в _index
+        self._grams: dict[str, array] | None = None
+        self._stamp: tuple | None = None
+        self._stats: dict[str, Any] | None = None
+        # внутри batch() изменения копятся в памяти и пишутся при выходе
+        self._batch_depth = 0
+        self._pending: list[tuple] = []
         self._ensure_storage_exists()
 
     # -------------------------
@@ -36,12 +81,15 @@ class Group:
             self._write_header_only()
             return
 
-        text = self.path.read_text(encoding="utf-8")
-        if not text.strip():
+        # для проверки заголовка хватает первой строки
+        with self.path.open("r", encoding="utf-8") as f:
+            first_line = f.readline()
+            empty = not first_line.strip() and not f.read().strip()
+        if empty:
             self._write_header_only()
             return
 
-        first_line = text.splitlines()[0].strip()
+        first_line = first_line.strip()
         expected = ",".join(self.FIELDS)
         if first_line != expected:
             raise StorageFormatError(
@@ -50,6 +98,125 @@ class Group:
                 f"Фактически: {first_line}"
             )
 
+    def _file_stamp(self) -> tuple | None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _table(self) -> list[dict[str, str] | None]:
+        """Строки таблицы из памяти; файл разбираем заново, только если он сменился."""
+        if self._batch_depth:  # в batch память новее файла
+            return self._rows
+        stamp = self._file_stamp()
+        if stamp is None or stamp != self._stamp:
+            # штамп берём до чтения: правка во время чтения даст новый штамп
+            # и перечитывание при следующем обращении
+            rows = self._load_rows()
+            self._set_rows(rows, stamp if stamp is not None else self._file_stamp())
+        return self._rows
+
+    def _live_rows(self) -> list[dict[str, str]]:
+        return [r for r in self._table() if r is not None]
+
+    def _set_rows(self, rows: list[dict[str, str] | None], stamp: tuple | None) -> None:
+        """Запоминает таблицу и строит индексы по fio и group."""
+        self._rows = rows
+        by_fio: dict[str, set[int]] = {}
+        by_group: dict[str, set[int]] = {}
+        for i, r in enumerate(rows):
+            if r is not None:
+                by_fio.setdefault(r["fio"], set()).add(i)
+                by_group.setdefault(r["group"], set()).add(i)
+        self._by_fio = by_fio
+        self._by_group = by_group
+        self._grams = None
+        self._stamp = stamp
+        self._stats = None
+
+    def _restore_rows(self, saved: list[dict[str, str] | None]) -> None:
+        """
+        Откат batch к копии таблицы, снятой на входе (в batch строки только
+        подменяют и дописывают): индексы правим лишь в изменённых позициях,
+        триграммы не строим заново.
+        """
+        rows = self._rows
+        for i, row in enumerate(rows):
+            old = saved[i] if i < len(saved) else None
+            if row is old:
+                continue
+            if row is not None:
+                self._unindex(i, row)
+            if old is not None:
+                self._index(i, old)
+        if self._grams is not None and len(rows) > len(saved):
+            # позиции отменённых добавлений — в хвосте каждого списка
+            for positions in self._grams.values():
+                while positions and positions[-1] >= len(saved):
+                    positions.pop()
+        self._rows = saved
+        self._stats = None
+
+    def _drop_tombstones(self, stamp: tuple | None) -> None:
+        """
+        Таблица без удалённых строк, позиции подряд (после свёртки хранилища).
+        Триграммы переносим на новые позиции, а не строим заново.
+        """
+        rows, grams = self._rows, self._grams
+        live = [r for r in rows if r is not None]
+        if grams is not None and len(live) < len(rows):
+            where = []  # старая позиция -> новая, -1 у удалённых
+            n = 0
+            for r in rows:
+                where.append(-1 if r is None else n)
+                n += r is not None
+            moved = {}
+            for gram, positions in grams.items():
+                kept = [j for j in map(where.__getitem__, positions) if j >= 0]
+                if kept:
+                    moved[gram] = array("I", kept)
+            grams = moved
+        self._set_rows(live, stamp)
+        self._grams = grams
+
+    def _index(self, i: int, row: dict[str, str]) -> None:
+        self._by_fio.setdefault(row["fio"], set()).add(i)
+        self._by_group.setdefault(row["group"], set()).add(i)
+        if self._grams is not None:
+            _index_grams(self._grams, i, row["fio"])
+
+    def _gram_index(self) -> dict[str, array]:
+        if self._grams is None:
+            # позиции идут по возрастанию — просто дописываем, без bisect
+            lists: dict[str, list[int]] = {}
+            for i, r in enumerate(self._rows):
+                if r is None:
+                    continue
+                for gram in _grams(_PREFIX_MARK + r["fio"].casefold()):
+                    positions = lists.get(gram)
+                    if positions is None:
+                        lists[gram] = [i]
+                    else:
+                        positions.append(i)
+            self._grams = {gram: array("I", p) for gram, p in lists.items()}
+        return self._grams
+
+    def _unindex(self, i: int, row: dict[str, str]) -> None:
+        for index, key in ((self._by_fio, row["fio"]), (self._by_group, row["group"])):
+            positions = index[key]
+            positions.discard(i)
+            if not positions:
+                del index[key]
+
+    def _lookup(self, field: str, key: str) -> list[Student]:
+        rows = self._table()  # может перечитать файл и пересобрать индексы
+        index = self._by_fio if field == "fio" else self._by_group
+        return [
+            self._student_from_row(rows[i])  # type: ignore[arg-type]
+            for i in sorted(index.get((key or "").strip(), ()))
+        ]
+
     def _write_header_only(self) -> None:
         with self.path.open("w", encoding="utf-8", newline="") as f:
             writer = csv.DictWriter(f, fieldnames=list(self.FIELDS))
@@ -78,15 +245,55 @@ class Group:
 
             return rows
 
+    def _load_rows(self) -> list[dict[str, str] | None]:
+        """Таблица из хранилища (для CSV — просто строки файла)."""
+        return self._read_all_rows()  # type: ignore[return-value]
+
     def _write_all_rows(self, rows: list[dict[str, Any]]) -> None:
         """Перезаписывает файл (заголовок + rows)."""
         tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
         with tmp_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=list(self.FIELDS))
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({k: row.get(k, "") for k in self.FIELDS})
+            # csv.writer по спискам: тот же текст, что у DictWriter, но быстрее
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            writer.writerows([row.get(k, "") for k in self.FIELDS] for row in rows)
         tmp_path.replace(self.path)
+        # таблицу в памяти не трогаем: rows — её живые строки, а позиции
+        # (с удалёнными) остаются прежними вместе с индексами
+        self._stamp = self._file_stamp()
+
+    def _commit(self, ops: list[tuple]) -> None:
+        """
+        Изменения уже внесены в таблицу в памяти; ops — они же записями
+        ("add", row), ("set", i, row), ("del", i), где i — позиция в таблице.
+        В batch только копим их, иначе сохраняем.
+        """
+        self._stats = None
+        if self._batch_depth:
+            self._pending.extend(ops)
+            return
+        try:
+            self._persist(ops)
+        except BaseException:
+            self._stamp = None  # память и файл разошлись — перечитаем файл
+            raise
+
+    def _persist(self, ops: list[tuple]) -> None:
+        """CSV: одни добавления дописываем в конец файла, иначе атомарно перезаписываем его."""
+        if all(op[0] == "add" for op in ops):
+            with self.path.open("a", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerows([op[1][k] for k in self.FIELDS] for op in ops)
+            self._stamp = self._file_stamp()
+        else:
+            self._write_all_rows([r for r in self._rows if r is not None])
+
+    def _check_fields(self, fields: Iterable[str]) -> None:
+        bad = set(fields) - set(self.FIELDS)
+        if bad:
+            raise ValueError(
+                f"Недопустимые поля для update: {sorted(bad)}. Разрешены: {list(self.FIELDS)}"
+            )
 
     def _student_from_row(self, row: dict[str, str]) -> Student:
         """
@@ -105,6 +312,21 @@ class Group:
 
         return Student(fio=fio, birthdate=birthdate, group=group, gpa=gpa)
 
+    def _changed_row(
+        self, row: dict[str, str], changes: Mapping[str, Any]
+    ) -> dict[str, str]:
+        """Копия row с изменёнными полями; проверяется, что она собирается в Student."""
+        r = dict(row)
+        for k, v in changes.items():
+            if k == "gpa":
+                r[k] = "" if v is None else str(float(v))
+            else:
+                r[k] = "" if v is None else str(v).strip()
+
+        # валидация после изменения
+        _ = self._student_from_row(r)
+        return r
+
     def _row_from_student(self, student: Student) -> dict[str, str]:
         """Student -> dict для CSV + валидация через Student."""
         d = student.to_dict()
@@ -130,43 +352,102 @@ class Group:
     # -------------------------
     def list(self) -> list[Student]:
         """Вернуть всех студентов списком Student."""
-        return [self._student_from_row(r) for r in self._read_all_rows()]
+        return [self._student_from_row(r) for r in self._live_rows()]
 
     def add(self, student: Student) -> None:
         """Добавить нового студента в CSV (append)."""
-        self._ensure_storage_exists()
-        row = self._row_from_student(student)
+        self.add_many([student])
 
-        with self.path.open("a", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=list(self.FIELDS))
-            writer.writerow(row)
+    def add_many(self, students: Iterable[Student]) -> int:
+        """
+        Добавить студентов одной дозаписью в файл. Валидируются все до
+        записи: при ошибке не добавляется никто. Возвращает количество.
+        """
+        new_rows = [self._row_from_student(s) for s in students]
+        rows = self._table()
+        if not new_rows:
+            return 0
+
+        for row in new_rows:
+            self._index(len(rows), row)
+            rows.append(row)
+        self._commit([("add", row) for row in new_rows])
+        return len(new_rows)
+
+    def get(self, fio: str) -> list[Student]:
+        """Студенты с точно таким fio (по индексу, без просмотра таблицы)."""
+        return self._lookup("fio", fio)
 
-    def find(self, substr: str) -> list[Student]:
+    def by_group(self, group: str) -> list[Student]:
+        """Студенты группы group (по индексу)."""
+        return self._lookup("group", group)
+
+    def find(
+        self, substr: str, *, prefix: bool = False, limit: int | None = None
+    ) -> list[Student]:
         """Найти студентов по подстроке в fio (без учёта регистра)."""
-        needle = (substr or "").casefold()
-        if not needle:
-            return []
+        return list(self.iter_find(substr, prefix=prefix, limit=limit))
 
-        result: list[Student] = []
-        for r in self._read_all_rows():
-            if needle in r["fio"].casefold():
-                result.append(self._student_from_row(r))
-        return result
+    def iter_find(
+        self, substr: str, *, prefix: bool = False, limit: int | None = None
+    ) -> Iterator[Student]:
+        """
+        Студенты, у которых fio содержит substr (prefix=True — начинается с
+        него), без учёта регистра, в порядке таблицы, не больше limit.
+        Лениво: Student собирается, только когда до него дошли.
+
+        Кандидаты — позиции самой редкой триграммы запроса, каждая
+        проверяется по самой строке. Подстрока короче трёх символов
+        индексом не покрыта — просматриваем таблицу.
+        """
+        needle = (substr or "").casefold()
+        if not needle or limit == 0:
+            return
+        rows = self._table()
+        key = _PREFIX_MARK + needle if prefix else needle
+        candidates: Iterable[int]
+        if len(key) >= GRAM:
+            index = self._gram_index()
+            postings = [index.get(gram) for gram in _grams(key)]
+            if not all(postings):
+                return
+            # копия: таблицу могут менять, пока идёт перебор
+            candidates = min(postings, key=len)[:]  # type: ignore[arg-type, index]
+        else:
+            candidates = range(len(rows))
+
+        found = 0
+        for i in candidates:
+            r = rows[i]
+            if r is None:
+                continue
+            fio = r["fio"].casefold()
+            if fio.startswith(needle) if prefix else needle in fio:
+                yield self._student_from_row(r)
+                found += 1
+                if found == limit:
+                    return
 
     def remove(self, fio: str) -> int:
         """Удалить запись(и) с данным fio. Возвращает количество удалённых."""
-        target = (fio or "").strip()
-        if not target:
-            return 0
+        return self.remove_many([fio])
 
-        rows = self._read_all_rows()
-        kept = [r for r in rows if r["fio"] != target]
-        removed = len(rows) - len(kept)
+    def remove_many(self, fios: Iterable[str]) -> int:
+        """Удалить записи с любым из fios одной перезаписью файла (в batch — без неё)."""
+        targets = {(fio or "").strip() for fio in fios} - {""}
+        if not targets:
+            return 0
 
-        if removed:
-            self._write_all_rows(kept)
+        rows = self._table()
+        hits = {i for fio in targets for i in self._by_fio.get(fio, ())}
+        if not hits:
+            return 0
 
-        return removed
+        for i in hits:
+            self._unindex(i, rows[i])  # type: ignore[arg-type]
+            rows[i] = None
+        self._commit([("del", i) for i in sorted(hits)])
+        return len(hits)
 
     def update(self, fio: str, **fields: Any) -> int:
         """
@@ -178,34 +459,101 @@ class Group:
         if not target:
             return 0
 
-        allowed = set(self.FIELDS)
-        bad = set(fields.keys()) - allowed
-        if bad:
-            raise ValueError(
-                f"Недопустимые поля для update: {sorted(bad)}. Разрешены: {list(self.FIELDS)}"
-            )
-
-        rows = self._read_all_rows()
-        updated = 0
+        self._check_fields(fields)
+        return self.update_many({target: fields})
 
-        for r in rows:
-            if r["fio"] != target:
-                continue
-
-            for k, v in fields.items():
-                if k == "gpa":
-                    r[k] = "" if v is None else str(float(v))
-                else:
-                    r[k] = "" if v is None else str(v).strip()
-
-            # валидация после изменения
-            _ = self._student_from_row(r)
-            updated += 1
+    def update_many(
+        self,
+        target: Mapping[str, Mapping[str, Any]] | Callable[[Student], bool],
+        **fields: Any,
+    ) -> int:
+        """
+        Обновить записи одной перезаписью файла (в batch — без неё):
+          update_many({fio: {поле: значение, ...}, ...}) — свои поля для каждого fio;
+          update_many(predicate, поле=значение, ...) — одни поля для всех
+          студентов, для которых predicate(student) истинно.
+        Ошибка валидации любой записи -> ValueError, ничего не меняется.
+        Возвращает количество обновлённых записей.
+        """
+        rows = self._table()
+        plan: dict[int, Mapping[str, Any]] = {}
+        if callable(target):
+            self._check_fields(fields)
+            plan = {
+                i: fields
+                for i, r in enumerate(rows)
+                if r is not None and target(self._student_from_row(r))
+            }
+        else:
+            if fields:
+                raise TypeError("Поля задаются либо словарём по fio, либо с предикатом")
+            for fio, changes in target.items():
+                self._check_fields(changes)
+                # "A" и "A " — одна запись: правки сливаем, считаем её один раз
+                for i in self._by_fio.get(fio.strip(), ()):
+                    plan[i] = {**plan.get(i, {}), **changes}
+        if not plan:
+            return 0
 
-        if updated:
-            self._write_all_rows(rows)
+        # сначала собираем и проверяем все новые строки, потом подменяем:
+        # при ошибке валидации таблица в памяти не меняется
+        updated = [
+            (i, self._changed_row(rows[i], changes))  # type: ignore[arg-type]
+            for i, changes in plan.items()
+        ]
+
+        for i, r in updated:
+            self._unindex(i, rows[i])  # type: ignore[arg-type]
+            rows[i] = r
+            self._index(i, r)
+        self._commit([("set", i, r) for i, r in updated])
+        return len(updated)
+
+    @contextmanager
+    def batch(self) -> Iterator[Group]:
+        """
+        Изменения внутри блока копятся в памяти и при выходе записываются
+        одной атомарной перезаписью файла. Исключение в блоке (в том числе
+        ошибка валидации) откатывает их все, файл не трогается. Если файл
+        за это время изменили снаружи — ConcurrentModificationError.
+        Вложенные batch() входят во внешний; исключение во вложенном
+        откатывает только его изменения — как точка сохранения в SqliteGroup.
+        """
+        if self._batch_depth:
+            saved = list(self._rows)
+            done = len(self._pending)
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                del self._pending[done:]
+                self._restore_rows(saved)
+                raise
+            finally:
+                self._batch_depth -= 1
+            return
 
-        return updated
+        saved = list(self._table())
+        stamp = self._stamp
+        self._batch_depth = 1
+        self._pending = []
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth = 0
+            self._pending = []
+            self._restore_rows(saved)
+            raise
+        self._batch_depth = 0
+        ops, self._pending = self._pending, []
+        if not ops:
+            return
+        if self._file_stamp() != stamp:
+            self._stamp = None  # при следующем обращении перечитаем файл
+            raise ConcurrentModificationError(
+                f"Файл {self.path} изменён во время batch, изменения не записаны"
+            )
+        self._commit(ops)
 
     # -------------------------
     # ★ (опционально) статистика
@@ -214,7 +562,19 @@ class Group:
         """
         Возвращает статистику как в README:
         count, min_gpa, max_gpa, avg_gpa, groups, top_5_students
+        Результат считается один раз на версию файла.
         """
+        self._table()
+        if self._stats is None:
+            self._stats = self._compute_stats()
+        stats = self._stats
+        return {
+            **stats,
+            "groups": dict(stats["groups"]),
+            "top_5_students": [dict(s) for s in stats["top_5_students"]],
+        }
+
+    def _compute_stats(self) -> dict[str, Any]:
         students = self.list()
 
         gpas: list[float] = []
@@ -248,4 +608,4 @@ def _can_float(x: Any) -> bool:
         float(x)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
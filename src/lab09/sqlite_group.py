@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import csv
+import sqlite3
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.lab08.models import Student
+
+from .group import Group, StorageFormatError
+
+SCHEMA_VERSION = 1
+IMPORT_CHUNK = 10_000  # строк на один executemany при импорте
+
+_COLUMNS = 'id, fio, birthdate, "group", gpa'
+_NUMERIC = "typeof(gpa) IN ('integer', 'real')"
+
+_SCHEMA = """
+CREATE TABLE students (
+    id INTEGER PRIMARY KEY,
+    fio TEXT NOT NULL,
+    birthdate TEXT NOT NULL,
+    "group" TEXT NOT NULL,
+    gpa REAL,
+    fio_fold TEXT NOT NULL  -- fio.casefold(): find без учёта регистра, как у Group
+);
+CREATE INDEX students_fio ON students (fio);
+CREATE INDEX students_group ON students ("group");
+CREATE INDEX students_gpa ON students (gpa DESC, id);
+CREATE INDEX students_fold ON students (fio_fold);  -- find(prefix=True)
+"""
+
+# триграммный индекс по fio_fold для find; в сборках SQLite без FTS5
+# find просматривает таблицу
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE students_fts USING fts5 (
+    fio_fold, content='students', content_rowid='id',
+    tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER students_ad AFTER DELETE ON students BEGIN
+    INSERT INTO students_fts (students_fts, rowid, fio_fold)
+    VALUES ('delete', old.id, old.fio_fold);
+END;
+CREATE TRIGGER students_au AFTER UPDATE OF fio_fold ON students BEGIN
+    INSERT INTO students_fts (students_fts, rowid, fio_fold)
+    VALUES ('delete', old.id, old.fio_fold);
+    INSERT INTO students_fts (rowid, fio_fold) VALUES (new.id, new.fio_fold);
+END;
+"""
+# отдельно: import_csv снимает его на время вставки и индексирует новые
+# строки одним запросом — в разы быстрее, чем триггером по строке
+_FTS_INSERT_TRIGGER = """
+CREATE TRIGGER students_ai AFTER INSERT ON students BEGIN
+    INSERT INTO students_fts (rowid, fio_fold) VALUES (new.id, new.fio_fold);
+END;
+"""
+
+
+def _gpa_value(raw: str) -> Any:
+    "gpa из CSV: числом, если разбирается (как в Group._student_from_row), иначе строкой"
+    try:
+        return float(raw.replace(",", "."))
+    except ValueError:
+        return raw
+
+
+class SqliteGroup(Group):
+    """
+    Хранилище студентов в файле SQLite с тем же API, что у Group.
+
+    Поиск по fio и group идёт по индексам, find — по триграммному индексу
+    FTS5 (подстроки короче трёх символов — просмотром таблицы), stats
+    считается агрегатами SQL: таблица в память не загружается.
+    Каждое изменение — отдельная транзакция, batch() — одна общая.
+    CSV fio,birthdate,group,gpa — формат обмена: import_csv/export_csv.
+    """
+
+    def __init__(self, storage_path: str | Path):
+        self.path = Path(storage_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # транзакции открываем сами: BEGIN IMMEDIATE ... COMMIT
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._batch_depth = 0
+        self._fts = False
+        try:
+            self._open_schema()
+        except BaseException:
+            self._db.close()
+            raise
+
+    def _open_schema(self) -> None:
+        db = self._db
+        try:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            tables = db.execute("SELECT count(*) FROM sqlite_master").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise StorageFormatError(f"{self.path} — не база SQLite: {e}") from e
+
+        if version == 0 and tables == 0:
+            db.execute("PRAGMA journal_mode = WAL")
+            db.executescript(f"BEGIN; {_SCHEMA} COMMIT;")
+            try:
+                db.executescript(f"BEGIN; {_FTS_SCHEMA} {_FTS_INSERT_TRIGGER} COMMIT;")
+            except sqlite3.OperationalError:
+                db.execute("ROLLBACK")  # нет FTS5 — find без индекса
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            raise StorageFormatError(
+                f"{self.path}: неизвестная версия схемы {version}, "
+                f"ожидается {SCHEMA_VERSION}"
+            )
+        db.execute("PRAGMA synchronous = NORMAL")
+        self._fts = bool(
+            db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'students_fts'"
+            ).fetchone()
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> SqliteGroup:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -------------------------
+    # internal helpers
+    # -------------------------
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Транзакция; вложенная (в batch()) — точка сохранения внутри общей:
+        пойманная в блоке ошибка не оставляет половины изменений.
+        """
+        name = f"sp{self._batch_depth}"
+        begin, commit, rollback = (
+            (f"SAVEPOINT {name}", f"RELEASE {name}", f"ROLLBACK TO {name}")
+            if self._batch_depth
+            else ("BEGIN IMMEDIATE", "COMMIT", "ROLLBACK")
+        )
+        self._db.execute(begin)
+        self._batch_depth += 1
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute(rollback)
+            if self._batch_depth > 1:
+                self._db.execute(f"RELEASE {name}")
+            raise
+        finally:
+            self._batch_depth -= 1
+        self._db.execute(commit)
+
+    @staticmethod
+    def _row(record: tuple) -> dict[str, str]:
+        "строка запроса (id, fio, birthdate, group, gpa) -> dict как у Group"
+        _, fio, birthdate, group, gpa = record
+        return {
+            "fio": fio,
+            "birthdate": birthdate,
+            "group": group,
+            "gpa": "" if gpa is None else str(gpa),
+        }
+
+    def _select(self, where: str = "", params: Iterable[Any] = ()) -> list[Student]:
+        return list(self._iter_select(where, params))
+
+    def _iter_select(
+        self, where: str = "", params: Iterable[Any] = (), limit: int = -1
+    ) -> Iterator[Student]:
+        rows = self._db.execute(
+            f"SELECT {_COLUMNS} FROM students {where} ORDER BY id LIMIT ?",
+            (*params, limit),
+        )
+        return (self._student_from_row(self._row(r)) for r in rows)
+
+    def _insert(self, db: sqlite3.Connection, rows: Iterable[dict[str, str]]) -> int:
+        cur = db.executemany(
+            'INSERT INTO students (fio, birthdate, "group", gpa, fio_fold)'
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    r["fio"],
+                    r["birthdate"],
+                    r["group"],
+                    _gpa_value(r["gpa"]),
+                    r["fio"].casefold(),
+                )
+                for r in rows
+            ),
+        )
+        return cur.rowcount
+
+    # -------------------------
+    # CRUD
+    # -------------------------
+    def list(self) -> list[Student]:
+        return self._select()
+
+    def add_many(self, students: Iterable[Student]) -> int:
+        """Добавить студентов одной транзакцией; валидируются все до записи."""
+        new_rows = [self._row_from_student(s) for s in students]
+        if not new_rows:
+            return 0
+        with self._transaction() as db:
+            return self._insert(db, new_rows)
+
+    def get(self, fio: str) -> list[Student]:
+        return self._select("WHERE fio = ?", [(fio or "").strip()])
+
+    def by_group(self, group: str) -> list[Student]:
+        return self._select('WHERE "group" = ?', [(group or "").strip()])
+
+    def iter_find(
+        self, substr: str, *, prefix: bool = False, limit: int | None = None
+    ) -> Iterator[Student]:
+        """Как Group.iter_find (casefold, порядок добавления, limit)."""
+        needle = (substr or "").casefold()
+        if not needle or limit == 0:
+            return iter(())
+        limit = -1 if limit is None else limit
+        if prefix:
+            # диапазон по индексу fio_fold: все строки, начинающиеся с needle
+            return self._iter_select(
+                "WHERE fio_fold >= ? AND fio_fold < ?",
+                [needle, needle + "\U0010ffff"],
+                limit,
+            )
+        if self._fts and len(needle) >= 3:
+            # фраза из триграмм иглы = вхождение подстроки целиком
+            phrase = '"' + needle.replace('"', '""') + '"'
+            return self._iter_select(
+                "WHERE id IN (SELECT rowid FROM students_fts"
+                " WHERE students_fts MATCH ?)",
+                [phrase],
+                limit,
+            )
+        return self._iter_select("WHERE instr(fio_fold, ?) > 0", [needle], limit)
+
+    def remove_many(self, fios: Iterable[str]) -> int:
+        targets = {(fio or "").strip() for fio in fios} - {""}
+        if not targets:
+            return 0
+        with self._transaction() as db:
+            cur = db.executemany(
+                "DELETE FROM students WHERE fio = ?", [(f,) for f in targets]
+            )
+            return cur.rowcount
+
+    def update_many(
+        self,
+        target: Mapping[str, Mapping[str, Any]] | Callable[[Student], bool],
+        **fields: Any,
+    ) -> int:
+        """
+        Как Group.update_many. Ошибка валидации любой записи -> ValueError,
+        транзакция откатывается.
+        """
+        plan: dict[int, tuple[tuple, Mapping[str, Any]]] = {}
+        with self._transaction() as db:
+            if callable(target):
+                self._check_fields(fields)
+                plan = {
+                    r[0]: (r, fields)
+                    for r in db.execute(f"SELECT {_COLUMNS} FROM students ORDER BY id")
+                    if target(self._student_from_row(self._row(r)))
+                }
+            else:
+                if fields:
+                    raise TypeError(
+                        "Поля задаются либо словарём по fio, либо с предикатом"
+                    )
+                for fio, changes in target.items():
+                    self._check_fields(changes)
+                    for r in db.execute(
+                        f"SELECT {_COLUMNS} FROM students WHERE fio = ?",
+                        (fio.strip(),),
+                    ):
+                        _, seen = plan.get(r[0], (r, {}))
+                        plan[r[0]] = (r, {**seen, **changes})
+            if not plan:
+                return 0
+
+            updated = [
+                (i, self._changed_row(self._row(r), changes))
+                for i, (r, changes) in plan.items()
+            ]
+            db.executemany(
+                'UPDATE students SET fio = ?, birthdate = ?, "group" = ?, gpa = ?,'
+                " fio_fold = ? WHERE id = ?",
+                [
+                    (
+                        r["fio"],
+                        r["birthdate"],
+                        r["group"],
+                        _gpa_value(r["gpa"]),
+                        r["fio"].casefold(),
+                        i,
+                    )
+                    for i, r in updated
+                ],
+            )
+        return len(updated)
+
+    @contextmanager
+    def batch(self) -> Iterator[Group]:
+        """
+        Все изменения блока — одна транзакция: исключение откатывает их,
+        другие соединения видят только результат целиком.
+        """
+        with self._transaction():
+            yield self
+
+    # -------------------------
+    # статистика
+    # -------------------------
+    def stats(self) -> dict[str, Any]:
+        """Те же ключи, что у Group.stats, агрегатами SQL."""
+        db = self._db
+        count = db.execute("SELECT count(*) FROM students").fetchone()[0]
+        min_gpa, max_gpa, avg_gpa = db.execute(
+            f"SELECT min(gpa), max(gpa), avg(gpa) FROM students WHERE {_NUMERIC}"
+        ).fetchone()
+        # группы в порядке первого появления, как в Group
+        groups = dict(
+            db.execute(
+                'SELECT "group", count(*) FROM students GROUP BY "group"'
+                " ORDER BY min(id)"
+            ).fetchall()
+        )
+        top = [
+            {"fio": fio, "gpa": gpa}
+            for fio, gpa in db.execute(
+                f"SELECT fio, gpa FROM students WHERE {_NUMERIC}"
+                " ORDER BY gpa DESC, id LIMIT 5"
+            )
+        ]
+        return {
+            "count": count,
+            "min_gpa": min_gpa,
+            "max_gpa": max_gpa,
+            "avg_gpa": avg_gpa,
+            "groups": groups,
+            "top_5_students": top,
+        }
+
+    # -------------------------
+    # обмен с CSV
+    # -------------------------
+    def import_csv(self, csv_path: str | Path) -> int:
+        """
+        Добавляет строки CSV fio,birthdate,group,gpa одной транзакцией,
+        потоково. Проверки формата — как у Group: неверный заголовок или
+        битая строка -> StorageFormatError, и не добавляется ничего.
+        """
+        added = 0
+        with Path(csv_path).open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is not None and header != list(self.FIELDS):
+                raise StorageFormatError(
+                    f"Некорректные поля в CSV: {header}. Ожидаются: {list(self.FIELDS)}"
+                )
+            with self._transaction() as db:
+                last_id = db.execute("SELECT max(id) FROM students").fetchone()[0]
+                if self._fts:
+                    db.execute("DROP TRIGGER students_ai")
+                chunk: list[dict[str, str]] = []
+                for line, values in enumerate(reader, start=2):
+                    if not values:
+                        continue
+                    if len(values) > len(self.FIELDS):
+                        raise StorageFormatError(
+                            f"Битая строка CSV на линии {line}: {values}"
+                        )
+                    # короткую строку дополняем пустыми полями, как DictReader
+                    chunk.append(
+                        {
+                            k: values[n].strip() if n < len(values) else ""
+                            for n, k in enumerate(self.FIELDS)
+                        }
+                    )
+                    if len(chunk) >= IMPORT_CHUNK:
+                        added += self._insert(db, chunk)
+                        chunk = []
+                added += self._insert(db, chunk) if chunk else 0
+                if self._fts:
+                    db.execute(
+                        "INSERT INTO students_fts (rowid, fio_fold)"
+                        " SELECT id, fio_fold FROM students WHERE id > ?",
+                        (last_id or 0,),
+                    )
+                    db.execute(_FTS_INSERT_TRIGGER)
+        return added
+
+    def export_csv(self, csv_path: str | Path) -> int:
+        """Пишет всех студентов в CSV (атомарно, потоково). Возвращает количество."""
+        path = Path(csv_path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        count = 0
+        with tmp.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            for record in self._db.execute(
+                f"SELECT {_COLUMNS} FROM students ORDER BY id"
+            ):
+                row = self._row(record)
+                writer.writerow([row[k] for k in self.FIELDS])
+                count += 1
+        tmp.replace(path)
+        return count
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .group import Group, StorageFormatError
+
+WAL_VERSION = 1
+COMPACT_AFTER = 10_000  # записей в журнале, после которых сворачиваем его в CSV
+TAIL_BLOCK = 1 << 16  # по сколько байт с конца ищем последнюю целую строку
+
+
+def _digest(path: Path) -> str:
+    "хэш содержимого CSV: журнал привязан к конкретной версии базы"
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class WalGroup(Group):
+    """
+    Group с журналом изменений (write-ahead log) рядом с CSV.
+
+    Изменения не переписывают CSV, а дописываются в <csv>.wal: одна строка
+    JSON на операцию или batch() — список записей ("add", row),
+    ("set", i, row), ("del", i). Таблица в памяти — базовый CSV и журнал
+    поверх. Когда в журнале набирается compact_after записей (или по
+    compact()), живые строки атомарно пишутся в новый CSV, а журнал
+    очищается: CSV остаётся каноническим форматом для экспорта.
+
+    Строка журнала, оборванная сбоем, отбрасывается целиком — вместе с
+    ней пропадает вся её операция или batch, но не часть его.
+    """
+
+    def __init__(
+        self,
+        storage_path: str | Path,
+        *,
+        compact_after: int = COMPACT_AFTER,
+        fsync: bool = False,
+    ):
+        path = Path(storage_path)
+        self.log_path = path.with_name(path.name + ".wal")
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._log_records = 0
+        self._log_reset = False
+        super().__init__(path)
+
+    # -------------------------
+    # журнал
+    # -------------------------
+    def _log_stamp(self) -> tuple | None:
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _file_stamp(self) -> tuple | None:
+        base = super()._file_stamp()
+        return None if base is None else (base, self._log_stamp())
+
+    def _table(self) -> list[dict[str, str] | None]:
+        self._log_reset = False
+        rows = super()._table()
+        if self._log_reset and self._stamp is not None:
+            # журнал пересоздан при разборе, после снятия штампа: иначе
+            # batch счёл бы его изменённым снаружи, а чтение — устаревшим
+            self._stamp = (self._stamp[0], self._log_stamp())
+        self._log_reset = False
+        return rows
+
+    def _read_log(self) -> tuple[dict[str, Any] | None, list[Any]]:
+        """
+        Заголовок и строки журнала. Последнюю строку без перевода строки
+        (оборванную сбоем дозапись) пропускаем, но файл не трогаем: чтение
+        не должно отрезать то, что другой экземпляр как раз дописывает.
+        Битая строка в середине — StorageFormatError.
+        """
+        if not self.log_path.exists():
+            return None, []
+        header = None
+        entries: list[Any] = []
+        with self.log_path.open("rb") as f:
+            for n, line in enumerate(f, start=1):
+                if not line.endswith(b"\n"):
+                    break  # это последняя строка файла
+                try:
+                    entry = json.loads(line)
+                except ValueError as e:
+                    raise StorageFormatError(
+                        f"Битая запись журнала {self.log_path}, строка {n}"
+                    ) from e
+                if header is None:
+                    header = entry
+                else:
+                    entries.append(entry)
+        return header, entries
+
+    def _cut_torn_tail(self, f: BinaryIO) -> None:
+        "перед дозаписью: отрезаем оборванную последнюю строку, если она есть"
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - TAIL_BLOCK)
+            f.seek(start)
+            block = f.read(pos - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos != end:
+            f.truncate(pos)
+        f.seek(pos)
+
+    def _reset_log(self, digest: str) -> None:
+        tmp = self.log_path.with_suffix(".wal.tmp")
+        header = {"wal": WAL_VERSION, "base": digest}
+        tmp.write_text(json.dumps(header) + "\n", encoding="utf-8")
+        tmp.replace(self.log_path)
+        self._log_records = 0
+        self._log_reset = True
+
+    def _append_log(self, entry: Any) -> None:
+        with self.log_path.open("r+b") as f:
+            self._cut_torn_tail(f)
+            f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _load_rows(self) -> list[dict[str, str] | None]:
+        """Базовый CSV и записи журнала поверх него."""
+        rows: list[dict[str, str] | None] = list(self._read_all_rows())
+        digest = _digest(self.path)
+        header, entries = self._read_log()
+
+        if header is None:
+            self._reset_log(digest)
+            return rows
+        if header.get("wal") != WAL_VERSION:
+            raise StorageFormatError(f"Неизвестная версия журнала: {self.log_path}")
+        if header.get("base") != digest:
+            if entries and entries[-1] == {"compact": digest}:
+                # сбой между записью нового CSV и очисткой журнала: журнал
+                # уже свёрнут в этот CSV
+                self._reset_log(digest)
+                return rows
+            raise StorageFormatError(
+                f"CSV {self.path} изменён в обход журнала {self.log_path}: "
+                "журнал относится к другой версии файла"
+            )
+
+        records = 0
+        for entry in entries:
+            if isinstance(entry, dict):  # маркер незавершённого compact
+                continue
+            for op in entry:
+                if op[0] == "add":
+                    rows.append(op[1])
+                elif op[0] == "set":
+                    rows[op[1]] = op[2]
+                else:
+                    rows[op[1]] = None
+            records += len(entry)
+        self._log_records = records
+        return rows
+
+    def _persist(self, ops: list[tuple]) -> None:
+        """Одна строка журнала на вызов (или batch), без перезаписи CSV."""
+        self._append_log([list(op) for op in ops])
+        self._log_records += len(ops)
+        self._stamp = self._file_stamp()
+        if self._log_records >= self.compact_after:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Сворачивает журнал: живые строки — в новый CSV, журнал — пустой.
+        Внутри batch() нельзя: в CSV попали бы незавершённые изменения блока.
+        """
+        if self._batch_depth:
+            raise RuntimeError("compact() внутри batch(): сверните журнал после блока")
+        rows = self._live_rows()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            writer.writerows([row[k] for k in self.FIELDS] for row in rows)
+        digest = _digest(tmp)
+        # маркер до подмены CSV: по нему после сбоя видно, что журнал уже в CSV
+        self._append_log({"compact": digest})
+        tmp.replace(self.path)
+        self._reset_log(digest)
+        self._drop_tombstones(self._file_stamp())
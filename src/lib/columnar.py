@@ -0,0 +1,466 @@
+# src/lib/columnar.py
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import weakref
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.lib.text_cache import default_cache_dir as _freq_cache_dir
+from src.lib.text_cache import file_digest
+
+MAGIC = b"LPCL"
+VERSION = 1
+SUFFIX = ".col"
+ALIGN = 8
+CACHE_MAX_BYTES = 1 << 30  # общий размер каталога кэша, дальше вытесняем старые
+
+# magic, версия, число строк, длина схемы (JSON) в байтах
+_HEADER = struct.Struct("<4sB3xQI")
+
+TYPES = ("int64", "float64", "bool", "str")
+_TYPECODES = {"int64": "q", "float64": "d", "bool": "B"}
+_INT64 = range(-(2**63), 2**63)
+
+
+def default_cache_dir() -> Path:
+    "рядом с кэшем частот: ~/.cache/labsproga/columnar"
+    return _freq_cache_dir().with_name("columnar")
+
+
+def _is_int(value: str) -> bool:
+    # только каноническая запись: "007", "+1", "1_000" остаются строками,
+    # иначе обратное преобразование в текст не совпадёт с исходным
+    try:
+        return str(int(value)) == value and int(value) in _INT64
+    except ValueError:
+        return False
+
+
+def _is_float(value: str) -> bool:
+    try:
+        return repr(float(value)) == value
+    except ValueError:
+        return False
+
+
+def infer_type(values: Iterable[str]) -> str:
+    """
+    Тип колонки по её различным значениям: "" — пропуск (null), остальные
+    должны без потерь возвращаться в тот же текст.
+    """
+    present = [v for v in values if v != ""]
+    if not present:
+        return "str"
+    if all(v in ("True", "False") for v in present):
+        return "bool"
+    if all(_is_int(v) for v in present):
+        return "int64"
+    if all(_is_float(v) for v in present):
+        return "float64"
+    return "str"
+
+
+class _ColumnBuilder:
+    "колонка при записи: словарь значений и коды строк"
+
+    def __init__(self, name: str, backfill: int = 0):
+        self.name = name
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+        self.codes = array("I")
+        for _ in range(backfill):  # колонка появилась не с первой строки
+            self.add("")
+
+    def add(self, value: str) -> None:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def encode(self) -> tuple[Dict[str, Any], List[bytes]]:
+        "описание колонки для схемы и её блоки данных"
+        kind = infer_type(self.values)
+        meta: Dict[str, Any] = {"name": self.name, "type": kind}
+        if kind == "str":
+            blobs = [v.encode("utf-8") for v in self.values]
+            offsets = array("Q", [0])
+            for blob in blobs:
+                offsets.append(offsets[-1] + len(blob))
+            width = (
+                "B" if len(blobs) <= 1 << 8 else "H" if len(blobs) <= 1 << 16 else "I"
+            )
+            meta.update(count=len(blobs), code=width)
+            codes = array(width, self.codes) if width != "I" else self.codes
+            return meta, [_le(offsets), b"".join(blobs), _le(codes)]
+
+        if kind == "int64":
+            table = [int(v) if v else 0 for v in self.values]
+        elif kind == "float64":
+            table = [float(v) if v else 0.0 for v in self.values]
+        else:
+            table = [v == "True" for v in self.values]
+        data = array(_TYPECODES[kind], [table[c] for c in self.codes])
+        blocks = [_le(data)]
+
+        missing = self.index.get("")
+        meta["nulls"] = missing is not None
+        if missing is not None:
+            validity = bytearray((len(self.codes) + 7) // 8)
+            for i, code in enumerate(self.codes):
+                if code != missing:
+                    validity[i >> 3] |= 1 << (i & 7)
+            blocks.append(bytes(validity))
+        return meta, blocks
+
+
+def _le(data: array) -> bytes:
+    "массив в little-endian байты"
+    if sys.byteorder == "big":
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+
+def write_table(
+    path: str | Path,
+    columns: Sequence[_ColumnBuilder],
+    n_rows: int,
+    source: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Файл: заголовок, схема (JSON) и блоки колонок, выровненные по 8 байт.
+    Смещения блоков в схеме — от начала области данных. Пишем атомарно.
+    """
+    metas = []
+    blocks: List[bytes] = []
+    offset = 0
+    for column in columns:
+        meta, data = column.encode()
+        meta["blocks"] = []
+        for block in data:
+            meta["blocks"].append([offset, len(block)])
+            blocks.append(block + b"\0" * _pad(len(block)))
+            offset += len(blocks[-1])
+        metas.append(meta)
+
+    schema = json.dumps(
+        {"columns": metas, "source": source or {}}, ensure_ascii=False
+    ).encode("utf-8")
+    head = _HEADER.pack(MAGIC, VERSION, n_rows, len(schema)) + schema
+    head += b"\0" * _pad(len(head))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(head)
+            for block in blocks:
+                f.write(block)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read_schema(path: str | Path) -> tuple[int, Dict[str, Any], int]:
+    "(число строк, схема, начало области данных) без чтения самих колонок"
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        try:
+            magic, version, n_rows, schema_len = _HEADER.unpack(head)
+        except struct.error:
+            raise ValueError(f"Не колоночный кэш: {path}") from None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Не колоночный кэш или другая версия: {path}")
+        schema = json.loads(f.read(schema_len).decode("utf-8"))
+    start = _HEADER.size + schema_len
+    return n_rows, schema, start + _pad(start)
+
+
+class ColumnarTable:
+    """
+    Колоночный файл, отображённый в память. Числовые колонки отдаются как
+    memoryview над mmap без копирования; строковые — через словарь,
+    который декодируется один раз.
+
+    close() освобождает выданные memoryview (дальше обращение к ним —
+    ValueError, как к закрытому файлу). Если вызывающий сделал из них
+    свои срезы, отображение закроется, когда не станет и их.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.n_rows, self.schema, self._start = read_schema(self.path)
+        self.columns: List[str] = [c["name"] for c in self.schema["columns"]]
+        self.types: List[str] = [c["type"] for c in self.schema["columns"]]
+        self.source: Dict[str, Any] = self.schema.get("source", {})
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # выданные view (memoryview не хэшируется — ключ просто счётчик)
+        self._views: weakref.WeakValueDictionary[int, memoryview] = (
+            weakref.WeakValueDictionary()
+        )
+        self._view_ids = itertools.count()
+
+    def close(self) -> None:
+        for view in list(self._views.values()):
+            view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # живы срезы вызывающего: mmap закроется вместе с ними
+
+    def __enter__(self) -> ColumnarTable:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _block(self, meta: Dict[str, Any], i: int, typecode: str = "B"):
+        offset, size = meta["blocks"][i]
+        base = memoryview(self._mm)
+        view = base[self._start + offset : self._start + offset + size]
+        base.release()  # срез держит буфер mmap сам
+        if typecode != "B":
+            if sys.byteorder == "big":
+                data = array(typecode, view.tobytes())
+                data.byteswap()
+                view.release()
+                return memoryview(data)
+            sliced, view = view, view.cast(typecode)
+            sliced.release()
+        self._views[next(self._view_ids)] = view
+        return view
+
+    def _meta(self, name: str) -> Dict[str, Any]:
+        try:
+            return self.schema["columns"][self.columns.index(name)]
+        except ValueError:
+            raise KeyError(name) from None
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Значения колонки: int64/float64/bool — memoryview без копирования
+        (пропуски там нулевые, см. valid), str — список строк.
+        """
+        return self._column(self._meta(name))
+
+    def _column(self, meta: Dict[str, Any]) -> Sequence[Any]:
+        if meta["type"] == "str":
+            dictionary = self._dictionary(meta)
+            return [dictionary[c] for c in self._block(meta, 2, meta["code"])]
+        return self._block(meta, 0, _TYPECODES[meta["type"]])
+
+    def dictionary(self, name: str) -> List[str]:
+        "различные значения строковой колонки в порядке кодов"
+        return self._dictionary(self._meta(name))
+
+    def _dictionary(self, meta: Dict[str, Any]) -> List[str]:
+        offsets = self._block(meta, 0, "Q")
+        blob = self._block(meta, 1)
+        return [
+            bytes(blob[offsets[i] : offsets[i + 1]]).decode("utf-8")
+            for i in range(meta["count"])
+        ]
+
+    def valid(self, name: str) -> Optional[memoryview]:
+        "битовая маска непустых значений типизированной колонки (None — все есть)"
+        return self._valid(self._meta(name))
+
+    def _valid(self, meta: Dict[str, Any]) -> Optional[memoryview]:
+        if meta["type"] == "str" or not meta.get("nulls"):
+            return None
+        return self._block(meta, 1)
+
+    def _as_text(self, meta: Dict[str, Any]) -> Iterable[str]:
+        "колонка текстом, как в исходном файле"
+        kind = meta["type"]
+        if kind == "str":
+            return map(
+                self._dictionary(meta).__getitem__, self._block(meta, 2, meta["code"])
+            )
+
+        values = self._column(meta)
+        if kind == "int64":
+            text: Iterable[str] = map(str, values)
+        elif kind == "float64":
+            text = map(repr, values)
+        else:
+            text = ("True" if v else "False" for v in values)
+        mask = self._valid(meta)
+        if mask is None:
+            return text
+        return (t if mask[i >> 3] >> (i & 7) & 1 else "" for i, t in enumerate(text))
+
+    def iter_rows(self) -> Iterator[tuple[str, ...]]:
+        """
+        строки таблицы кортежами строк (пропуски — пустые строки); колонки
+        берём по порядку, а не по имени: в заголовке CSV имена могут
+        повторяться или быть пустыми
+        """
+        return zip(*(self._as_text(meta) for meta in self.schema["columns"]))
+
+
+def _source_info(src: Path, options: Dict[str, Any]) -> Dict[str, Any]:
+    st = src.stat()
+    return {
+        "path": str(src.resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "digest": file_digest(src).hex(),
+        "options": options,
+    }
+
+
+def _csv_columns(src: Path, options: Dict[str, Any]) -> tuple[list, int]:
+    """
+    Все строки CSV, включая пустые (их пишет csv_to_xlsx; csv_to_json
+    пропускает их уже при чтении кэша): короткие дополняем пустыми
+    значениями, лишние поля отбрасываем. Заголовок и пустое тело — по
+    правилам csv_to_xlsx (пустые имена колонок и файл из одного заголовка
+    допустимы), более строгие проверки csv_to_json делает при чтении
+    кэша: с кэшем и без результат один.
+    """
+    from src.lib.csv_dialect import detect_file
+
+    with src.open(encoding="utf-8") as f:
+        detected = detect_file(f, src, **options)
+        reader = csv.reader(f, dialect=detected.dialect)
+        header = next(reader, None)
+        if (
+            not detected.has_header
+            or not header
+            or all(h.strip() == "" for h in header)
+        ):
+            raise ValueError("Пустой CSV или отсутствует заголовок")
+        builders = [_ColumnBuilder(name) for name in header]
+        width = len(builders)
+        n_rows = 0
+        for row in reader:
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            for builder, value in zip(builders, row):
+                builder.add(value)
+            n_rows += 1
+    return builders, n_rows
+
+
+def _json_columns(src: Path) -> tuple[list, int]:
+    from src.lib.json_csv import _stringify, iter_json_records
+
+    builders: Dict[str, _ColumnBuilder] = {}
+    first: List[str] = []
+    n_rows = 0
+    for item in iter_json_records(src):
+        if not builders:
+            first = list(item)
+            builders = {k: _ColumnBuilder(k) for k in first}
+        for key in item.keys() - builders.keys():
+            builders[key] = _ColumnBuilder(key, backfill=n_rows)
+        for key, builder in builders.items():
+            builder.add(_stringify(item.get(key)))
+        n_rows += 1
+    # тот же порядок колонок, что у json_to_csv
+    known = set(first)
+    order = first + sorted(k for k in builders if k not in known)
+    return [builders[k] for k in order], n_rows
+
+
+def build(src: str | Path, col_path: str | Path, **options: Any) -> Path:
+    """
+    Колоночный кэш для CSV (options — переопределения диалекта, как у
+    csv_to_json) или JSON/NDJSON (колонки и значения — как у json_to_csv).
+    """
+    from src.lib.json_csv import JSON_SUFFIXES, NDJSON_SUFFIXES
+
+    src = Path(src)
+    suffix = src.suffix.lower()
+    if suffix == ".csv":
+        builders, n_rows = _csv_columns(src, options)
+    elif suffix in JSON_SUFFIXES + NDJSON_SUFFIXES:
+        builders, n_rows = _json_columns(src)
+    else:
+        raise ValueError("Неверный тип файла")
+    write_table(col_path, builders, n_rows, _source_info(src, options))
+    return Path(col_path)
+
+
+def is_fresh(col_path: str | Path, src: str | Path, **options: Any) -> bool:
+    "кэш построен из этого же содержимого src с теми же настройками"
+    try:
+        _, schema, _ = read_schema(col_path)
+        st = os.stat(src)
+    except (OSError, ValueError):
+        return False
+    source = schema.get("source", {})
+    if source.get("size") != st.st_size or source.get("options") != options:
+        return False
+    return (
+        source.get("mtime_ns") == st.st_mtime_ns
+        or source.get("digest") == file_digest(src).hex()
+    )
+
+
+def _evict(cache_dir: Path, max_bytes: int, keep: Path) -> None:
+    "удаляем дольше всех не использованные записи, пока каталог больше max_bytes"
+    entries = []
+    total = 0
+    for entry in cache_dir.glob("*" + SUFFIX):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        entries.append((st.st_atime_ns, st.st_size, entry))
+        total += st.st_size
+
+    entries.sort()
+    for _, size, entry in entries:
+        if total <= max_bytes:
+            break
+        if entry != keep:
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def cached(
+    src: str | Path,
+    cache_dir: Optional[str | Path] = None,
+    *,
+    max_bytes: int = CACHE_MAX_BYTES,
+    **options: Any,
+) -> Path:
+    """
+    Путь к актуальному кэшу src в cache_dir (по умолчанию default_cache_dir),
+    при необходимости строим его заново. Каталог не растёт больше max_bytes:
+    после сборки вытесняем записи, которые дольше всех не использовались
+    (использование отмечаем atime записи, mtime — время сборки). Только что нужная запись
+    остаётся, даже если одна больше лимита.
+    """
+    key = json.dumps([str(Path(src).resolve()), options], sort_keys=True)
+    name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    entry = Path(cache_dir or default_cache_dir()) / (name + SUFFIX)
+    if is_fresh(entry, src, **options):
+        try:
+            mtime_ns = entry.stat().st_mtime_ns
+            os.utime(entry, ns=(time.time_ns(), mtime_ns))  # для вытеснения
+        except OSError:
+            pass
+        return entry
+    build(src, entry, **options)
+    _evict(entry.parent, max_bytes, keep=entry)
+    return entry
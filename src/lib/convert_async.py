@@ -0,0 +1,174 @@
+# src/lib/convert_async.py
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.lib.convert_batch import KINDS, ConvertResult, convert_file
+
+# файлы меньше конвертируем в пуле потоков: передача задачи в процесс
+# и обратно дороже самой работы
+INLINE_BYTES = 64 << 10
+IO_THREADS = 4
+
+# стадии, о которых сообщает progress(stage, src)
+STAGES = ("queued", "running", "done", "failed", "cancelled")
+Progress = Callable[[str, Path], None]
+
+
+def _prepare(src: Path, dst: Path) -> int:
+    "блокирующая подготовка: размер входа и каталог результата"
+    size = src.stat().st_size
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    return size
+
+
+def _part_path(dst: Path) -> Path:
+    # суффикс сохраняем: по нему конвертеры проверяют тип файла
+    return dst.with_name(f".{dst.stem}.{uuid.uuid4().hex[:8]}.part{dst.suffix}")
+
+
+def _silent(stage: str, src: Path) -> None:
+    pass
+
+
+class AsyncConverter:
+    """
+    Конвертеры json_csv/csv_xlsx для asyncio: работа уходит в общий пул
+    процессов (мелкие файлы и ввод-вывод — в пул потоков), цикл событий не
+    блокируется. Одновременно выполняется не больше max_concurrency
+    конвертаций (по умолчанию 4 на процесс), остальные ждут в очереди.
+
+    Результат пишется во временный файл рядом с dst и переименовывается
+    только после успеха: отменённая или упавшая конвертация dst не трогает.
+    Уже запущенную в процессе конвертацию прервать нельзя — её результат
+    выбрасывается.
+    """
+
+    def __init__(
+        self,
+        *,
+        jobs: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        io_threads: int = IO_THREADS,
+        inline_bytes: int = INLINE_BYTES,
+    ):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.jobs * 4
+        self.inline_bytes = inline_bytes
+        self._threads = ThreadPoolExecutor(io_threads, thread_name_prefix="convert-io")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    def _process_pool(self) -> Executor:
+        if self._processes is None:
+            # spawn: fork из процесса с потоками (пул ввода-вывода) небезопасен
+            context = multiprocessing.get_context("spawn")
+            self._processes = ProcessPoolExecutor(self.jobs, mp_context=context)
+        return self._processes
+
+    def _limit(self) -> asyncio.Semaphore:
+        # семафор привязан к циклу событий: свой на каждый asyncio.run
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def convert(
+        self,
+        src: str | Path,
+        dst: str | Path,
+        kind: str,
+        *,
+        progress: Optional[Progress] = None,
+        **options: Any,
+    ) -> ConvertResult:
+        """
+        Конвертация src в dst (kind — как у convert_batch: json2csv,
+        csv2json, csv2xlsx; options уходят в конвертер). Ошибка конвертера
+        поднимается как есть; progress(stage, src) вызывается в цикле
+        событий на каждой стадии из STAGES.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Неизвестный вид конвертации: {kind}")
+        if self._closed:
+            raise RuntimeError("Конвертер закрыт")
+        src, dst = Path(src), Path(dst)
+        notify = progress or _silent
+        loop = asyncio.get_running_loop()
+
+        notify("queued", src)
+        try:
+            async with self._limit():
+                size = await loop.run_in_executor(self._threads, _prepare, src, dst)
+                small = size < self.inline_bytes
+                executor = self._threads if small else self._process_pool()
+                part = _part_path(dst)
+
+                notify("running", src)
+                start = time.perf_counter()
+                future = executor.submit(convert_file, src, part, kind, **options)
+                try:
+                    await asyncio.wrap_future(future)
+                    await loop.run_in_executor(self._threads, os.replace, part, dst)
+                except BaseException:
+                    # процесс может ещё писать part: убираем, когда закончит
+                    future.cancel()
+                    future.add_done_callback(lambda _: part.unlink(missing_ok=True))
+                    raise
+                seconds = time.perf_counter() - start
+        except asyncio.CancelledError:
+            notify("cancelled", src)
+            raise
+        except Exception:
+            notify("failed", src)
+            raise
+        notify("done", src)
+        return ConvertResult(src, dst, seconds)
+
+    def close(self) -> None:
+        "ждём запущенные конвертации, ещё не начатые отменяем"
+        self._closed = True
+        self._threads.shutdown(cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncConverter:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await asyncio.to_thread(self.close)
+
+
+_shared: Optional[AsyncConverter] = None
+
+
+def shared_converter() -> AsyncConverter:
+    "общий на процесс конвертер для convert(); пулы создаются при первом вызове"
+    global _shared
+    if _shared is None or _shared._closed:
+        _shared = AsyncConverter()
+    return _shared
+
+
+async def convert(
+    src: str | Path,
+    dst: str | Path,
+    kind: str,
+    *,
+    progress: Optional[Progress] = None,
+    **options: Any,
+) -> ConvertResult:
+    "AsyncConverter.convert на общем конвертере процесса"
+    return await shared_converter().convert(
+        src, dst, kind, progress=progress, **options
+    )
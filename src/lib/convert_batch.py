@@ -0,0 +1,98 @@
+# src/lib/convert_batch.py
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.lib.pool import map_bounded
+
+# вид конвертации -> (шаблон для обхода каталогов, суффикс результата)
+KINDS: Dict[str, Tuple[str, str]] = {
+    "json2csv": ("*.json", ".csv"),
+    "csv2json": ("*.csv", ".json"),
+    "csv2xlsx": ("*.csv", ".xlsx"),
+}
+
+
+@dataclass
+class ConvertResult:
+    """Итог конвертации одного файла пакета."""
+
+    src: Path
+    dst: Path
+    seconds: float
+    error: Optional[str] = None
+
+
+def convert_file(src: str | Path, dst: str | Path, kind: str, **options: Any) -> None:
+    "одна конвертация по виду; options уходят в сам конвертер"
+    # конвертеры импортируем по требованию: CLI грузит этот модуль ради KINDS
+    if kind == "json2csv":
+        from src.lib.json_csv import json_to_csv
+
+        json_to_csv(str(src), str(dst), **options)
+    elif kind == "csv2json":
+        from src.lib.json_csv import csv_to_json
+
+        csv_to_json(str(src), str(dst), **options)
+    elif kind == "csv2xlsx":
+        from src.lib.csv_xlsx import csv_to_xlsx
+
+        csv_to_xlsx(str(src), str(dst), **options)
+    else:
+        raise ValueError(f"Неизвестный вид конвертации: {kind}")
+
+
+def output_path(src: Path, root: Path, out_dir: Path, kind: str) -> Path:
+    "путь результата: структура каталогов входа повторяется в out_dir"
+    return (out_dir / src.relative_to(root)).with_suffix(KINDS[kind][1])
+
+
+def _convert_task(
+    task: Tuple[Path, Path, str, Dict[str, Any], Optional[str]],
+) -> ConvertResult:
+    "работа процесса: одна конвертация, любая ошибка — в результат"
+    src, dst, kind, options, clash = task
+    if clash is not None:
+        return ConvertResult(src, dst, 0.0, clash)
+    start = time.perf_counter()
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        convert_file(src, dst, kind, **options)
+    except Exception as exc:  # один битый файл не должен ронять пакет
+        return ConvertResult(src, dst, time.perf_counter() - start, str(exc))
+    return ConvertResult(src, dst, time.perf_counter() - start)
+
+
+def convert_batch(
+    files: Iterable[Tuple[Path, Path]],
+    out_dir: str | Path,
+    kind: str,
+    *,
+    jobs: int = 1,
+    max_pending: Optional[int] = None,
+    **options: Any,
+) -> Iterator[ConvertResult]:
+    """
+    Конвертируем пары (файл, корень) из iter_input_files в out_dir в jobs
+    процессах; процессы переиспользуются, так что на файл не тратится запуск
+    интерпретатора. Результаты — по мере готовности, ошибки — в error.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Неизвестный вид конвертации: {kind}")
+    out_dir = Path(out_dir)
+
+    def tasks() -> Iterator[Tuple[Path, Path, str, Dict[str, Any], Optional[str]]]:
+        # два входа с одним результатом: второй не конвертируем, а то
+        # перезапишет первый
+        seen: Dict[str, Path] = {}
+        for src, root in files:
+            dst = output_path(src, root, out_dir, kind)
+            first = seen.setdefault(os.path.abspath(dst), src)
+            clash = None if first is src else f"{dst} уже результат для {first}"
+            yield src, dst, kind, options, clash
+
+    return map_bounded(_convert_task, tasks(), jobs=jobs, max_pending=max_pending)
@@ -0,0 +1,144 @@
+# src/lib/csv_dialect.py
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import NamedTuple, Optional, TextIO
+
+SAMPLE_SIZE = 2048
+# кандидаты в разделители: без ограничения Sniffer охотно выбирает букву
+# или пробел, если они встречаются в каждой строке одинаково часто
+DELIMITERS = ",;\t|"
+ESCAPES = {"\\t": "\t", "tab": "\t"}
+
+
+class DialectError(ValueError):
+    """Не удалось определить формат CSV."""
+
+
+class Detected(NamedTuple):
+    """Формат CSV-файла: диалект для csv.reader и есть ли строка заголовка."""
+
+    dialect: type[csv.Dialect]
+    has_header: bool
+
+
+class DialectCache:
+    """
+    Определённые диалекты по ключу (каталог, строка заголовка): файлы
+    одной формы из одного каталога угадываются один раз.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: dict[tuple, Detected] = {}
+
+    def get(self, key: tuple) -> Optional[Detected]:
+        return self._entries.get(key)
+
+    def put(self, key: tuple, detected: Detected) -> None:
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]  # самый старый
+        self._entries[key] = detected
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+default_cache = DialectCache()
+
+
+class _FixedSniffer(csv.Sniffer):
+    "has_header по уже известному диалекту, а не по своему повторному sniff"
+
+    def __init__(self, dialect: type[csv.Dialect]):
+        super().__init__()
+        self._dialect = dialect
+
+    def sniff(self, sample: str, delimiters: Optional[str] = None):
+        return self._dialect
+
+
+def parse_char(value: Optional[str]) -> Optional[str]:
+    "значение флага --delimiter/--quotechar: '\\t' и 'tab' — табуляция"
+    if value is None:
+        return None
+    value = ESCAPES.get(value, value)
+    if len(value) != 1:
+        raise DialectError(f"Ожидался один символ, получено: {value!r}")
+    return value
+
+
+def _with(base: type[csv.Dialect], **attrs: str) -> type[csv.Dialect]:
+    return type("Dialect", (base,), attrs)
+
+
+def detect(
+    sample: str,
+    *,
+    delimiter: Optional[str] = None,
+    quotechar: Optional[str] = None,
+    header_check: bool = True,
+) -> Detected:
+    """
+    Формат CSV по образцу текста. Явно заданные delimiter/quotechar не
+    угадываются; header_check=False — заголовок считается присутствующим.
+    Разделитель не определился -> DialectError (а не тихий excel).
+    """
+    # последняя строка образца обычно обрезана и сбивает Sniffer
+    if len(sample) >= SAMPLE_SIZE and "\n" in sample:
+        sample = sample[: sample.rindex("\n") + 1]
+
+    if delimiter is not None:
+        dialect = _with(csv.excel, delimiter=delimiter)
+    else:
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=DELIMITERS)
+        except csv.Error:
+            raise DialectError(
+                "Не удалось определить разделитель CSV, укажите его явно (--delimiter)"
+            ) from None
+    if quotechar is not None:
+        dialect = _with(dialect, quotechar=quotechar)
+
+    has_header = True
+    if header_check:
+        try:
+            has_header = _FixedSniffer(dialect).has_header(sample)
+        except csv.Error:
+            pass
+    return Detected(dialect, has_header)
+
+
+def detect_file(
+    f: TextIO,
+    path: str | Path,
+    *,
+    delimiter: Optional[str] = None,
+    quotechar: Optional[str] = None,
+    header_check: bool = True,
+    cache: Optional[DialectCache] = default_cache,
+) -> Detected:
+    """
+    Формат открытого CSV-файла; позиция возвращается в начало. Результат
+    кэшируется по (каталог, заголовок, переопределения). Пустой файл ->
+    ValueError("Пустой CSV или отсутствует заголовок").
+    """
+    sample = f.read(SAMPLE_SIZE)
+    f.seek(0)
+    if not sample.strip():
+        raise ValueError("Пустой CSV или отсутствует заголовок")
+
+    header = sample.split("\n", 1)[0].rstrip("\r")
+    key = (str(Path(path).parent), header, delimiter, quotechar, header_check)
+    detected = cache.get(key) if cache is not None else None
+    if detected is None:
+        detected = detect(
+            sample, delimiter=delimiter, quotechar=quotechar, header_check=header_check
+        )
+        if cache is not None:
+            cache.put(key, detected)
+    return detected
@@ -0,0 +1,202 @@
+# src/lib/csv_schema.py
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from datetime import date
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+SAMPLE_ROWS = 1000  # строк для начального вывода типов
+
+# от узкого к широкому: значение, не подошедшее под тип, расширяет его
+# по этой цепочке; "str" подходит всему
+TYPES = ("null", "bool", "int", "float", "date", "str")
+_WIDER = {
+    "null": ("bool", "int", "float", "date", "str"),
+    "bool": ("str",),
+    "int": ("float", "str"),
+    "float": ("str",),
+    "date": ("str",),
+    "str": (),
+}
+
+_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")  # без ведущих нулей: "007" — код, не число
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+_BOOLS = {"True": True, "False": False, "true": True, "false": False}
+
+
+def _is_float(value: str) -> bool:
+    # синтаксис числа JSON (без nan/inf и ведущих нулей); целые тоже подходят
+    return _NUMBER.fullmatch(value) is not None and math.isfinite(float(value))
+
+
+def _to_number(value: str) -> int | float:
+    "в колонке float целые остаются целыми: 2, а не 2.0"
+    return int(value) if _INT.fullmatch(value) else float(value)
+
+
+def _is_date(value: str) -> bool:
+    if not _DATE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+_FITS: Dict[str, Callable[[str], bool]] = {
+    "null": lambda v: False,
+    "bool": _BOOLS.__contains__,
+    "int": lambda v: _INT.fullmatch(v) is not None,
+    "float": _is_float,
+    "date": _is_date,
+    "str": lambda v: True,
+}
+
+# JSON-значение по тексту ячейки; дата остаётся строкой ISO
+_CONVERT: Dict[str, Callable[[str], Any]] = {
+    "null": lambda v: None,
+    "bool": _BOOLS.__getitem__,
+    "int": int,
+    "float": _to_number,
+    "date": str,
+    "str": str,
+}
+
+
+def widen(kind: str, value: str) -> str:
+    "самый узкий тип не уже kind, которому подходит непустое value"
+    if _FITS[kind](value):
+        return kind
+    for wider in _WIDER[kind]:
+        if _FITS[wider](value):
+            return wider
+    return "str"
+
+
+class Column(NamedTuple):
+    """Колонка схемы: имя, тип и встречались ли пустые ячейки."""
+
+    name: str
+    type: str = "null"
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class Schema:
+    """
+    Типы колонок CSV для типизированного csv_to_json. Выводится по
+    выборке (infer_schema), уточняется проходом по файлу (widened),
+    сохраняется в JSON (dump/load) и переиспользуется для файлов той же
+    формы.
+    """
+
+    columns: tuple[Column, ...]
+
+    @property
+    def names(self) -> list[str]:
+        return [c.name for c in self.columns]
+
+    def widened(self, rows: Iterable[Dict[str, str]]) -> Schema:
+        "схема, которой подходят ещё и rows: типы только расширяются"
+        names = self.names
+        kinds = [c.type for c in self.columns]
+        nullable = [c.nullable for c in self.columns]
+        for row in rows:
+            for i, name in enumerate(names):
+                value = row[name]
+                if value == "":
+                    nullable[i] = True
+                elif kinds[i] != "str" and not _FITS[kinds[i]](value):
+                    kinds[i] = widen(kinds[i], value)
+        return Schema(tuple(map(Column, names, kinds, nullable)))
+
+    def converter(
+        self, fieldnames: list[str], *, check: bool = True
+    ) -> Callable[[Dict[str, str]], Dict]:
+        """
+        Функция: строка CSV (словарь строк) -> словарь JSON-значений.
+        Пустая ячейка типизированной колонки -> None; значение, не
+        подходящее под тип -> ValueError. check=False — строки уже прошли
+        через widened этой схемы, проверку пропускаем.
+        """
+        if fieldnames != self.names:
+            raise ValueError(
+                f"Колонки CSV {fieldnames} не совпадают со схемой {self.names}"
+            )
+        plan = [
+            (c.name, c.type, _FITS[c.type] if check else None, _CONVERT[c.type])
+            for c in self.columns
+        ]
+
+        def convert(row: Dict[str, str]) -> Dict[str, Any]:
+            out: Dict[str, Any] = {}
+            for name, kind, fits, to_value in plan:
+                value = row[name]
+                if kind == "str":
+                    out[name] = value
+                elif value == "":
+                    out[name] = None
+                elif fits is None or fits(value):
+                    out[name] = to_value(value)
+                else:
+                    raise ValueError(
+                        f"Значение {value!r} в колонке {name!r} не подходит под тип {kind}"
+                    )
+            return out
+
+        return convert
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"columns": [c._asdict() for c in self.columns]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Schema:
+        try:
+            columns = tuple(Column(**c) for c in data["columns"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Неверное описание схемы: {exc}") from None
+        for c in columns:
+            if c.type not in TYPES:
+                raise ValueError(f"Неизвестный тип колонки {c.name!r}: {c.type}")
+        return cls(columns)
+
+    def dump(self, path: str | Path) -> None:
+        Path(path).write_text(
+            json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> Schema:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def infer_schema(
+    rows: Iterable[Dict[str, str]],
+    fieldnames: Optional[list[str]] = None,
+    *,
+    sample_rows: Optional[int] = SAMPLE_ROWS,
+) -> Schema:
+    """
+    Схема по первым sample_rows строкам (None — по всем). fieldnames
+    задают порядок колонок, иначе он берётся из первой строки.
+    """
+    rows = iter(rows)
+    if fieldnames is None:
+        first = next(rows, None)
+        if first is None:
+            return Schema(())
+        # ключ None — поля сверх заголовка у csv.DictReader, колонки у них нет
+        fieldnames = [k for k in first if k is not None]
+        rows = chain([first], rows)
+    schema = Schema(tuple(Column(name) for name in fieldnames))
+    if sample_rows is not None:
+        rows = islice(rows, sample_rows)
+    return schema.widened(rows)
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 import csv
+from contextlib import ExitStack
+from itertools import chain, islice
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from src.lib.csv_dialect import detect_file
+
+MAX_ROWS = 1_048_576  # строк на листе Excel
+SAMPLE_ROWS = 1000  # строк для подбора ширины колонок в режиме "sample"
 
 
 def _check_suffix(path: Path, expected: str) -> None:
@@ -15,12 +23,94 @@ def _ensure_parent_dir(path: Path) -> None:
         parent.mkdir(parents=True, exist_ok=True)
 
 
-def csv_to_xlsx(csv_path: str, xlsx_path: str) -> None:
+def _open_reader(
+    f: TextIO, path: Path, dialect_options: dict[str, Any]
+) -> Iterator[list[str]]:
+    "csv.reader по файлу с определённым диалектом; заголовок уже проверен"
+    detected = detect_file(f, path, **dialect_options)
+    reader = csv.reader(f, dialect=detected.dialect)
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise ValueError("Пустой CSV или отсутствует заголовок")
+
+    if (
+        not detected.has_header
+        or not header
+        or all((h or "").strip() == "" for h in header)
+    ):
+        raise ValueError("Пустой CSV или отсутствует заголовок")
+    return chain([header], reader)
+
+
+def _row_source(
+    stack: ExitStack, src: Path, dialect_options: dict[str, Any]
+) -> Callable[[], Iterator[list[str]]]:
+    "функция, каждый вызов которой заново проходит источник (заголовок первым)"
+    if src.suffix.lower() == ".col":
+        from src.lib.columnar import ColumnarTable
+
+        table = stack.enter_context(ColumnarTable(src))
+        return lambda: chain([table.columns], map(list, table.iter_rows()))
+
+    f = stack.enter_context(src.open(encoding="utf-8"))
+
+    def reopen() -> Iterator[list[str]]:
+        f.seek(0)
+        return _open_reader(f, src, dialect_options)
+
+    return reopen
+
+
+def _fit(row: list[str], width: int) -> list[str]:
+    "строку под длину заголовка: короткие дополняем, длинные обрезаем"
+    if len(row) < width:
+        return row + [""] * (width - len(row))
+    if len(row) > width:
+        return row[:width]
+    return row
 
+
+def _column_widths(rows: Iterable[list[str]], header: list[str]) -> list[int]:
+    widths = [max(8, len(str(h))) for h in header]
+    for row in rows:
+        for idx, cell in enumerate(row):
+            if len(cell) > widths[idx]:
+                widths[idx] = len(cell)
+    return widths
+
+
+def csv_to_xlsx(
+    csv_path: str,
+    xlsx_path: str,
+    *,
+    widths: str = "sample",
+    sample_rows: int = SAMPLE_ROWS,
+    max_rows: int = MAX_ROWS,
+    delimiter: str | None = None,
+    quotechar: str | None = None,
+    header_check: bool = True,
+) -> None:
+    """
+    CSV в XLSX через write-only книгу openpyxl: строки пишутся по мере
+    чтения, память не растёт с размером файла. Ширины колонок задаются
+    до записи строк:
+      widths="sample" — по первым sample_rows строкам (один проход);
+      widths="scan"   — отдельным дешёвым проходом по всему файлу.
+    Когда лист доходит до max_rows строк (предел Excel), продолжаем на
+    следующем листе (Sheet2, Sheet3, ...), заголовок повторяется.
+    delimiter, quotechar, header_check — как у csv_to_json.
+    Источник .col (колоночный кэш CSV) читается без разбора CSV.
+    """
     src = Path(csv_path)
     dst = Path(xlsx_path)
-    _check_suffix(src, ".csv")
+    if src.suffix.lower() != ".col":
+        _check_suffix(src, ".csv")
     _check_suffix(dst, ".xlsx")
+    if widths not in ("sample", "scan"):
+        raise ValueError(f"Неизвестный способ подбора ширины: {widths}")
+    if max_rows < 2:
+        raise ValueError("На листе должно помещаться хотя бы две строки")
 
     try:
         from openpyxl import Workbook
@@ -30,50 +120,44 @@ def csv_to_xlsx(csv_path: str, xlsx_path: str) -> None:
             "Для конвертации в XLSX требуется пакет 'openpyxl'. Установите его или замените реализацию на xlsxwriter."
         ) from exc
 
-    with src.open(encoding="utf-8") as f:
-        sample = f.read(2048)
-        if not sample.strip():
-            raise ValueError("Пустой CSV или отсутствует заголовок")
-        try:
-            dialect = csv.Sniffer().sniff(sample)
-        except csv.Error:
-            dialect = csv.get_dialect("excel")
-        try:
-            has_header = csv.Sniffer().has_header(sample)
-        except csv.Error:
-            has_header = True
-
-        f.seek(0)
-        reader = csv.reader(f, dialect=dialect)
-        try:
-            header = next(reader)
-        except StopIteration:
-            raise ValueError("Пустой CSV или отсутствует заголовок")
-
-        if not has_header or not header or all((h or "").strip() == "" for h in header):
-            raise ValueError("Пустой CSV или отсутствует заголовок")
-
-        rows = [header]
-        col_widths = [max(8, len(str(h))) for h in header]
-        for row in reader:
-            if len(row) < len(header):
-                row = row + [""] * (len(header) - len(row))
-            elif len(row) > len(header):
-                row = row[: len(header)]
-            rows.append(row)
-            for idx, cell in enumerate(row):
-                col_widths[idx] = max(col_widths[idx], len(str(cell)))
-
-    _ensure_parent_dir(dst)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-
-    for row in rows:
-        ws.append(["" if c is None else str(c) for c in row])
-
-    for i, w in enumerate(col_widths, start=1):
-        letter = get_column_letter(i)
-        ws.column_dimensions[letter].width = max(8, w)
+    dialect_options = dict(
+        delimiter=delimiter, quotechar=quotechar, header_check=header_check
+    )
+    with ExitStack() as stack:
+        open_rows = _row_source(stack, src, dialect_options)
+        rows = open_rows()
+        header = next(rows)
+        data = (_fit(row, len(header)) for row in rows)
+
+        if widths == "scan":
+            col_widths = _column_widths(data, header)
+            rows = open_rows()
+            next(rows)
+            data = (_fit(row, len(header)) for row in rows)
+        else:
+            head = list(islice(data, sample_rows))
+            col_widths = _column_widths(head, header)
+            data = chain(head, data)
+
+        _ensure_parent_dir(dst)
+        wb = Workbook(write_only=True)
+
+        def new_sheet(number: int):
+            ws = wb.create_sheet(f"Sheet{number}")
+            for i, w in enumerate(col_widths, start=1):
+                ws.column_dimensions[get_column_letter(i)].width = max(8, w)
+            ws.append(header)
+            return ws
+
+        sheets = 1
+        ws = new_sheet(sheets)
+        used = 1
+        for row in data:
+            if used >= max_rows:
+                sheets += 1
+                ws = new_sheet(sheets)
+                used = 1
+            ws.append(row)
+            used += 1
 
     wb.save(dst)
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import argparse
 import csv
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
-from tabnanny import check
-from typing import Iterable, Sequence
+
+CHUNK_SIZE = 1 << 20  # символов за одно чтение в потоковом режиме
 
 
 def read_text(path: str | Path, encoding: str = "utf-8") -> str:
@@ -10,6 +12,36 @@ def read_text(path: str | Path, encoding: str = "utf-8") -> str:
     return p.read_text(encoding=encoding)
 
 
+def positive_int(value: str) -> int:
+    "type= для argparse: целое > 0, иначе ошибка использования, а не трассировка"
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"должно быть больше нуля: {value}")
+    return number
+
+
+def has_magic(item: str | Path) -> bool:
+    "есть ли в пути glob-символы"
+    return any(ch in str(item) for ch in "*?[")
+
+
+def read_text_chunks(
+    path: str | Path, encoding: str = "utf-8", chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    "читаем файл кусками по chunk_size символов, не загружая его целиком"
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным")
+    with Path(path).open("r", encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
 def write_csv(
     rows: Iterable[Sequence],
     path: str | Path,
@@ -38,9 +70,10 @@ def write_csv(
             w.writerow(r)
 
 
-txt = read_text("../../data/input1.txt")
-print(f"прочитано {len(txt)} символов")
+if __name__ == "__main__":
+    txt = read_text("../../data/input1.txt")
+    print(f"прочитано {len(txt)} символов")
 
-checkpath = "check.csv"
-write_csv([("word", "count"), ("test", 3)], checkpath)
-print(f"записано {checkpath}")
+    checkpath = "check.csv"
+    write_csv([("word", "count"), ("test", 3)], checkpath)
+    print(f"записано {checkpath}")
@@ -2,12 +2,32 @@ from __future__ import annotations
 
 import csv
 import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, TextIO
 
+from src.lib.csv_dialect import detect_file
 
-def _check_suffix(path: Path, expected: str) -> None:
+if TYPE_CHECKING:
+    from src.lib.csv_schema import Schema
 
-    if path.suffix.lower() != expected:
+JSON_SUFFIXES = (".json",)
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")  # JSON Lines: по объекту на строку
+COLUMNAR_SUFFIX = ".col"  # колоночный кэш, см. src.lib.columnar
+READ_SIZE = 1 << 16
+
+_WS = re.compile(r"[ \t\n\r]*")
+_BAD_JSON = "Пустой JSON или неподдерживаемая структура"
+
+
+def _check_suffix(path: Path, expected: str | tuple[str, ...]) -> None:
+
+    if isinstance(expected, str):
+        expected = (expected,)
+    if path.suffix.lower() not in expected:
         raise ValueError("Неверный тип файла")
 
 
@@ -17,89 +37,370 @@ def _ensure_parent_dir(path: Path) -> None:
         parent.mkdir(parents=True, exist_ok=True)
 
 
-def json_to_csv(json_path: str, csv_path: str) -> None:
+@contextmanager
+def _replacing(dst: Path) -> Iterator[Path]:
+    "временный файл рядом с dst; при успехе атомарно подменяет dst"
+    _ensure_parent_dir(dst)
+    fd, name = tempfile.mkstemp(dir=dst.parent, prefix=dst.name + ".", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(name)
+    try:
+        yield tmp
+        tmp.replace(dst)
+    finally:
+        tmp.unlink(missing_ok=True)
 
-    src = Path(json_path)
-    dst = Path(csv_path)
 
-    _check_suffix(src, ".json")
-    _check_suffix(dst, ".csv")
+def _iter_json_array(f: TextIO, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """
+    Элементы JSON-массива верхнего уровня по одному, без загрузки файла
+    целиком: буфер дочитываем, пока raw_decode не разберёт очередной элемент.
+    """
+    decode = json.JSONDecoder().raw_decode
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        # для больших элементов читаем всё крупнее, иначе разбор квадратичный
+        chunk = f.read(max(read_size, len(buf) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
 
-    with src.open(encoding="utf-8") as jf:
+    def next_char() -> str:
+        "следующий непробельный символ ('' в конце файла)"
+        nonlocal pos
+        while True:
+            pos = _WS.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    if next_char() != "[":
+        raise ValueError(_BAD_JSON)
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            next_char()
+            try:
+                value, end = decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not more():
+                    raise ValueError(_BAD_JSON) from None
+                continue
+            if end == len(buf) and not eof and more():
+                continue  # значение на границе буфера могло обрезаться (число)
+            pos = end
+            yield value
+
+            c = next_char()
+            pos += 1
+            if c == "]":
+                break
+            if c != ",":
+                raise ValueError(_BAD_JSON)
+
+    if next_char() != "":
+        raise ValueError(_BAD_JSON)
+
+
+def _iter_ndjson(f: TextIO) -> Iterator[Any]:
+    for line in f:
+        if not line.strip():
+            continue
         try:
-            data = json.load(jf)
+            yield json.loads(line)
         except json.JSONDecodeError:
-            raise ValueError("Пустой JSON или неподдерживаемая структура")
-
-    if not isinstance(data, list) or not data:
-        raise ValueError("Пустой JSON или неподдерживаемая структура")
-    if not all(isinstance(item, dict) for item in data):
-        raise ValueError("Пустой JSON или неподдерживаемая структура")
-
-    first_keys = list(data[0].keys())
-    all_keys = set()
-    for row in data:
-        all_keys.update(row.keys())
-    extra_keys = sorted(k for k in all_keys if k not in first_keys)
-    fieldnames = first_keys + extra_keys
-
-    def _stringify(value):
-        if value is None:
-            return ""
-        if isinstance(value, (dict, list)):
-            return json.dumps(value, ensure_ascii=False)
-        return str(value)
+            raise ValueError(_BAD_JSON) from None
 
-    _ensure_parent_dir(dst)
-    with dst.open("w", encoding="utf-8", newline="") as cf:
-        writer = csv.DictWriter(cf, fieldnames=fieldnames)
-        writer.writeheader()
-        for item in data:
-            row = {key: _stringify(item.get(key, "")) for key in fieldnames}
-            writer.writerow(row)
 
+def iter_json_records(json_path: str | Path) -> Iterator[Dict[str, Any]]:
+    """
+    Записи из JSON-массива объектов (.json) или NDJSON (.ndjson, .jsonl)
+    по одной. Пустой файл, не объекты или битый JSON -> ValueError.
+    """
+    src = Path(json_path)
+    _check_suffix(src, JSON_SUFFIXES + NDJSON_SUFFIXES)
+    ndjson = src.suffix.lower() in NDJSON_SUFFIXES
 
-def csv_to_json(csv_path: str, json_path: str) -> None:
+    empty = True
+    with src.open(encoding="utf-8") as f:
+        for item in _iter_ndjson(f) if ndjson else _iter_json_array(f):
+            if not isinstance(item, dict):
+                raise ValueError(_BAD_JSON)
+            empty = False
+            yield item
+    if empty:
+        raise ValueError(_BAD_JSON)
+
+
+# json.dumps с ensure_ascii=False на каждый вызов собирает новый кодировщик
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _stringify(value: Any) -> str:
+    if type(value) is str:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return _encode(value)
+    return str(value)
+
+
+def _discover_fieldnames(json_path: Path) -> list[str]:
+    "первый проход: ключи первой записи, затем остальные по алфавиту"
+    first_keys: list[str] = []
+    seen: set[str] = set()
+    for n, item in enumerate(iter_json_records(json_path)):
+        if n == 0:
+            first_keys = list(item)
+            seen.update(first_keys)
+        elif not seen.issuperset(item):
+            seen.update(item)
+    first = set(first_keys)
+    return first_keys + sorted(k for k in seen if k not in first)
+
+
+def _write_two_pass(src: Path, out: TextIO) -> None:
+    fieldnames = _discover_fieldnames(src)
+    writer = csv.writer(out)
+    writer.writerow(fieldnames)
+    for item in iter_json_records(src):
+        writer.writerow([_stringify(item.get(key)) for key in fieldnames])
+
+
+def _write_spill(src: Path, out: TextIO, spill: TextIO) -> bool:
+    """
+    Один проход: строки пишем сразу по ключам первой записи, а поздние
+    ключи откладываем в spill (номер строки + значения в NDJSON).
+    Возвращает True, если поздние ключи были и нужна пересборка.
+    """
+    writer = csv.writer(out)
+    first_keys: list[str] = []
+    known: set[str] = set()
+    spilled = False
+    for n, item in enumerate(iter_json_records(src)):
+        if n == 0:
+            first_keys = list(item)
+            known = set(first_keys)
+            writer.writerow(first_keys)
+        writer.writerow([_stringify(item.get(key)) for key in first_keys])
+        if not known.issuperset(item):
+            extra = {k: _stringify(v) for k, v in item.items() if k not in known}
+            spill.write(_encode([n, extra]) + "\n")
+            spilled = True
+    return spilled
+
+
+def _merge_spill(draft: TextIO, spill: TextIO, out: TextIO) -> None:
+    "дописываем к черновику колонки поздних ключей (отсортированные)"
+    extras: set[str] = set()
+    for line in spill:
+        extras.update(json.loads(line)[1])
+    extra_keys = sorted(extras)
+    spill.seek(0)
+
+    reader = csv.reader(draft)
+    writer = csv.writer(out)
+    writer.writerow(next(reader) + extra_keys)
+    pending = (json.loads(line) for line in spill)
+    nxt = next(pending, None)
+    for n, row in enumerate(reader):
+        values: Dict[str, str] = {}
+        if nxt is not None and nxt[0] == n:
+            values = nxt[1]
+            nxt = next(pending, None)
+        writer.writerow(row + [values.get(key, "") for key in extra_keys])
 
-    src = Path(csv_path)
-    dst = Path(json_path)
 
-    _check_suffix(src, ".csv")
-    _check_suffix(dst, ".json")
+def _write_columnar(src: Path, out: TextIO) -> None:
+    "колоночный кэш в CSV: колонки и значения уже разложены при сборке"
+    from src.lib.columnar import ColumnarTable
 
+    with ColumnarTable(src) as table:
+        writer = csv.writer(out)
+        writer.writerow(table.columns)
+        writer.writerows(table.iter_rows())
+
+
+def json_to_csv(json_path: str, csv_path: str, *, schema: str = "spill") -> None:
+    """
+    Потоковая конвертация JSON-массива объектов или NDJSON в CSV: записи
+    читаются и пишутся по одной. Колонки: ключи первой записи, затем
+    остальные по алфавиту. Поздние ключи:
+      schema="spill"    — один проход, поздние значения во временный файл,
+                          пересборка только если такие ключи встретились;
+      schema="two-pass" — сначала проход только за ключами, потом запись.
+    Результат пишется во временный файл и атомарно переименовывается.
+    Источник .col (колоночный кэш из этого JSON) читается напрямую.
+    """
+    src = Path(json_path)
+    dst = Path(csv_path)
+
+    _check_suffix(src, JSON_SUFFIXES + NDJSON_SUFFIXES + (COLUMNAR_SUFFIX,))
+    _check_suffix(dst, ".csv")
+    if schema not in ("spill", "two-pass"):
+        raise ValueError(f"Неизвестный режим схемы: {schema}")
+
+    if src.suffix.lower() == COLUMNAR_SUFFIX:
+        with _replacing(dst) as tmp, tmp.open("w", encoding="utf-8", newline="") as out:
+            _write_columnar(src, out)
+        return
+
+    if schema == "two-pass":
+        with _replacing(dst) as tmp, tmp.open("w", encoding="utf-8", newline="") as out:
+            _write_two_pass(src, out)
+        return
+
+    with (
+        _replacing(dst) as draft,
+        tempfile.TemporaryFile("w+", encoding="utf-8", dir=dst.parent) as spill,
+    ):
+        with draft.open("w", encoding="utf-8", newline="") as out:
+            spilled = _write_spill(src, out, spill)
+        if spilled:
+            spill.seek(0)
+            with (
+                _replacing(draft) as tmp,
+                draft.open(encoding="utf-8", newline="") as rows,
+                tmp.open("w", encoding="utf-8", newline="") as out,
+            ):
+                _merge_spill(rows, spill, out)
+
+
+def _iter_csv_rows(src: Path, **dialect_options: Any) -> Iterator[Dict[str, str]]:
+    """
+    непустые строки CSV словарями; без заголовка -> ValueError.
+    dialect_options — переопределения для detect_file (delimiter, quotechar,
+    header_check)
+    """
     with src.open(encoding="utf-8") as f:
-        sample = f.read(2048)
-        if not sample.strip():
-            raise ValueError("Пустой CSV или отсутствует заголовок")
-        try:
-            dialect = csv.Sniffer().sniff(sample)
-        except csv.Error:
-            dialect = csv.get_dialect("excel")
-        try:
-            has_header = csv.Sniffer().has_header(sample)
-        except csv.Error:
-            has_header = True
-        f.seek(0)
-        reader = csv.DictReader(f, dialect=dialect)
+        detected = detect_file(f, src, **dialect_options)
+        reader = csv.DictReader(f, dialect=detected.dialect)
 
         if (
-            not has_header
+            not detected.has_header
             or not reader.fieldnames
             or any(h is None or h == "" for h in reader.fieldnames)
         ):
             raise ValueError("Пустой CSV или отсутствует заголовок")
-        rows = []
         for row in reader:
 
             if row is None:
                 continue
             if all((v is None or str(v) == "") for v in row.values()):
                 continue
-            rows.append({k: ("" if v is None else str(v)) for k, v in row.items()})
+            yield {k: ("" if v is None else str(v)) for k, v in row.items()}
 
-    if not rows:
-        raise ValueError("Пустой CSV или отсутствует заголовок")
 
-    _ensure_parent_dir(dst)
-    with dst.open("w", encoding="utf-8") as jf:
-        json.dump(rows, jf, ensure_ascii=False, indent=2)
+def _iter_columnar_rows(src: Path) -> Iterator[Dict[str, str]]:
+    "строки колоночного кэша словарями, как их отдаёт _iter_csv_rows"
+    from src.lib.columnar import ColumnarTable
+
+    with ColumnarTable(src) as table:
+        columns = table.columns
+        if any(name == "" for name in columns):  # как в _iter_csv_rows
+            raise ValueError("Пустой CSV или отсутствует заголовок")
+        for values in table.iter_rows():
+            if any(values):  # пустые строки кэш хранит ради csv_to_xlsx
+                yield dict(zip(columns, values))
+
+
+def _typed_rows(
+    rows: Iterator[Dict[str, str]], schema: Schema, check: bool
+) -> Iterator[Dict]:
+    convert = None
+    for row in rows:
+        if convert is None:
+            fieldnames = [k for k in row if k is not None]
+            convert = schema.converter(fieldnames, check=check)
+        yield convert(row)
+
+
+def csv_to_json(
+    csv_path: str,
+    json_path: str,
+    *,
+    indent: int | None = 2,
+    delimiter: str | None = None,
+    quotechar: str | None = None,
+    header_check: bool = True,
+    types: bool | Schema = False,
+    sample_rows: int = 1000,
+) -> Schema | None:
+    """
+    Потоковая конвертация CSV в JSON: элементы массива пишутся по одному,
+    по мере чтения. indent=2 даёт тот же текст, что json.dump(rows, indent=2);
+    indent=None — компактная запись без пробелов. Если json_path
+    с суффиксом .ndjson/.jsonl, пишем NDJSON: по объекту на строку.
+    Формат CSV определяет csv_dialect.detect_file; delimiter/quotechar
+    задают его явно, header_check=False отключает проверку заголовка.
+    Источник .col (колоночный кэш CSV) читается без разбора CSV.
+
+    По умолчанию все значения — строки. types=True включает типы
+    (csv_schema): они выводятся по первым sample_rows строкам и
+    уточняются проходом по всему файлу, затем числа, логические значения
+    и null пишутся как есть (файл читается дважды). types=Schema — готовая
+    схема без вывода; неподходящее значение -> ValueError.
+    Возвращает использованную схему (None без типов).
+    """
+    src = Path(csv_path)
+    dst = Path(json_path)
+
+    _check_suffix(src, (".csv", COLUMNAR_SUFFIX))
+    _check_suffix(dst, JSON_SUFFIXES + NDJSON_SUFFIXES)
+    ndjson = dst.suffix.lower() in NDJSON_SUFFIXES
+
+    if ndjson or indent is None:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, indent=indent).encode
+    # элемент массива на уровень глубже: значения-строки переводов строк
+    # не содержат (они экранируются), так что отступ добавляется заменой
+    pad = "\n" + " " * (indent or 0)
+
+    def open_rows() -> Iterator[Dict[str, str]]:
+        if src.suffix.lower() == COLUMNAR_SUFFIX:
+            return _iter_columnar_rows(src)
+        return _iter_csv_rows(
+            src, delimiter=delimiter, quotechar=quotechar, header_check=header_check
+        )
+
+    schema = None
+    if types is True:
+        from src.lib.csv_schema import infer_schema
+
+        schema = infer_schema(open_rows(), sample_rows=sample_rows)
+        schema = schema.widened(open_rows())
+    elif types:
+        schema = types
+
+    with _replacing(dst) as tmp, tmp.open("w", encoding="utf-8") as jf:
+        empty = True
+        rows = open_rows()
+        if schema is not None:
+            # выведенной схеме файл уже соответствует: проверка не нужна
+            rows = _typed_rows(rows, schema, check=types is not True)
+        for row in rows:
+            if ndjson:
+                jf.write(encode(row) + "\n")
+            elif indent is None:
+                jf.write(("[" if empty else ",") + encode(row))
+            else:
+                jf.write(("[" if empty else ",") + pad + encode(row).replace("\n", pad))
+            empty = False
+
+        if empty:
+            raise ValueError("Пустой CSV или отсутствует заголовок")
+        if not ndjson:
+            jf.write("]" if indent is None else "\n]")
+    return schema
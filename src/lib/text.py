@@ -1,36 +1,70 @@
 # src/lib/text.py
 from __future__ import annotations
 
+import heapq
 import re
 import unicodedata
 from collections import Counter
-from typing import Dict, List, Tuple
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from functools import partial
+from io import TextIOBase
+from itertools import chain
 
 wordRe = re.compile(r"\b\w+(?:-\w+)*\b", re.UNICODE)  # \w и дефисы
 
 spaceRe = re.compile(r"\s+")  # сливаем пробелы м в один
 
+# пробелы и управляющие символы: после normalize это всегда пробел,
+# значит слово через них не переходит и по ним можно резать поток
+boundaryRe = re.compile(r"[\s\x00-\x1f\x7f-\x9f]")
+
+PIECE_SIZE = 1 << 16  # по столько символов режем строку/файл в iter_tokens
+
+
+_SPECIAL_CATS = frozenset({"Cc", "Cf"})
+
+
+def _special_or_self(code: int) -> int:
+    return 32 if unicodedata.category(chr(code)) in _SPECIAL_CATS else code
+
+
+class _SpecialsTable(dict):
+    """
+    Таблица для str.translate: Cc/Cf -> пробел, остальные символы без изменений.
+    Категория считается один раз на символ и запоминается, так что таблица
+    дозаполняется по мере работы, а не перебором всего Unicode при импорте.
+    """
+
+    def __missing__(self, code: int) -> int:
+        value = self[code] = _special_or_self(code)
+        return value
+
+
+_ASCII_SPECIALS = {code: _special_or_self(code) for code in range(128)}
+
+_SPECIALS = _SpecialsTable((code, _special_or_self(code)) for code in range(256))
+
+# та же таблица, но ещё и ё -> е за тот же проход
+_SPECIALS_YO = _SpecialsTable(_SPECIALS)
+_SPECIALS_YO[ord("ё")] = ord("е")
+_SPECIALS_YO[ord("Ё")] = ord("Е")
+
 
 def specials2Space(text: str) -> str:
     "заменяем спецсимволы на пробел"
-    chars = []
-    append = chars.append
-    for ch in text:
-        cat = unicodedata.category(ch)
-        if cat in {"Cc", "Cf"}:
-            append(" ")
-        else:
-            append(ch)
-    return "".join(chars)
+    return text.translate(_SPECIALS)
 
 
 def normalize(text: str, *, casefold: bool = True, yo2e: bool = True) -> str:
 
-    if yo2e:
-        text = text.replace("ё", "е").replace("Ё", "Е")
+    # только ASCII: ни ё, ни Cf нет, casefold совпадает с lower
+    if text.isascii():
+        text = " ".join(text.translate(_ASCII_SPECIALS).split())
+        return text.lower() if casefold else text
 
-    text = specials2Space(text)
-    text = spaceRe.sub(" ", text).strip()
+    text = text.translate(_SPECIALS_YO if yo2e else _SPECIALS)
+    # split() режет по тем же пробелам, что и spaceRe, и сам убирает края
+    text = " ".join(text.split())
 
     if casefold:
         text = text.casefold()
@@ -38,20 +72,187 @@ def normalize(text: str, *, casefold: bool = True, yo2e: bool = True) -> str:
     return text
 
 
-def tokenize(text: str) -> List[str]:
+def tokenize(text: str) -> list[str]:
     return wordRe.findall(text)
 
 
-def count_freq(tokens: List[str]) -> Dict[str, int]:
+def count_freq(tokens: Iterable[str]) -> dict[str, int]:
     "считаем частоты"
     return dict(Counter(tokens))
 
 
-def top_n(freq: Dict[str, int], n: int = 5) -> List[Tuple[str, int]]:
+def normalized_tokens(
+    text: str, *, casefold: bool = True, yo2e: bool = True
+) -> list[str]:
+    """
+    tokenize(normalize(text)) без промежуточных копий: Cc/Cf и пробелы и так
+    не входят в слова (\\w), поэтому их замена и склейка на токены не влияют.
+    """
+    if text.isascii():
+        return wordRe.findall(text.lower() if casefold else text)
+    if yo2e:
+        text = text.replace("ё", "е").replace("Ё", "Е")
+    if casefold:
+        text = text.casefold()
+    return wordRe.findall(text)
+
+
+def _last_boundary(chunk: str) -> int:
+    "индекс сразу после последнего разделителя в chunk, 0 если его нет"
+    end = len(chunk)
+    window = 256
+    while end > 0:
+        start = max(0, end - window)
+        last = None
+        for last in boundaryRe.finditer(chunk, start, end):
+            pass
+        if last is not None:
+            return last.end()
+        end = start
+        window *= 2
+    return 0
+
+
+def iter_token_chunks(
+    chunks: Iterable[str], *, casefold: bool = True, yo2e: bool = True
+) -> Iterator[list[str]]:
+    """
+    Потоковый tokenize(normalize(...)): режем куски по последнему разделителю,
+    хвост (возможно, недочитанное слово) переносим в следующий кусок.
+    Отдаём список токенов на каждый обработанный кусок.
+    """
+    pending: list[str] = []
+    for chunk in chunks:
+        cut = _last_boundary(chunk)
+        if not cut:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        yield normalized_tokens("".join(pending), casefold=casefold, yo2e=yo2e)
+        pending = [chunk[cut:]]
+
+    if pending:
+        yield normalized_tokens("".join(pending), casefold=casefold, yo2e=yo2e)
+
+
+def iter_tokens(
+    chunks: str | TextIOBase | Iterable[str],
+    *,
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Iterator[str]:
+    """
+    Лениво отдаём те же токены, что tokenize(normalize(текст)).
+    chunks — строка, открытый текстовый файл или итерируемое кусков
+    текста. Куски склеиваются как есть: граница куска — не граница слова
+    (так режет read_text_chunks), поэтому строки без перевода строки
+    (splitlines()) нужно передавать с ним — splitlines(keepends=True).
+    В памяти держим только текущий кусок, а не весь текст.
+    """
+    if isinstance(chunks, str):
+        pieces: Iterable[str] = (
+            chunks[i : i + PIECE_SIZE] for i in range(0, len(chunks), PIECE_SIZE)
+        )
+    elif hasattr(chunks, "read"):
+        pieces = iter(partial(chunks.read, PIECE_SIZE), "")
+    else:
+        pieces = chunks
+
+    batches = iter_token_chunks(pieces, casefold=casefold, yo2e=yo2e)
+    return chain.from_iterable(batches)
+
+
+def count_freq_stream(
+    chunks: Iterable[str], *, casefold: bool = True, yo2e: bool = True
+) -> dict[str, int]:
+    "частоты по потоку кусков текста; результат как у count_freq(tokenize(normalize(...)))"
+    return count_freq(iter_tokens(chunks, casefold=casefold, yo2e=yo2e))
+
+
+def merge_counts(parts: Sequence[Mapping[str, int]]) -> dict[str, int]:
+    """
+    Сливаем частичные частоты попарно (дерево): (0+1), (2+3), ... и так далее.
+    Соседние части сливаются слева направо, поэтому порядок слов в результате
+    такой же, как при последовательном проходе по тексту.
+    """
+    level = [Counter(part) for part in parts]
+    if not level:
+        return {}
+    while len(level) > 1:
+        merged = []
+        for i in range(0, len(level) - 1, 2):
+            left = level[i]
+            left.update(level[i + 1])
+            merged.append(left)
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return dict(level[0])
+
+
+def _rank(kv: tuple[str, int]) -> tuple[int, str]:
+    # сначала по -count, затем по слову
+    return -kv[1], kv[0]
+
+
+def top_n(freq: dict[str, int], n: int = 5) -> list[tuple[str, int]]:
     "возвращаем по убыванию частоты или алфавиту"
-    # Сортируем: сначала по -count, затем по слову
-    items = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
-    return items[:n]
+    if n < 0:
+        return sorted(freq.items(), key=_rank)[:n]
+    # куча на n элементов: O(V log n) вместо сортировки всего словаря
+    return heapq.nsmallest(n, freq.items(), key=_rank)
+
+
+class SpaceSaving:
+    """
+    Приближённый top-k по потоку слов (алгоритм Space-Saving).
+    Хранит не больше capacity слов: новое слово вытесняет самое редкое
+    и получает его счётчик + 1, так что оценка завышена не больше чем на error.
+    Пока вытеснений не было (exact), счётчики точные.
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        if capacity <= 0:
+            raise ValueError("capacity должен быть положительным")
+        self.capacity = capacity
+        self.total = 0
+        self.exact = True
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        # по одной записи (count, word) на слово; count может отставать
+        self._heap: list[tuple[int, str]] = []
+
+    def update(self, tokens: Iterable[str]) -> None:
+        counts = self.counts
+        for word in tokens:
+            self.total += 1
+            count = counts.get(word)
+            if count is not None:
+                counts[word] = count + 1
+            elif len(counts) < self.capacity:
+                counts[word] = 1
+                heapq.heappush(self._heap, (1, word))
+            else:
+                self._replace_min(word)
+
+    def _replace_min(self, word: str) -> None:
+        heap = self._heap
+        counts = self.counts
+        # поднимаем устаревшие записи, пока на вершине не окажется настоящий минимум
+        while heap[0][0] != counts[heap[0][1]]:
+            old = heap[0][1]
+            heapq.heapreplace(heap, (counts[old], old))
+
+        min_count, victim = heapq.heapreplace(heap, (heap[0][0] + 1, word))
+        del counts[victim]
+        self.errors.pop(victim, None)
+        counts[word] = min_count + 1
+        self.errors[word] = min_count
+        self.exact = False
+
+    def top(self, n: int = 5) -> list[tuple[str, int]]:
+        "оценки частот n самых частых слов, порядок как у top_n"
+        return top_n(self.counts, n)
 
 
 # #normalize
@@ -0,0 +1,247 @@
+# src/lib/text_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+
+MAGIC = b"LPFQ"
+VERSION = 1
+DEFAULT_MAX_BYTES = 256 << 20  # общий размер кэша, дальше вытесняем старые записи
+# каталог просматриваем для вытеснения не на каждый put, а когда процесс
+# записал в него max_bytes / EVICT_SLACK байт: обход корпуса из N файлов
+# иначе стоит O(N^2) stat-ов. Каталог может превысить лимит на эту долю
+# (на каждый пишущий процесс)
+EVICT_SLACK = 16
+
+# magic, версия, флаги нормализации, размер и mtime файла, хэш содержимого
+# (нули — хэш не считали)
+_HEADER = struct.Struct("<4sBBQq32s")
+# число слов, длина блока слов в байтах
+_TABLE = struct.Struct("<II")
+_NO_DIGEST = bytes(32)
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "labsproga" / "freq"
+
+
+def file_digest(path: str | Path) -> bytes:
+    "хэш содержимого файла (blake2b, 32 байта), читаем блоками"
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+
+def dump_freq(freq: dict[str, int]) -> bytes:
+    """
+    Компактная запись частот: слова одной UTF-8 строкой через "\\n"
+    (в слове перевода строки не бывает) и массив счётчиков uint64.
+    """
+    words = "\n".join(freq).encode("utf-8")
+    counts = array("Q", freq.values())
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return _TABLE.pack(len(freq), len(words)) + words + counts.tobytes()
+
+
+def load_freq(data: bytes | memoryview, offset: int = 0) -> dict[str, int]:
+    "обратное к dump_freq; порядок слов сохраняется"
+    n_words, words_len = _TABLE.unpack_from(data, offset)
+    offset += _TABLE.size
+    if n_words == 0:
+        return {}
+
+    words = bytes(data[offset : offset + words_len]).decode("utf-8").split("\n")
+    offset += words_len
+    counts = array("Q")
+    counts.frombytes(data[offset : offset + 8 * n_words])
+    if sys.byteorder == "big":
+        counts.byteswap()
+    if len(words) != n_words or len(counts) != n_words:
+        raise ValueError("повреждённая таблица частот")
+    return dict(zip(words, counts))
+
+
+def flags_of(casefold: bool, yo2e: bool) -> int:
+    "флаги normalize одним байтом (входят в ключ кэша)"
+    return int(casefold) | int(yo2e) << 1
+
+
+def cache_key(path: str | Path, encoding: str, flags: int) -> str:
+    "имя записи кэша для файла: хэш от (путь, кодировка, флаги)"
+    key = f"{Path(path).resolve()}\0{encoding}\0{flags}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+# байты, записанные этим процессом в каталог кэша после последнего
+# вытеснения; общие для всех FreqCache процесса (в воркерах их создают на файл)
+_written_since_evict: dict[str, int] = {}
+
+
+class FreqCache:
+    """
+    Кэш таблиц частот на диске. Запись ищется по (путь, кодировка, флаги
+    normalize) и годится, если у файла тот же размер и mtime. С
+    content_hash=True годится и при другом mtime, если совпал хэш
+    содержимого, но тогда put читает файл второй раз, уже после подсчёта.
+    Размер каталога ограничен: дольше всех не использованные записи
+    удаляются (LRU по mtime записи).
+    """
+
+    SUFFIX = ".freq"
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        *,
+        content_hash: bool = False,
+    ):
+        self.dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+
+    def _entry(self, path: str | Path, encoding: str, flags: int) -> Path:
+        return self.dir / (cache_key(path, encoding, flags) + self.SUFFIX)
+
+    def get(
+        self,
+        path: str | Path,
+        *,
+        encoding: str = "utf-8",
+        casefold: bool = True,
+        yo2e: bool = True,
+    ) -> dict[str, int] | None:
+        flags = flags_of(casefold, yo2e)
+        entry = self._entry(path, encoding, flags)
+        try:
+            st = os.stat(path)
+            data = entry.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            magic, version, e_flags, size, mtime_ns, digest = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION or e_flags != flags:
+                raise ValueError("чужая или устаревшая запись")
+            if size != st.st_size:
+                return None
+            if mtime_ns != st.st_mtime_ns and (
+                not self.content_hash
+                or digest == _NO_DIGEST
+                or digest != file_digest(path)
+            ):
+                return None
+            freq = load_freq(data, _HEADER.size)
+        except (ValueError, struct.error):
+            entry.unlink(missing_ok=True)
+            return None
+
+        try:
+            if mtime_ns != st.st_mtime_ns:
+                # содержимое то же, файл просто "потрогали": запоминаем новый mtime
+                header = _HEADER.pack(
+                    MAGIC, VERSION, flags, size, st.st_mtime_ns, digest
+                )
+                self._write(entry, header + data[_HEADER.size :])
+            else:
+                os.utime(entry)  # отметка использования для LRU
+        except OSError:
+            pass
+        return freq
+
+    def put(
+        self,
+        path: str | Path,
+        freq: dict[str, int],
+        *,
+        encoding: str = "utf-8",
+        casefold: bool = True,
+        yo2e: bool = True,
+        stat: os.stat_result | None = None,
+    ) -> None:
+        """
+        Сохраняем частоты файла. stat — состояние файла до подсчёта: если файл
+        успел измениться, запись не сохраняем. Ошибки записи кэша не фатальны.
+        """
+        flags = flags_of(casefold, yo2e)
+        try:
+            st = os.stat(path)
+            if stat is not None and (
+                (stat.st_size, stat.st_mtime_ns) != (st.st_size, st.st_mtime_ns)
+            ):
+                return
+            digest = file_digest(path) if self.content_hash else _NO_DIGEST
+            header = _HEADER.pack(
+                MAGIC, VERSION, flags, st.st_size, st.st_mtime_ns, digest
+            )
+            self.dir.mkdir(parents=True, exist_ok=True)
+            data = header + dump_freq(freq)
+            self._write(self._entry(path, encoding, flags), data)
+            self._note_written(len(data))
+        except OSError:
+            return
+
+    def _write(self, entry: Path, data: bytes) -> None:
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+
+    def _note_written(self, size: int) -> None:
+        key = str(self.dir.resolve())
+        written = _written_since_evict.get(key, 0) + size
+        if written < self.max_bytes // EVICT_SLACK:
+            _written_since_evict[key] = written
+            return
+        _written_since_evict[key] = 0
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.dir.glob("*" + self.SUFFIX):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def count_freq_cached(
+    path: str | Path,
+    compute: Callable[[], dict[str, int]],
+    cache: FreqCache | None,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> dict[str, int]:
+    "частоты из кэша, а при промахе — compute() с сохранением результата"
+    if cache is None:
+        return compute()
+
+    key = dict(encoding=encoding, casefold=casefold, yo2e=yo2e)
+    freq = cache.get(path, **key)
+    if freq is not None:
+        return freq
+
+    before = os.stat(path)
+    freq = compute()
+    cache.put(path, freq, stat=before, **key)
+    return freq
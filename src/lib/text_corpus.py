@@ -0,0 +1,133 @@
+# src/lib/text_corpus.py
+from __future__ import annotations
+
+import glob
+import itertools
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.lib.io_txt_csv import has_magic, read_text_chunks, write_csv
+from src.lib.pool import map_bounded
+from src.lib.text import count_freq_stream
+from src.lib.text_cache import FreqCache, count_freq_cached
+
+
+@dataclass
+class FileResult:
+    """Итог обработки одного файла корпуса."""
+
+    path: Path
+    freq: Optional[Dict[str, int]]
+    size: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def glob_root(pattern: str | Path) -> Path:
+    "каталог до первой части шаблона с метасимволами: от него строятся имена"
+    parts = Path(pattern).parts[:-1]
+    base = list(itertools.takewhile(lambda part: not has_magic(part), parts))
+    return Path(*base) if base else Path(".")
+
+
+def iter_input_files(
+    inputs: Iterable[str | Path], pattern: str = "*.txt"
+) -> Iterator[Tuple[Path, Path]]:
+    """
+    Разворачиваем входы в файлы: каталог обходим рекурсивно по pattern,
+    glob-шаблон раскрываем, обычный путь отдаём как есть.
+    Отдаём (файл, каталог, от которого строится его относительное имя):
+    для шаблона это его начало без метасимволов, так что dir/**/*.txt
+    сохраняет подкаталоги dir.
+    Обход ленивый — список всех файлов в память не собирается.
+    """
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for found in path.rglob(pattern):
+                if found.is_file():
+                    yield found, path
+        elif has_magic(item):
+            root = glob_root(item)
+            for name in glob.iglob(str(item), recursive=True):
+                found = Path(name)
+                if found.is_file():
+                    yield found, root
+        else:
+            yield path, path.parent
+
+
+def per_file_path(path: Path, root: Path, per_file_dir: str | Path) -> Path:
+    "отдельный CSV файла: относительный путь от корня + .csv"
+    out = Path(per_file_dir) / path.relative_to(root)
+    return out.with_name(out.name + ".csv")
+
+
+def _count_file(
+    task: Tuple[
+        Path, Path, str, Optional[str], Optional[str], Sequence[str], Optional[str]
+    ],
+) -> FileResult:
+    "работа процесса: частоты одного файла (+ его отдельный CSV)"
+    path, root, encoding, cache_dir, per_file_dir, header, clash = task
+    if clash is not None:
+        return FileResult(path, None, 0, 0.0, clash)
+    start = time.perf_counter()
+    try:
+        cache = FreqCache(cache_dir) if cache_dir else None
+        freq = count_freq_cached(
+            path,
+            lambda: count_freq_stream(read_text_chunks(path, encoding=encoding)),
+            cache,
+            encoding=encoding,
+        )
+        if per_file_dir:
+            out = per_file_path(path, root, per_file_dir)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            rows = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
+            write_csv(rows, out, header=tuple(header))
+        size = path.stat().st_size
+    except (OSError, UnicodeDecodeError) as exc:
+        return FileResult(path, None, 0, time.perf_counter() - start, str(exc))
+    return FileResult(path, freq, size, time.perf_counter() - start)
+
+
+def count_corpus(
+    files: Iterable[Tuple[Path, Path]],
+    *,
+    jobs: int = 1,
+    encoding: str = "utf-8",
+    cache_dir: Optional[str | Path] = None,
+    per_file_dir: Optional[str | Path] = None,
+    header: Sequence[str] = ("word", "count"),
+    max_pending: Optional[int] = None,
+) -> Iterator[FileResult]:
+    """
+    Считаем частоты по множеству файлов в jobs процессах (см. map_bounded:
+    пути берутся из files лениво, в работе не больше max_pending задач).
+    Результаты отдаём по мере готовности, ошибки — в FileResult.error;
+    файл, чей отдельный CSV совпал бы с уже занятым, не считаем, а
+    отдаём с ошибкой.
+    """
+    options = (
+        encoding,
+        str(cache_dir) if cache_dir else None,
+        str(per_file_dir) if per_file_dir else None,
+        tuple(header),
+    )
+
+    def tasks() -> Iterator[tuple]:
+        seen: Dict[str, Path] = {}
+        for path, root in files:
+            clash = None
+            if per_file_dir:
+                out = per_file_path(path, root, per_file_dir)
+                first = seen.setdefault(os.path.abspath(out), path)
+                if first is not path:
+                    clash = f"{out} уже результат для {first}"
+            yield (path, root, *options, clash)
+
+    return map_bounded(_count_file, tasks(), jobs=jobs, max_pending=max_pending)
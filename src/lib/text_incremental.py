@@ -0,0 +1,137 @@
+# src/lib/text_incremental.py
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from src.lib.text import count_freq_stream, merge_counts
+from src.lib.text_cache import cache_key, dump_freq, flags_of, load_freq
+from src.lib.text_parallel import READ_SIZE, iter_range_chunks, splittable
+
+MAGIC = b"LPIX"
+VERSION = 1
+TAIL_SIZE = 4096  # сколько байт перед offset сверяем, чтобы заметить перезапись
+
+# magic, версия, флаги normalize, st_dev, st_ino, offset, хэш хвоста
+_HEADER = struct.Struct("<4sBBQQQ32s")
+
+_SPACES = (b" ", b"\t", b"\n", b"\r", b"\x0b", b"\x0c")
+
+
+def state_path_for(
+    state_dir: str | Path,
+    path: str | Path,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Path:
+    "файл состояния для path в каталоге state_dir"
+    name = cache_key(path, encoding, flags_of(casefold, yo2e))
+    return Path(state_dir) / (name + ".state")
+
+
+def _tail_digest(f: BinaryIO, offset: int) -> bytes:
+    start = max(0, offset - TAIL_SIZE)
+    f.seek(start)
+    return hashlib.blake2b(f.read(offset - start), digest_size=32).digest()
+
+
+def _last_safe_offset(f: BinaryIO, start: int, end: int) -> int:
+    "позиция сразу после последнего байта-пробела в [start, end) (start, если нет)"
+    pos = end
+    while pos > start:
+        block_start = max(start, pos - READ_SIZE)
+        f.seek(block_start)
+        block = f.read(pos - block_start)
+        idx = max(block.rfind(space) for space in _SPACES)
+        if idx >= 0:
+            return block_start + idx + 1
+        pos = block_start
+    return start
+
+
+def _load_state(
+    state_path: Path, flags: int
+) -> Optional[Tuple[int, int, int, bytes, Dict[str, int]]]:
+    try:
+        data = state_path.read_bytes()
+        magic, version, s_flags, dev, ino, offset, tail = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or s_flags != flags:
+            return None
+        return dev, ino, offset, tail, load_freq(data, _HEADER.size)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _save_state(
+    state_path: Path,
+    flags: int,
+    st: os.stat_result,
+    offset: int,
+    tail: bytes,
+    freq: Dict[str, int],
+) -> None:
+    header = _HEADER.pack(MAGIC, VERSION, flags, st.st_dev, st.st_ino, offset, tail)
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_path.with_name(f"{state_path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(header + dump_freq(freq))
+        os.replace(tmp, state_path)
+    except OSError:
+        pass
+
+
+def count_freq_incremental(
+    path: str | Path,
+    state_path: str | Path,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+) -> Dict[str, int]:
+    """
+    Частоты слов растущего (дописываемого) файла. В state_path храним
+    смещение последнего обработанного пробела, хэш байт перед ним и частоты
+    до него; при следующем вызове читаем только дописанное. Если файл
+    подменили (другой inode), обрезали или переписали начало — считаем заново.
+    Результат совпадает с полным пересчётом.
+    """
+    state_path = Path(state_path)
+    flags = flags_of(casefold, yo2e)
+    key = dict(casefold=casefold, yo2e=yo2e)
+
+    if not splittable(encoding):
+        with open(path, encoding=encoding) as f:
+            return count_freq_stream(iter(lambda: f.read(READ_SIZE), ""), **key)
+
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+
+        offset = 0
+        committed: Dict[str, int] = {}
+        state = _load_state(state_path, flags)
+        if state is not None:
+            dev, ino, s_offset, tail, freq = state
+            if (
+                (dev, ino) == (st.st_dev, st.st_ino)
+                and s_offset <= size
+                and _tail_digest(f, s_offset) == tail
+            ):
+                offset, committed = s_offset, freq
+
+        # до последнего пробела — фиксируем в состоянии, хвост считаем каждый раз
+        safe = _last_safe_offset(f, offset, size)
+        tail = _tail_digest(f, safe)
+
+    delta = count_freq_stream(iter_range_chunks(path, offset, safe, encoding), **key)
+    committed = merge_counts([committed, delta])
+    if safe != offset or state is None:
+        _save_state(state_path, flags, st, safe, tail, committed)
+
+    pending = count_freq_stream(iter_range_chunks(path, safe, size, encoding), **key)
+    return merge_counts([committed, pending])
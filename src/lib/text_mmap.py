@@ -0,0 +1,104 @@
+# src/lib/text_mmap.py
+from __future__ import annotations
+
+import codecs
+import mmap
+import re
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from src.lib.text import normalized_tokens
+from src.lib.text_parallel import splitRe
+
+WINDOW = 4 << 20  # байт отображения за один findall
+
+# аналог wordRe для UTF-8 байт: "буква" — ASCII \w или любой байт >= 0x80.
+# Всё, что не попало в совпадение (ASCII-пунктуация, пробелы, управляющие),
+# словом быть не может, поэтому совпадения декодируем и добиваем wordRe.
+fragmentRe = re.compile(rb"[\w\x80-\xff]+(?:-[\w\x80-\xff]+)*")
+
+
+def _check_encoding(encoding: str) -> None:
+    if codecs.lookup(encoding).name not in ("utf-8", "utf-8-sig"):
+        raise ValueError(f"mmap-режим поддерживает только UTF-8, а не {encoding}")
+
+
+@contextmanager
+def _mapped(path: str | Path) -> Iterator[mmap.mmap | None]:
+    "отображение файла только для чтения (None для пустого файла)"
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+
+def _windows(mm: mmap.mmap, window: int) -> Iterator[Tuple[int, int]]:
+    "окна [pos, end); каждое заканчивается сразу после пробела, фрагменты не режутся"
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        m = splitRe.search(mm, min(pos + window, size))
+        end = m.end() if m else size
+        yield pos, end
+        pos = end
+
+
+def iter_tokens_mmap(
+    path: str | Path,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+    window: int = WINDOW,
+) -> Iterator[str]:
+    """
+    Токены файла (как tokenize(normalize(read_text(path)))) без чтения его
+    в str: файл отображается в память, регулярка по байтам находит кандидатов
+    в слова, декодируются и приводятся к нижнему регистру только они.
+    """
+    _check_encoding(encoding)
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        for pos, end in _windows(mm, window):
+            fragments = fragmentRe.findall(mm, pos, end)
+            if fragments:
+                # "\n" — разделитель, так что токены склейки = токены фрагментов
+                text = b"\n".join(fragments).decode("utf-8")
+                yield from normalized_tokens(text, casefold=casefold, yo2e=yo2e)
+
+
+def count_freq_mmap(
+    path: str | Path,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+    window: int = WINDOW,
+) -> Dict[str, int]:
+    """
+    Частоты слов файла через mmap; результат как у обычного пайплайна.
+    Сначала считаем сырые байтовые фрагменты, а декодируем и приводим
+    к нижнему регистру каждый различный фрагмент один раз.
+    """
+    _check_encoding(encoding)
+    fragments: Counter = Counter()
+    with _mapped(path) as mm:
+        if mm is None:
+            return {}
+        for pos, end in _windows(mm, window):
+            fragments.update(fragmentRe.findall(mm, pos, end))
+
+    # фрагменты идут в порядке первого появления, значит и слова тоже
+    freq: Counter = Counter()
+    for fragment, count in fragments.items():
+        text = fragment.decode("utf-8")
+        for word in normalized_tokens(text, casefold=casefold, yo2e=yo2e):
+            freq[word] += count
+    return dict(freq)
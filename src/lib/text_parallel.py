@@ -0,0 +1,124 @@
+# src/lib/text_parallel.py
+from __future__ import annotations
+
+import codecs
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from src.lib.io_txt_csv import read_text_chunks
+from src.lib.text import count_freq_stream, merge_counts
+
+READ_SIZE = 1 << 20  # байт за одно чтение внутри диапазона
+MIN_PART_SIZE = 1 << 20  # мельче не режем: запуск процесса дороже подсчёта
+
+splitRe = re.compile(rb"[ \t\n\r\x0b\x0c]")  # ASCII-пробелы, по ним режем файл
+
+
+def splittable(encoding: str) -> bool:
+    """
+    Можно ли резать файл по байтам ASCII-пробелов: пробел кодируется одним
+    байтом и не встречается внутри многобайтных символов (utf-8, cp1251, koi8-r).
+    utf-16/utf-32 и кодировки с BOM сюда не подходят.
+    """
+    try:
+        return " \t\n\r".encode(encoding) == b" \t\n\r"
+    except (LookupError, UnicodeError):
+        return False
+
+
+def next_safe_offset(f: BinaryIO, pos: int, size: int) -> int:
+    "первая позиция >= pos сразу после байта-пробела (size, если таких нет)"
+    f.seek(pos)
+    while pos < size:
+        block = f.read(READ_SIZE)
+        if not block:
+            break
+        m = splitRe.search(block)
+        if m:
+            return pos + m.end()
+        pos += len(block)
+    return size
+
+
+def split_offsets(path: str | Path, parts: int) -> List[Tuple[int, int]]:
+    "делим файл на parts диапазонов байт [start, end), границы — после пробелов"
+    size = os.path.getsize(path)
+    if parts <= 1 or size == 0:
+        return [(0, size)]
+
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            pos = max(size * i // parts, bounds[-1])
+            cut = next_safe_offset(f, pos, size)
+            if cut >= size:
+                break
+            if cut > bounds[-1]:
+                bounds.append(cut)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_range_chunks(
+    path: str | Path,
+    start: int,
+    end: int,
+    encoding: str = "utf-8",
+    read_size: int = READ_SIZE,
+) -> Iterator[str]:
+    "декодируем диапазон байт файла кусками (символ на стыке кусков не теряется)"
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(path, "rb") as f:
+        f.seek(start)
+        left = end - start
+        while left > 0:
+            data = f.read(min(read_size, left))
+            if not data:
+                break
+            left -= len(data)
+            yield decoder.decode(data)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _count_range(task: Tuple[str, int, int, str, bool, bool]) -> Dict[str, int]:
+    "работа одного процесса: normalize + tokenize + count на своём диапазоне"
+    path, start, end, encoding, casefold, yo2e = task
+    chunks = iter_range_chunks(path, start, end, encoding)
+    return count_freq_stream(chunks, casefold=casefold, yo2e=yo2e)
+
+
+def count_freq_parallel(
+    path: str | Path,
+    jobs: int,
+    *,
+    encoding: str = "utf-8",
+    casefold: bool = True,
+    yo2e: bool = True,
+    min_part_size: int = MIN_PART_SIZE,
+) -> Dict[str, int]:
+    """
+    Частоты слов файла в jobs процессах. Результат (вместе с порядком слов)
+    совпадает с последовательным count_freq(tokenize(normalize(...))).
+    Маленькие файлы и неподходящие кодировки считаются в одном процессе.
+    """
+    size = os.path.getsize(path)
+    parts = min(jobs, size // max(min_part_size, 1))
+    if parts <= 1 or not splittable(encoding):
+        chunks = read_text_chunks(path, encoding=encoding)
+        return count_freq_stream(chunks, casefold=casefold, yo2e=yo2e)
+
+    # пул процессов тянет multiprocessing (~20 мс импорта) — только когда нужен
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [
+        (str(path), start, end, encoding, casefold, yo2e)
+        for start, end in split_offsets(path, parts)
+    ]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        partials = list(pool.map(_count_range, tasks))
+
+    return merge_counts(partials)
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import pytest
+
+# общая таблица для тестов Group и её хранилищ (CSV, WAL, SQLite)
+ROWS = [
+    ("Иванов Иван", "2003-10-10", "БИВТ-21-1", "4.3"),
+    ("Петрова Анна", "2004-01-02", "БИВТ-21-2", "4.8"),
+    ("Сидоров Пётр", "2002-05-06", "БИВТ-21-1", "3.9"),
+]
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> Path:
+    """CSV-файл группы со строками ROWS."""
+    path = tmp_path / "students.csv"
+    lines = ["fio,birthdate,group,gpa"] + [",".join(r) for r in ROWS]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
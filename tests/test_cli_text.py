@@ -0,0 +1,51 @@
+from collections.abc import Callable
+
+import pytest
+
+from src.lab04 import text_report
+from src.lab06 import cli_convert
+from src.lab06.cli_text import build_parser, main
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "abc"])
+def test_chunk_size_must_be_positive(
+    value: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Плохой --chunk-size — ошибка использования (код 2), а не трассировка."""
+    with pytest.raises(SystemExit) as exc:
+        build_parser().parse_args(["stats", "--input", "x.txt", "--chunk-size", value])
+    assert exc.value.code == 2
+    assert "--chunk-size" in capsys.readouterr().err
+    args = build_parser().parse_args(["stats", "--input", "x.txt", "--chunk-size", "7"])
+    assert args.chunk_size == 7
+
+
+@pytest.mark.parametrize(
+    "argv", [["--top", "0"], ["--approx", "--capacity", "0"], ["--top", "-1"]]
+)
+def test_top_and_capacity_must_be_positive(
+    argv: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc:
+        build_parser().parse_args(["stats", "--input", "x.txt", *argv])
+    assert exc.value.code == 2
+    assert argv[-2] in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("value", ["0", "-3"])
+@pytest.mark.parametrize(
+    "run",
+    [
+        lambda jobs: main(["stats", "--input", "x.txt", "--jobs", jobs]),
+        lambda jobs: text_report.main(["--in", "x.txt", "--jobs", jobs]),
+        lambda jobs: cli_convert.main(
+            ["batch", "csv2json", "--in", "x", "--out-dir", "y", "--jobs", jobs]
+        ),
+    ],
+    ids=["cli_text", "text_report", "cli_convert"],
+)
+def test_jobs_must_be_positive(run: Callable[[str], object], value: str) -> None:
+    """--jobs 0 раньше молча считал в один процесс"""
+    with pytest.raises(SystemExit) as exc:
+        run(value)
+    assert exc.value.code == 2
@@ -0,0 +1,168 @@
+import csv
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from src.lab06.cli_convert import main
+from src.lib import columnar
+from src.lib.json_csv import csv_to_json, json_to_csv
+
+ROWS = [
+    ["id", "name", "score", "flag", "code", "note"],
+    ["1", "Аня", "1.5", "True", "007", ""],
+    ["2", "Bob", "", "False", "12", "x, y"],
+    ["-3", "Аня", "1e-05", "", "3", 'кавычки "внутри"'],
+]
+
+
+@pytest.fixture
+def people_csv(tmp_path: Path) -> Path:
+    src = tmp_path / "people.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(ROWS)
+    return src
+
+
+def test_build_infers_types_and_reads_back(people_csv: Path, tmp_path: Path) -> None:
+    col = columnar.build(people_csv, tmp_path / "people.col")
+
+    with columnar.ColumnarTable(col) as table:
+        assert table.n_rows == 3
+        assert table.columns == ROWS[0]
+        # "007" и пустые значения не теряются: code остаётся строкой
+        assert table.types == ["int64", "str", "float64", "bool", "str", "str"]
+        assert table.column("id").tolist() == [1, 2, -3]
+        assert table.dictionary("name") == ["Аня", "Bob"]
+        assert table.column("name") == ["Аня", "Bob", "Аня"]
+        assert table.valid("id") is None
+        assert table.valid("score").tolist() == [0b101]
+        assert [list(r) for r in table.iter_rows()] == ROWS[1:]
+
+
+def test_converters_read_columnar_source(people_csv: Path, tmp_path: Path) -> None:
+    col = columnar.build(people_csv, tmp_path / "people.col")
+
+    csv_to_json(str(people_csv), str(tmp_path / "a.json"))
+    csv_to_json(str(col), str(tmp_path / "b.json"))
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+    records = [{"a": 1, "b": {"n": [1]}}, {"a": None, "c": "z"}, {"b": 2.5, "d": True}]
+    src = tmp_path / "records.json"
+    src.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    json_col = columnar.build(src, tmp_path / "records.col")
+
+    json_to_csv(str(src), str(tmp_path / "a.csv"))
+    json_to_csv(str(json_col), str(tmp_path / "b.csv"))
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+
+def test_cached_rebuilds_only_when_source_changes(
+    people_csv: Path, tmp_path: Path
+) -> None:
+    cache_dir = tmp_path / "cache"
+    entry = columnar.cached(people_csv, cache_dir)
+    built = entry.stat().st_mtime_ns
+
+    # то же содержимое, другой mtime — совпадает хэш, пересборки нет
+    st = people_csv.stat()
+    os.utime(people_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert columnar.cached(people_csv, cache_dir) == entry
+    assert entry.stat().st_mtime_ns == built
+
+    # другие настройки диалекта — отдельная запись
+    assert columnar.cached(people_csv, cache_dir, delimiter=",") != entry
+
+    people_csv.write_text("id,name\n1,x\n", encoding="utf-8")
+    assert not columnar.is_fresh(entry, people_csv)
+    with columnar.ColumnarTable(columnar.cached(people_csv, cache_dir)) as table:
+        assert table.columns == ["id", "name"]
+
+
+def test_close_releases_views_and_blank_rows_are_kept(tmp_path: Path) -> None:
+    src = tmp_path / "blank.csv"
+    src.write_text("a,b\n1,x\n\n,\n2,y\n3\n", encoding="utf-8")
+    dialect = {"delimiter": ",", "header_check": False}
+    col = columnar.build(src, tmp_path / "blank.col", **dialect)
+
+    with columnar.ColumnarTable(col) as table:
+        ids = table.column("a")
+        assert [list(r) for r in table.iter_rows()] == [
+            ["1", "x"],
+            ["", ""],
+            ["", ""],
+            ["2", "y"],
+            ["3", ""],
+        ]
+    with pytest.raises(ValueError):
+        ids[0]  # закрытая таблица: view освобождён
+
+    with columnar.ColumnarTable(col) as table:
+        kept = table.column("a")[1:]  # свой срез: mmap закроется вместе с ним
+    assert kept.tolist() == [0, 0, 2, 3]
+
+    # csv_to_json по кэшу пропускает пустые строки так же, как по CSV
+    csv_to_json(str(src), str(tmp_path / "a.json"), **dialect)
+    csv_to_json(str(col), str(tmp_path / "b.json"))
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+
+def test_cached_evicts_least_recently_used(people_csv: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    first = columnar.cached(people_csv, cache_dir)
+    size = first.stat().st_size
+    st = first.stat()
+    os.utime(first, ns=(st.st_atime_ns - 10**9, st.st_mtime_ns))
+
+    second = columnar.cached(people_csv, cache_dir, delimiter=",", max_bytes=size)
+    assert second.exists() and not first.exists()
+
+
+def test_read_rejects_foreign_file(tmp_path: Path) -> None:
+    bad = tmp_path / "bad.col"
+    bad.write_bytes(b"not a columnar file at all")
+    with pytest.raises(ValueError):
+        columnar.ColumnarTable(bad)
+
+
+def test_cli_cache_build_info_and_cached_convert(
+    people_csv: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    col = tmp_path / "people.col"
+    assert main(["cache", "build", "--in", str(people_csv), "--out", str(col)]) == 0
+    assert main(["cache", "info", "--in", str(col)]) == 0
+    out = capsys.readouterr().out
+    assert "Строк: 3, колонок: 6" in out
+    assert "id: int64" in out
+
+    dst = tmp_path / "out.json"
+    argv = ["csv2json", "--in", str(people_csv), "--out", str(dst)]
+    assert main(argv + ["--cache", "--cache-dir", str(tmp_path / "c")]) == 0
+    assert len(list((tmp_path / "c").glob("*.col"))) == 1
+    assert json.loads(dst.read_text(encoding="utf-8"))[2]["code"] == "3"
+
+
+@pytest.mark.parametrize("text", ["a,,c\n1,2,3\n", "a,b,c\n", "a,a\n1,2\n"])
+@pytest.mark.parametrize("command", ["csv2xlsx", "csv2json"])
+def test_cache_does_not_change_the_outcome(
+    text: str, command: str, tmp_path: Path
+) -> None:
+    """пустое имя колонки, один заголовок, повтор имени: с кэшем — как без"""
+    openpyxl = pytest.importorskip("openpyxl")
+    src = tmp_path / "in.csv"
+    src.write_text(text, encoding="utf-8")
+    suffix = "." + command[len("csv2") :]
+    outcomes = []
+    for extra in ([], ["--cache", "--cache-dir", str(tmp_path / "c")]):
+        dst = tmp_path / f"out{len(outcomes)}{suffix}"
+        try:
+            code = main([command, "--in", str(src), "--out", str(dst), *extra])
+        except SystemExit as e:  # ошибка конвертации — сообщение в e.code
+            code = e.code
+        if code or suffix == ".json":
+            outcomes.append((code, dst.exists() and dst.read_text(encoding="utf-8")))
+        else:
+            ws = openpyxl.load_workbook(dst).active
+            outcomes.append((code, list(ws.iter_rows(values_only=True))))
+    assert outcomes[0] == outcomes[1]
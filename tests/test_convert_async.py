@@ -0,0 +1,122 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.lib.convert_async import AsyncConverter
+
+PEOPLE = [{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25, "city": "Москва"}]
+
+
+@pytest.fixture
+def people_json(tmp_path: Path) -> Path:
+    src = tmp_path / "people.json"
+    src.write_text(json.dumps(PEOPLE, ensure_ascii=False), encoding="utf-8")
+    return src
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize("inline_bytes", [1 << 20, 0])  # поток / процесс
+def test_convert_writes_result_and_reports_progress(
+    people_json: Path, tmp_path: Path, inline_bytes: int
+) -> None:
+    stages = []
+    dst = tmp_path / "out" / "people.csv"
+
+    async def main():
+        async with AsyncConverter(jobs=1, inline_bytes=inline_bytes) as conv:
+            return await conv.convert(
+                people_json, dst, "json2csv", progress=lambda s, p: stages.append(s)
+            )
+
+    result = _run(main())
+    assert result.dst == dst and result.error is None
+    assert dst.read_text(encoding="utf-8").splitlines()[0] == "name,age,city"
+    assert stages == ["queued", "running", "done"]
+    assert list(dst.parent.iterdir()) == [dst]  # временных файлов не осталось
+
+
+def test_convert_error_is_raised_and_dst_untouched(tmp_path: Path) -> None:
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"name": "Alice"}', encoding="utf-8")
+    dst = tmp_path / "bad.csv"
+    stages = []
+
+    async def main():
+        async with AsyncConverter(jobs=1) as conv:
+            await conv.convert(
+                bad, dst, "json2csv", progress=lambda s, p: stages.append(s)
+            )
+
+    with pytest.raises(ValueError):
+        _run(main())
+    assert stages[-1] == "failed"
+    assert list(tmp_path.iterdir()) == [bad]
+
+
+def test_concurrency_is_bounded(people_json: Path, tmp_path: Path) -> None:
+    running = peak = 0
+
+    def progress(stage: str, src: Path) -> None:
+        nonlocal running, peak
+        if stage == "running":
+            running += 1
+            peak = max(peak, running)
+        elif stage in ("done", "failed", "cancelled"):
+            running -= 1
+
+    async def main():
+        async with AsyncConverter(jobs=1, max_concurrency=2) as conv:
+            await asyncio.gather(
+                *(
+                    conv.convert(
+                        people_json,
+                        tmp_path / f"{n}.csv",
+                        "json2csv",
+                        progress=progress,
+                    )
+                    for n in range(20)
+                )
+            )
+
+    _run(main())
+    assert peak <= 2
+    assert len(list(tmp_path.glob("*.csv"))) == 20
+
+
+def test_cancel_while_queued(people_json: Path, tmp_path: Path) -> None:
+    stages = []
+    dst = tmp_path / "people.csv"
+
+    async def main():
+        async with AsyncConverter(jobs=1, max_concurrency=1) as conv:
+            async with conv._limit():  # единственное место занято
+                task = asyncio.create_task(
+                    conv.convert(
+                        people_json,
+                        dst,
+                        "json2csv",
+                        progress=lambda s, p: stages.append(s),
+                    )
+                )
+                await asyncio.sleep(0.01)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+    _run(main())
+    assert stages == ["queued", "cancelled"]
+    assert not dst.exists()
+
+
+def test_unknown_kind(people_json: Path, tmp_path: Path) -> None:
+    async def main():
+        async with AsyncConverter(jobs=1) as conv:
+            await conv.convert(people_json, tmp_path / "x.csv", "csv2pdf")
+
+    with pytest.raises(ValueError):
+        _run(main())
@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.lab06.cli_convert import main
+from src.lib.convert_batch import convert_batch
+from src.lib.text_corpus import iter_input_files
+
+PEOPLE = [{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25, "city": "Москва"}]
+
+
+@pytest.fixture
+def json_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    for name in ("a.json", "sub/b.json"):
+        (root / name).write_text(json.dumps(PEOPLE, ensure_ascii=False), "utf-8")
+    (root / "bad.json").write_text('{"name": "Alice"}', encoding="utf-8")
+    (root / "notes.txt").write_text("не JSON", encoding="utf-8")
+    return root
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_batch_keeps_going_after_errors(
+    json_dir: Path, tmp_path: Path, jobs: int
+) -> None:
+    out = tmp_path / "out"
+    files = iter_input_files([json_dir], "*.json")
+    results = list(convert_batch(files, out, "json2csv", jobs=jobs))
+
+    errors = {r.src.name for r in results if r.error is not None}
+    done = {r.dst.relative_to(out).as_posix() for r in results if r.error is None}
+    assert errors == {"bad.json"}
+    assert done == {"a.csv", "sub/b.csv"}
+    header = (out / "sub" / "b.csv").read_text(encoding="utf-8").splitlines()[0]
+    assert header == "name,age,city"
+
+
+def test_cli_batch_summary_and_exit_code(
+    json_dir: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    csv_dir = tmp_path / "csv"
+    code = main(["batch", "json2csv", "--in", str(json_dir), "--out-dir", str(csv_dir)])
+    captured = capsys.readouterr()
+    assert code == 1
+    assert "Успешно: 2, с ошибками: 1" in captured.out
+    assert "bad.json" in captured.err
+
+    json_out = tmp_path / "json"
+    code = main(
+        [
+            "batch",
+            "csv2json",
+            "--in",
+            str(csv_dir / "**" / "*.csv"),
+            "--out-dir",
+            str(json_out),
+            "--jobs",
+            "1",
+            "--compact",
+        ]
+    )
+    assert code == 0
+    assert "Успешно: 2, с ошибками: 0" in capsys.readouterr().out
+    text = (json_out / "sub" / "b.json").read_text(encoding="utf-8")
+    assert json.loads(text)[1] == {"name": "Bob", "age": "25", "city": "Москва"}
+    assert "\n" not in text
+
+
+def test_glob_keeps_subdirs_and_rejects_clashes(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    root = tmp_path / "in"
+    for sub in ("a", "b"):
+        (root / sub).mkdir(parents=True)
+        (root / sub / "p.json").write_text(json.dumps(PEOPLE), encoding="utf-8")
+
+    out = tmp_path / "out"
+    pattern = str(root / "**" / "*.json")
+    assert main(["batch", "json2csv", "--in", pattern, "--out-dir", str(out)]) == 0
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*.csv")) == [
+        "a/p.csv",
+        "b/p.csv",
+    ]
+
+    # два отдельных пути с одним именем: второй в тот же out/p.csv не пишем
+    files = [(root / sub / "p.json", root / sub) for sub in ("a", "b")]
+    results = list(convert_batch(files, tmp_path / "flat", "json2csv"))
+    assert [r.error is None for r in results] == [True, False]
+    assert "a/p.json" in Path(results[1].error or "").as_posix()
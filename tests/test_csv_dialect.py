@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src.lib.csv_dialect import (
+    DialectCache,
+    DialectError,
+    detect,
+    detect_file,
+    parse_char,
+)
+from src.lib.json_csv import csv_to_json
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+def test_detect_delimiter_and_header(delimiter: str) -> None:
+    sample = delimiter.join(["name", "age", "city"]) + "\n"
+    sample += delimiter.join(["Alice", "30", "Moscow"]) + "\n"
+    sample += delimiter.join(["Bob", "25", "SPB"]) + "\n"
+
+    detected = detect(sample)
+    assert detected.dialect.delimiter == delimiter
+    assert detected.has_header
+
+
+def test_detect_failure_is_an_error() -> None:
+    with pytest.raises(DialectError, match="--delimiter"):
+        detect("name\nAlice\nBob\n")
+
+
+def test_detect_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("Sniffer не должен вызываться")
+
+    monkeypatch.setattr(csv.Sniffer, "sniff", fail)
+    detected = detect("name\nAlice\n", delimiter=";", quotechar="'", header_check=False)
+    assert detected.dialect.delimiter == ";"
+    assert detected.dialect.quotechar == "'"
+    assert detected.has_header
+
+
+def test_parse_char() -> None:
+    assert parse_char("\\t") == parse_char("tab") == "\t"
+    assert parse_char(None) is None
+    with pytest.raises(DialectError):
+        parse_char(";;")
+
+
+def test_detect_file_cache_per_directory_and_header(tmp_path: Path) -> None:
+    cache = DialectCache()
+    text = "name;age\nAlice;30\nBob;25\n"
+    first = detect_file(io.StringIO(text), tmp_path / "a.csv", cache=cache)
+    again = detect_file(io.StringIO(text), tmp_path / "b.csv", cache=cache)
+    assert again is first
+    assert len(cache) == 1
+
+    detect_file(io.StringIO(text), tmp_path / "sub" / "c.csv", cache=cache)
+    detect_file(io.StringIO("id;x\n1;2\n"), tmp_path / "d.csv", cache=cache)
+    assert len(cache) == 3
+
+
+def test_detect_file_empty(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Пустой CSV"):
+        detect_file(io.StringIO(" \n"), tmp_path / "e.csv")
+
+
+def test_csv_to_json_with_explicit_dialect(tmp_path: Path) -> None:
+    src = tmp_path / "names.csv"
+    src.write_text("name\nAlice\nBob\n", encoding="utf-8")
+    dst = tmp_path / "names.json"
+
+    with pytest.raises(DialectError):
+        csv_to_json(str(src), str(dst))
+
+    csv_to_json(str(src), str(dst), delimiter=",", header_check=False)
+    assert json.loads(dst.read_text(encoding="utf-8")) == [
+        {"name": "Alice"},
+        {"name": "Bob"},
+    ]
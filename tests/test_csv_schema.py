@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.lib.csv_schema import Column, Schema, infer_schema, widen
+from src.lib.json_csv import csv_to_json, json_to_csv
+
+CSV = (
+    "id,name,score,ok,born,code,empty\n"
+    "1,Аня,1.5,True,2001-02-03,007,\n"
+    "2,Bob,,false,2000-12-31,12,\n"
+    "-3,Иван,2,,,3,\n"
+)
+
+
+@pytest.mark.parametrize(
+    "kind, value, expected",
+    [
+        ("null", "12", "int"),
+        ("null", "true", "bool"),
+        ("int", "1.5", "float"),
+        ("int", "007", "str"),
+        ("float", "1e-05", "float"),
+        ("float", "nan", "str"),
+        ("bool", "1", "str"),
+        ("null", "2024-02-29", "date"),
+        ("date", "2023-02-29", "str"),
+    ],
+)
+def test_widen(kind: str, value: str, expected: str) -> None:
+    assert widen(kind, value) == expected
+
+
+def test_infer_from_sample_then_widen() -> None:
+    rows = [{"a": "1", "b": ""}, {"a": "2", "b": ""}, {"a": "x", "b": "True"}]
+    sample = infer_schema(rows, sample_rows=2)
+    assert sample.columns == (Column("a", "int"), Column("b", "null", True))
+
+    full = sample.widened(rows)
+    assert full.columns == (Column("a", "str"), Column("b", "bool", True))
+    assert Schema.from_dict(json.loads(json.dumps(full.to_dict()))) == full
+
+
+def test_csv_to_json_typed(tmp_path: Path) -> None:
+    src = tmp_path / "people.csv"
+    src.write_text(CSV, encoding="utf-8")
+    dst = tmp_path / "people.json"
+
+    schema = csv_to_json(str(src), str(dst), types=True, indent=None)
+    assert [c.type for c in schema.columns] == [
+        "int",
+        "str",
+        "float",
+        "bool",
+        "date",
+        "str",
+        "null",
+    ]
+    data = json.loads(dst.read_text(encoding="utf-8"))
+    assert data[0] == {
+        "id": 1,
+        "name": "Аня",
+        "score": 1.5,
+        "ok": True,
+        "born": "2001-02-03",
+        "code": "007",
+        "empty": None,
+    }
+    assert data[2]["score"] == 2 and isinstance(data[2]["score"], int)
+    assert data[1]["score"] is None and data[2]["ok"] is None
+
+    # без типов — как раньше, всё строками
+    assert csv_to_json(str(src), str(dst)) is None
+    assert json.loads(dst.read_text(encoding="utf-8"))[0]["id"] == "1"
+
+
+def test_saved_schema_is_reused_and_enforced(tmp_path: Path) -> None:
+    src = tmp_path / "a.csv"
+    src.write_text(CSV, encoding="utf-8")
+    saved = tmp_path / "schema.json"
+    csv_to_json(str(src), str(tmp_path / "a.json"), types=True).dump(saved)
+
+    other = tmp_path / "b.csv"
+    other.write_text(CSV.replace("-3,", "4,"), encoding="utf-8")
+    csv_to_json(str(other), str(tmp_path / "b.json"), types=Schema.load(saved))
+    assert json.loads((tmp_path / "b.json").read_text(encoding="utf-8"))[2]["id"] == 4
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text(CSV.replace("-3,", "три,"), encoding="utf-8")
+    with pytest.raises(ValueError, match="три"):
+        csv_to_json(str(bad), str(tmp_path / "c.json"), types=Schema.load(saved))
+    assert not (tmp_path / "c.json").exists()
+
+
+def test_typed_round_trip_through_json_to_csv(tmp_path: Path) -> None:
+    src = tmp_path / "a.csv"
+    src.write_text("id,score,ok\n1,1.5,True\n2,,False\n", encoding="utf-8")
+    csv_to_json(str(src), str(tmp_path / "a.json"), types=True)
+    json_to_csv(str(tmp_path / "a.json"), str(tmp_path / "b.csv"))
+    assert (tmp_path / "b.csv").read_text(encoding="utf-8").splitlines() == [
+        "id,score,ok",
+        "1,1.5,True",
+        "2,,False",
+    ]
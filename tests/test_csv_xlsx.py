@@ -0,0 +1,78 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from src.lib.csv_xlsx import csv_to_xlsx
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _write_csv(path: Path, rows: list[list[str]]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def _sheets(path: Path) -> list[tuple[str, list[tuple], dict[str, float]]]:
+    wb = openpyxl.load_workbook(path)
+    return [
+        (
+            ws.title,
+            list(ws.iter_rows(values_only=True)),
+            {k: v.width for k, v in ws.column_dimensions.items()},
+        )
+        for ws in wb.worksheets
+    ]
+
+
+@pytest.fixture
+def people(tmp_path: Path) -> Path:
+    rows = [["name", "age", "city"]]
+    rows += [[f"user{i}", str(20 + i), "Москва"] for i in range(9)]
+    rows.append(["Очень-очень длинное имя пользователя", "99"])  # короткая строка
+    rows.append(["Eve", "30", "SPB", "лишнее"])  # длинная строка
+    src = tmp_path / "people.csv"
+    _write_csv(src, rows)
+    return src
+
+
+def test_csv_to_xlsx_rows_and_widths(people: Path, tmp_path: Path) -> None:
+    dst = tmp_path / "people.xlsx"
+    csv_to_xlsx(str(people), str(dst), widths="scan")
+
+    [(title, rows, widths)] = _sheets(dst)
+    assert title == "Sheet1"
+    assert rows[0] == ("name", "age", "city")
+    assert rows[-2][0] == "Очень-очень длинное имя пользователя"
+    assert rows[-1] == ("Eve", "30", "SPB")
+    assert len(rows) == 12
+    assert widths == {"A": 36, "B": 8, "C": 8}
+
+
+def test_csv_to_xlsx_sample_widths(people: Path, tmp_path: Path) -> None:
+    dst = tmp_path / "people.xlsx"
+    csv_to_xlsx(str(people), str(dst), sample_rows=5)
+
+    [(_, rows, widths)] = _sheets(dst)
+    assert len(rows) == 12
+    assert widths["A"] == 8  # длинное имя за пределами выборки
+
+
+def test_csv_to_xlsx_rolls_over_sheets(people: Path, tmp_path: Path) -> None:
+    dst = tmp_path / "people.xlsx"
+    csv_to_xlsx(str(people), str(dst), max_rows=4)
+
+    sheets = _sheets(dst)
+    assert [title for title, _, _ in sheets] == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+    assert all(rows[0] == ("name", "age", "city") for _, rows, _ in sheets)
+    data = [row for _, rows, _ in sheets for row in rows[1:]]
+    assert [row[0] for row in data[:2]] == ["user0", "user1"]
+    assert len(data) == 11
+
+
+def test_csv_to_xlsx_empty_raises(tmp_path: Path) -> None:
+    src = tmp_path / "empty.csv"
+    src.write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        csv_to_xlsx(str(src), str(tmp_path / "empty.xlsx"))
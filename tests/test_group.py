@@ -0,0 +1,251 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.lab08.models import Student
+from src.lab09.group import ConcurrentModificationError, Group, StorageFormatError
+from tests.conftest import ROWS
+
+
+def test_crud_roundtrip(storage: Path) -> None:
+    group = Group(storage)
+    assert [s.fio for s in group.list()] == [r[0] for r in ROWS]
+
+    group.add(Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7))
+    assert [s.fio for s in group.find("тимо")] == ["Беляев Тимофей"]
+    assert [s.fio for s in group.by_group("БИВТ-21-2")] == [
+        "Петрова Анна",
+        "Беляев Тимофей",
+    ]
+
+    assert group.update("Иванов Иван", gpa=5) == 1
+    assert group.get("Иванов Иван")[0].gpa == 5.0
+    assert group.remove("Сидоров Пётр") == 1
+    assert group.remove("Сидоров Пётр") == 0
+    assert [s.fio for s in Group(storage).list()] == [
+        "Иванов Иван",
+        "Петрова Анна",
+        "Беляев Тимофей",
+    ]
+
+    stats = group.stats()
+    assert stats["count"] == 3
+    assert stats["groups"] == {"БИВТ-21-1": 1, "БИВТ-21-2": 2}
+    stats["groups"].clear()  # копия: кэш статистики не портится
+    assert group.stats()["groups"] == {"БИВТ-21-1": 1, "БИВТ-21-2": 2}
+
+
+def test_table_is_reused_until_file_changes(
+    storage: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    group = Group(storage)
+    reads = []
+    original = Group._read_all_rows
+    monkeypatch.setattr(
+        Group, "_read_all_rows", lambda self: reads.append(1) or original(self)
+    )
+
+    group.list()
+    group.find("иван")
+    group.get("Петрова Анна")
+    group.add(Student("Новый Студент", "2001-01-01", "БИВТ-21-3", 4.0))
+    group.remove("Новый Студент")
+    assert len(reads) == 1
+
+    # файл поменяли снаружи — перечитываем
+    with storage.open("a", encoding="utf-8") as f:
+        f.write("Внешний Студент,2000-02-02,БИВТ-21-3,3.0\n")
+    st = storage.stat()
+    os.utime(storage, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert group.get("Внешний Студент")[0].group == "БИВТ-21-3"
+    assert len(reads) == 2
+
+
+def test_failed_update_keeps_table_and_file(storage: Path) -> None:
+    group = Group(storage)
+    before = storage.read_bytes()
+    with pytest.raises(ValueError):
+        group.update("Иванов Иван", gpa=7)
+    assert storage.read_bytes() == before
+    assert group.get("Иванов Иван")[0].gpa == 4.3
+
+
+def test_header_is_checked(tmp_path: Path) -> None:
+    bad = tmp_path / "bad.csv"
+    bad.write_text("name,gpa\nX,1\n", encoding="utf-8")
+    with pytest.raises(StorageFormatError):
+        Group(bad)
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("\n\n", encoding="utf-8")
+    assert Group(empty).list() == []
+    assert empty.read_text(encoding="utf-8").strip() == "fio,birthdate,group,gpa"
+
+
+def _student(n: int, group: str = "БИВТ-21-3") -> Student:
+    return Student(f"Студент {n}", "2001-01-01", group, 4.0)
+
+
+def test_add_many_appends_once_and_validates_first(storage: Path) -> None:
+    group = Group(storage)
+    assert group.add_many(_student(n) for n in range(100)) == 100
+    assert len(Group(storage).by_group("БИВТ-21-3")) == 100
+
+    before = storage.read_bytes()
+    bad = Student("Плохой", "2001-01-01", "G", 4.0)
+    bad.gpa = 9  # Student проверяет gpa только в конструкторе
+    with pytest.raises(ValueError):
+        group.add_many([_student(100), bad])
+    assert storage.read_bytes() == before
+    assert group.get("Студент 100") == []
+
+
+def test_update_many_and_remove_many(storage: Path) -> None:
+    group = Group(storage)
+    assert group.update_many(lambda s: s.group == "БИВТ-21-1", group="БИВТ-22-1") == 2
+    assert group.update_many({"Петрова Анна": {"gpa": 5}, "Нет Такого": {}}) == 1
+    with pytest.raises(ValueError):
+        group.update_many({"Петрова Анна": {"email": "x"}})
+
+    reread = Group(storage)
+    assert len(reread.by_group("БИВТ-22-1")) == 2
+    assert reread.get("Петрова Анна")[0].gpa == 5.0
+
+    assert group.remove_many(["Иванов Иван", "Сидоров Пётр", "Нет Такого"]) == 2
+    assert [s.fio for s in Group(storage).list()] == ["Петрова Анна"]
+
+
+def test_batch_commits_once(storage: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    group = Group(storage)
+    writes = []
+    original = Group._write_all_rows
+    monkeypatch.setattr(
+        Group,
+        "_write_all_rows",
+        lambda self, rows: writes.append(1) or original(self, rows),
+    )
+
+    with group.batch():
+        for n in range(50):
+            group.add(_student(n))
+        group.update("Студент 7", gpa=3.5)
+        group.remove("Иванов Иван")
+        # внутри batch видны свои изменения, файл ещё прежний
+        assert group.get("Студент 7")[0].gpa == 3.5
+        assert Group(storage).get("Студент 7") == []
+
+    assert writes == [1]
+    reread = Group(storage)
+    assert len(reread.list()) == 52
+    assert reread.get("Иванов Иван") == []
+
+
+def test_batch_rolls_back_on_error(storage: Path) -> None:
+    group = Group(storage)
+    before = storage.read_bytes()
+    with pytest.raises(ValueError):
+        with group.batch():
+            group.add(_student(1))
+            group.remove("Иванов Иван")
+            group.update("Петрова Анна", gpa=42)  # вне 0..5
+    assert storage.read_bytes() == before
+    assert [s.fio for s in group.list()] == [r[0] for r in ROWS]
+
+
+def test_batch_detects_external_change(storage: Path) -> None:
+    group = Group(storage)
+    with pytest.raises(ConcurrentModificationError):
+        with group.batch():
+            group.remove("Иванов Иван")
+            with storage.open("a", encoding="utf-8") as f:
+                f.write("Внешний Студент,2000-02-02,БИВТ-21-3,3.0\n")
+    assert len(group.get("Внешний Студент")) == 1
+    assert len(group.get("Иванов Иван")) == 1
+
+
+def test_nested_batch_rolls_back_only_itself(storage: Path) -> None:
+    """как точка сохранения в SqliteGroup (см. test_sqlite_group.py)"""
+    group = Group(storage)
+    with group.batch():
+        group.remove("Иванов Иван")
+        with pytest.raises(ValueError):
+            with group.batch():
+                group.add(_student(1))
+                group.update("Сидоров Пётр", group="БИВТ-21-2")
+                group.update("Петрова Анна", gpa=42)
+        # вложенный блок откатился целиком, внешний продолжается
+        assert [s.fio for s in group.by_group("БИВТ-21-2")] == ["Петрова Анна"]
+        assert group.get("Студент 1") == []
+        group.update("Сидоров Пётр", gpa=4)
+    reread = Group(storage)
+    assert [(s.fio, s.group, s.gpa) for s in reread.list()] == [
+        ("Петрова Анна", "БИВТ-21-2", 4.8),
+        ("Сидоров Пётр", "БИВТ-21-1", 4.0),
+    ]
+
+
+def test_update_many_merges_keys_of_one_record(storage: Path) -> None:
+    group = Group(storage)
+    # "Петрова Анна" и "Петрова Анна " — одна запись: правки сливаются
+    changes = {"Петрова Анна": {"gpa": 5}, "Петрова Анна ": {"group": "Х-1"}}
+    assert group.update_many(changes) == 1
+    student = Group(storage).get("Петрова Анна")[0]
+    assert (student.group, student.gpa) == ("Х-1", 5.0)
+
+
+def test_find_index_prefix_limit_and_laziness(storage: Path) -> None:
+    group = Group(storage)
+    assert [s.fio for s in group.find("иван")] == ["Иванов Иван"]
+    assert [s.fio for s in group.find("ов", limit=1)] == ["Иванов Иван"]
+    assert [s.fio for s in group.find("п", prefix=True)] == ["Петрова Анна"]
+    assert group.find("ван", prefix=True) == []
+    assert group.find("ов", limit=0) == []
+
+    # индекс уже построен и должен следить за изменениями
+    group.add(_student(1))
+    group.update_many({"Иванов Иван": {"fio": "Смирнов Иван"}})
+    group.remove("Петрова Анна")
+    assert [s.fio for s in group.find("иван")] == ["Смирнов Иван"]
+    assert group.find("иванов") == []
+    assert [s.fio for s in group.find("студ", prefix=True)] == ["Студент 1"]
+    assert group.find("анна") == []
+    group.update_many(
+        {"Смирнов Иван": {"fio": "Иванов Иван"}}
+    )  # позиция снова в той же триграмме
+    assert [s.fio for s in group.find("ванов")] == ["Иванов Иван"]
+
+    found = group.iter_find("о")
+    assert next(found).fio == "Иванов Иван"
+    assert [s.fio for s in found] == ["Сидоров Пётр"]
+
+
+def test_find_matches_full_scan(storage: Path) -> None:
+    group = Group(storage)
+    group.add_many(_student(n) for n in range(300))
+    group.remove_many(f"Студент {n}" for n in range(0, 300, 7))
+    group.update_many(lambda s: s.fio.endswith("5"), fio="Студентка 5")
+    names = [s.fio.casefold() for s in group.list()]
+    for needle in ("студент 1", "нт 2", "ка 5", "1", "ов", "студентка"):
+        expected = [n for n in names if needle in n]
+        assert [s.fio.casefold() for s in group.find(needle)] == expected
+        expected = [n for n in names if n.startswith(needle)]
+        assert [s.fio.casefold() for s in group.find(needle, prefix=True)] == expected
+
+
+def test_batch_rollback_keeps_find_index(storage: Path) -> None:
+    group = Group(storage)
+    group.find("иван")
+    index = group._grams
+    with pytest.raises(ValueError):
+        with group.batch():
+            group.add_many(_student(n) for n in range(5))
+            group.update_many({"Иванов Иван": {"fio": "Смирнов Иван"}})
+            group.remove("Петрова Анна")
+            group.update("Сидоров Пётр", gpa=42)
+    assert group._grams is index  # поправлен на месте, не выброшен
+    assert [s.fio for s in group.find("иван")] == ["Иванов Иван"]
+    assert [s.fio for s in group.find("анна")] == ["Петрова Анна"]
+    assert group.find("студ") == [] and group.find("смирн") == []
+    group.add(_student(9))  # занимает позицию отменённого добавления
+    assert [s.fio for s in group.find("студ")] == ["Студент 9"]
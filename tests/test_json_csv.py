@@ -1,12 +1,14 @@
 
 
 import csv
+import io
 import json
 from pathlib import Path
 
 import pytest
 
 from src.lab05.json_csv import json_to_csv, csv_to_json
+from src.lib import json_csv as lib_json_csv
 
 
 def _read_csv(path: Path) -> list[dict[str, str]]:
@@ -168,3 +170,110 @@ def test_json_csv_roundtrip(tmp_path: Path) -> None:
         ]
 
     assert _normalize_values(original) == result
+
+
+# --- потоковая версия из src.lib ---
+
+LATE_KEYS = [
+    {"name": "Alice", "age": 30},
+    {"name": "Bob", "city": "Москва", "tags": ["a", 1]},
+    {"zip": None, "age": 25},
+]
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64])
+def test_iter_json_array_small_buffers(read_size: int) -> None:
+    text = json.dumps(LATE_KEYS + [{"n": 1234567890, "s": "a,\n]"}], indent=2)
+    items = list(lib_json_csv._iter_json_array(io.StringIO(text), read_size))
+    assert items == LATE_KEYS + [{"n": 1234567890, "s": "a,\n]"}]
+
+
+@pytest.mark.parametrize("schema", ["spill", "two-pass"])
+def test_json_to_csv_stream_matches_original(tmp_path: Path, schema: str) -> None:
+    src = tmp_path / "people.json"
+    src.write_text(json.dumps(LATE_KEYS, ensure_ascii=False), encoding="utf-8")
+
+    json_to_csv(str(src), str(tmp_path / "old.csv"))
+    lib_json_csv.json_to_csv(str(src), str(tmp_path / "new.csv"), schema=schema)
+
+    assert (tmp_path / "new.csv").read_bytes() == (tmp_path / "old.csv").read_bytes()
+    header = (tmp_path / "new.csv").read_text(encoding="utf-8").splitlines()[0]
+    assert header == "name,age,city,tags,zip"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "new.csv",
+        "old.csv",
+        "people.json",
+    ]
+
+
+@pytest.mark.parametrize("suffix", [".ndjson", ".jsonl"])
+def test_json_to_csv_ndjson(tmp_path: Path, suffix: str) -> None:
+    src = tmp_path / f"people{suffix}"
+    lines = [json.dumps(item, ensure_ascii=False) for item in LATE_KEYS]
+    src.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    dst = tmp_path / "people.csv"
+
+    lib_json_csv.json_to_csv(str(src), str(dst))
+
+    rows = _read_csv(dst)
+    assert [r["name"] for r in rows] == ["Alice", "Bob", ""]
+    assert rows[1]["tags"] == '["a", 1]'
+
+
+@pytest.mark.parametrize(
+    "text", ["", "[]", "[{}", '[{"a": 1},]', "[{}] x", "[{}, 2]", '{"a": 1}']
+)
+def test_json_to_csv_stream_bad_input(tmp_path: Path, text: str) -> None:
+    src = tmp_path / "bad.json"
+    src.write_text(text, encoding="utf-8")
+    dst = tmp_path / "bad.csv"
+
+    with pytest.raises(ValueError):
+        lib_json_csv.json_to_csv(str(src), str(dst))
+    assert list(tmp_path.iterdir()) == [src]  # ни результата, ни временных файлов
+
+
+def _write_people_csv(path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "age", "город"])
+        writer.writerow(["Alice", "30", "Москва"])
+        writer.writerow([])
+        writer.writerow(["Bob", "25", 'с "кавычками", и запятой'])
+
+
+def test_csv_to_json_stream_matches_original(tmp_path: Path) -> None:
+    src = tmp_path / "people.csv"
+    _write_people_csv(src)
+
+    csv_to_json(str(src), str(tmp_path / "old.json"))
+    lib_json_csv.csv_to_json(str(src), str(tmp_path / "new.json"))
+
+    assert (tmp_path / "new.json").read_bytes() == (tmp_path / "old.json").read_bytes()
+
+
+def test_csv_to_json_compact_and_ndjson(tmp_path: Path) -> None:
+    src = tmp_path / "people.csv"
+    _write_people_csv(src)
+    csv_to_json(str(src), str(tmp_path / "old.json"))
+    expected = _read_json(tmp_path / "old.json")
+
+    compact = tmp_path / "compact.json"
+    lib_json_csv.csv_to_json(str(src), str(compact), indent=None)
+    assert "\n" not in compact.read_text(encoding="utf-8")
+    assert _read_json(compact) == expected
+
+    ndjson = tmp_path / "people.ndjson"
+    lib_json_csv.csv_to_json(str(src), str(ndjson))
+    lines = ndjson.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == expected
+
+
+@pytest.mark.parametrize("text", ["", "\n\n", "name,age\n,\n"])
+def test_csv_to_json_stream_empty_raises(tmp_path: Path, text: str) -> None:
+    src = tmp_path / "empty.csv"
+    src.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Пустой CSV"):
+        lib_json_csv.csv_to_json(str(src), str(tmp_path / "empty.json"))
+    assert list(tmp_path.iterdir()) == [src]
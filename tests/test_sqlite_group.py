@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+from src.lab08.models import Student
+from src.lab09.group import Group, StorageFormatError
+from src.lab09.sqlite_group import SqliteGroup
+from tests.conftest import ROWS
+
+
+@pytest.fixture
+def group(tmp_path: Path, storage: Path):
+    with SqliteGroup(tmp_path / "students.db") as group:
+        assert group.import_csv(storage) == len(ROWS)
+        yield group
+
+
+def _fios(students: list[Student]) -> list[str]:
+    return [s.fio for s in students]
+
+
+def test_same_answers_as_csv_group(group: SqliteGroup, storage: Path) -> None:
+    csv_group = Group(storage)
+    new = Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7)
+    for g in (csv_group, group):
+        g.add(new)
+        g.update("Иванов Иван", gpa=5)
+        g.remove("Сидоров Пётр")
+
+    assert group.list() == csv_group.list()
+    assert group.get("Иванов Иван") == csv_group.get("Иванов Иван")
+    assert group.by_group("БИВТ-21-2") == csv_group.by_group("БИВТ-21-2")
+    for needle in ("тимо", "ИВАН", "ан", "нет такого", "п", "Беляев"):
+        assert group.find(needle) == csv_group.find(needle)
+        for limit in (None, 1):
+            assert group.find(needle, prefix=True, limit=limit) == csv_group.find(
+                needle, prefix=True, limit=limit
+            )
+    assert _fios(group.iter_find("ан", limit=1)) == ["Иванов Иван"]
+    stats, expected = group.stats(), csv_group.stats()
+    assert stats.pop("avg_gpa") == pytest.approx(expected.pop("avg_gpa"))
+    assert stats == expected
+
+
+def test_find_after_updates_and_quotes(group: SqliteGroup) -> None:
+    group.update_many({"Петрова Анна": {"fio": 'Петрова "Аня"'}})
+    assert _fios(group.find('"аня"')) == ['Петрова "Аня"']
+    assert group.find("анна") == []
+    assert _fios(group.find("ов")) == ["Иванов Иван", 'Петрова "Аня"', "Сидоров Пётр"]
+
+
+def test_batch_is_one_transaction(group: SqliteGroup) -> None:
+    with pytest.raises(ValueError):
+        with group.batch():
+            group.remove("Иванов Иван")
+            group.update("Петрова Анна", gpa="abc")
+    assert _fios(group.list()) == [r[0] for r in ROWS]
+
+    with group.batch():
+        group.remove("Иванов Иван")
+        with pytest.raises(ValueError):
+            group.update_many(lambda s: True, gpa=7)  # откатится только оно
+        group.update_many({"Сидоров Пётр": {"group": "БИВТ-21-2"}})
+    assert _fios(group.by_group("БИВТ-21-2")) == ["Петрова Анна", "Сидоров Пётр"]
+    assert [s.gpa for s in group.list()] == [4.8, 3.9]
+
+
+def test_nested_batch_and_duplicate_keys(group: SqliteGroup) -> None:
+    """то же поведение, что у Group (см. test_group.py)"""
+    # "Петрова Анна" и "Петрова Анна " — одна запись: правки сливаются
+    changes = {"Петрова Анна": {"gpa": 5}, "Петрова Анна ": {"group": "Х-1"}}
+    assert group.update_many(changes) == 1
+    with group.batch():
+        group.remove("Иванов Иван")
+        with pytest.raises(ValueError):
+            with group.batch():
+                group.update("Сидоров Пётр", group="БИВТ-21-2")
+                group.update("Петрова Анна", gpa=42)
+        # вложенный блок откатился целиком, внешний продолжается
+        assert _fios(group.by_group("БИВТ-21-2")) == []
+        group.update("Сидоров Пётр", gpa=4)
+    assert [(s.fio, s.group, s.gpa) for s in group.list()] == [
+        ("Петрова Анна", "Х-1", 5.0),
+        ("Сидоров Пётр", "БИВТ-21-1", 4.0),
+    ]
+
+
+def test_export_roundtrip_and_format_errors(
+    group: SqliteGroup, storage: Path, tmp_path: Path
+) -> None:
+    out = tmp_path / "out.csv"
+    assert group.export_csv(out) == len(ROWS)
+    assert out.read_text(encoding="utf-8") == storage.read_text(encoding="utf-8")
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("fio,birthdate,group,gpa\nА,2003-01-01,Г,4,лишнее\n", "utf-8")
+    with pytest.raises(StorageFormatError):
+        group.import_csv(bad)
+    assert len(group.list()) == len(ROWS)  # импорт целиком откатился
+
+    (tmp_path / "not.db").write_text("fio,birthdate,group,gpa\n", encoding="utf-8")
+    with pytest.raises(StorageFormatError):
+        SqliteGroup(tmp_path / "not.db")
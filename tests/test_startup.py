@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET = json.loads((ROOT / "benchmarks" / "startup_budget.json").read_text("utf-8"))
+
+
+@pytest.mark.parametrize("name", sorted(BUDGET["commands"]))
+def test_cli_does_not_load_forbidden_modules(name: str, tmp_path: Path) -> None:
+    """Подкоманда не тянет тяжёлые модули, которые ей не нужны."""
+    spec = BUDGET["commands"][name]
+    argv = [arg.replace("{tmp}", str(tmp_path)) for arg in spec["argv"]]
+    assert argv[0] == "-m"
+    code = (
+        "import runpy, sys\n"
+        f"sys.argv = {argv[1:]!r}\n"
+        "try:\n"
+        f"    runpy.run_module({argv[1]!r}, run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.__stderr__.write(' '.join(sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    loaded = set(proc.stderr.split())
+    assert "src.lib.text" in loaded or "src.lib.json_csv" in loaded
+    assert loaded.isdisjoint(spec["forbid"])
@@ -1,6 +1,16 @@
+import io
+
 import pytest
 
-from src.lib.text import normalize, tokenize, count_freq, top_n
+from src.lib.text import (
+    SpaceSaving,
+    count_freq,
+    count_freq_stream,
+    iter_tokens,
+    normalize,
+    tokenize,
+    top_n,
+)
 
 
 @pytest.mark.parametrize(
@@ -71,4 +81,123 @@ def test_top_n_tie_breaker() -> None:
 
     # если n больше числа уникальных слов то возвращаем все
     top_all = top_n(freq, n=10)
-    assert top_all == [("aa", 2), ("bb", 2), ("cc", 1)]
\ No newline at end of file
+    assert top_all == [("aa", 2), ("bb", 2), ("cc", 1)]
+
+
+STREAM_TEXT = (
+    "Ёжик\tпо-настоящему  круто-круто!\r\nHello,\x00world\u200bмир "
+    "2025 год; emoji 😀 не слово\nпо-\nнастоящему   ЁЛКА-палка ёлка"
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 10_000])
+def test_count_freq_stream_matches_pipeline(chunk_size: int) -> None:
+    """потоковый подсчёт совпадает с count_freq(tokenize(normalize(...)))"""
+    chunks = [
+        STREAM_TEXT[i : i + chunk_size] for i in range(0, len(STREAM_TEXT), chunk_size)
+    ]
+    expected = count_freq(tokenize(normalize(STREAM_TEXT)))
+    assert count_freq_stream(chunks) == expected
+    assert count_freq_stream(chunks, yo2e=False, casefold=False) == count_freq(
+        tokenize(normalize(STREAM_TEXT, yo2e=False, casefold=False))
+    )
+
+
+def test_iter_tokens_sources() -> None:
+    """строка, файл и список строк дают те же токены, что tokenize(normalize(...))"""
+    expected = tokenize(normalize(STREAM_TEXT))
+    lines = STREAM_TEXT.splitlines(keepends=True)
+
+    assert list(iter_tokens(STREAM_TEXT)) == expected
+    assert list(iter_tokens(io.StringIO(STREAM_TEXT))) == expected
+    assert list(iter_tokens(lines)) == expected
+    assert count_freq(iter_tokens(lines)) == count_freq(expected)
+    assert list(iter_tokens(STREAM_TEXT, casefold=False, yo2e=False)) == tokenize(
+        normalize(STREAM_TEXT, casefold=False, yo2e=False)
+    )
+
+
+def test_iter_tokens_joins_chunks_as_is() -> None:
+    """куски склеиваются без разделителя: строки без \\n — одним словом"""
+    assert list(iter_tokens(["hel", "lo wor", "ld"])) == ["hello", "world"]
+    assert list(iter_tokens(["hello", "world"])) == ["helloworld"]
+    lines = "hello\nworld".splitlines()
+    assert list(iter_tokens(line + "\n" for line in lines)) == ["hello", "world"]
+
+
+def test_count_freq_stream_empty() -> None:
+    assert count_freq_stream([]) == {}
+    assert count_freq_stream(["", "   "]) == {}
+
+
+def test_top_n_heap_matches_full_sort() -> None:
+    """top_n на куче даёт то же, что полная сортировка (и тот же порядок при равенстве)"""
+    freq = {f"w{i % 37}{chr(1072 + i % 5)}": (i * 7919) % 13 for i in range(500)}
+    full = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
+    for n in (0, 1, 5, 50, len(freq), len(freq) + 10):
+        assert top_n(freq, n=n) == full[:n]
+
+
+def test_space_saving_exact_when_fits() -> None:
+    tokens = ["bb", "aa", "bb", "aa", "cc"]
+    summary = SpaceSaving(capacity=10)
+    summary.update(tokens)
+    assert summary.exact
+    assert summary.total == 5
+    assert summary.top(2) == top_n(count_freq(tokens), n=2)
+
+
+def test_space_saving_bounded_and_finds_heavy_hitters() -> None:
+    tokens = []
+    for i in range(2000):
+        tokens.append("частое")
+        tokens.append(f"редкое{i}")
+        if i % 3 == 0:
+            tokens.append("среднее")
+
+    summary = SpaceSaving(capacity=50)
+    summary.update(tokens)
+
+    assert not summary.exact
+    assert len(summary.counts) <= 50
+    top2 = [w for w, _ in summary.top(2)]
+    assert top2 == ["частое", "среднее"]
+    # оценка не меньше истинной и завышена не больше чем на error
+    true = count_freq(tokens)
+    for word, est in summary.counts.items():
+        assert true[word] <= est <= true[word] + summary.errors.get(word, 0)
+
+
+def _reference_normalize(text: str, casefold: bool = True, yo2e: bool = True) -> str:
+    """исходный посимвольный normalize — эталон для быстрой версии"""
+    import re
+    import unicodedata
+
+    if yo2e:
+        text = text.replace("ё", "е").replace("Ё", "Е")
+    text = "".join(
+        " " if unicodedata.category(ch) in {"Cc", "Cf"} else ch for ch in text
+    )
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.casefold() if casefold else text
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "ПрИвЕт\nМИр\t",
+        "ёжик, Ёлка",
+        "plain ascii\x00with\x1fcontrols\x7fand\tTabs  ",
+        "zero\u200bwidth\u00adsoft\ufeffbom\u2060joiner",
+        "NEL\x85and\x9fC1 \u2028line\u3000sep",
+        "Straße İstanbul ΣΑΣ ǅ",
+        "\U000e0041tag\U0001d173music",
+        "".join(chr(c) for c in range(0, 0x250)),
+    ],
+)
+@pytest.mark.parametrize("casefold", [True, False])
+@pytest.mark.parametrize("yo2e", [True, False])
+def test_normalize_matches_reference(source: str, casefold: bool, yo2e: bool) -> None:
+    """быстрый normalize совпадает с посимвольным побайтно"""
+    expected = _reference_normalize(source, casefold=casefold, yo2e=yo2e)
+    assert normalize(source, casefold=casefold, yo2e=yo2e) == expected
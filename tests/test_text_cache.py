@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.lib.text_cache import FreqCache, count_freq_cached, dump_freq, load_freq
+
+
+def test_dump_load_roundtrip_keeps_order() -> None:
+    freq = {"привет": 3, "мир": 1, "по-настоящему": 2**40, "a_b": 7}
+    restored = load_freq(dump_freq(freq))
+    assert restored == freq
+    assert list(restored) == list(freq)
+    assert load_freq(dump_freq({})) == {}
+
+
+def test_cache_hit_miss_and_touch(tmp_path: Path) -> None:
+    src = tmp_path / "text.txt"
+    src.write_text("привет мир привет", encoding="utf-8")
+    cache = FreqCache(tmp_path / "cache")
+
+    calls = []
+
+    def compute() -> dict[str, int]:
+        calls.append(1)
+        return {"привет": 2, "мир": 1}
+
+    assert count_freq_cached(src, compute, cache) == {"привет": 2, "мир": 1}
+    assert count_freq_cached(src, compute, cache) == {"привет": 2, "мир": 1}
+    assert len(calls) == 1
+
+    # другой mtime — промах: по умолчанию верим размеру и mtime
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(src) is None
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    # с content_hash: тот же текст, другой mtime — совпадает хэш, пересчёта нет
+    cache = FreqCache(tmp_path / "cache", content_hash=True)
+    cache.put(src, {"привет": 2, "мир": 1})
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(src) == {"привет": 2, "мир": 1}
+
+    # другие флаги normalize — другая запись
+    assert cache.get(src, casefold=False) is None
+
+    # содержимое поменялось при том же размере — промах
+    src.write_text("привет мир ПРИВЕТ", encoding="utf-8")
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert cache.get(src) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache = FreqCache(cache_dir)
+    files = []
+    for i in range(3):
+        src = tmp_path / f"f{i}.txt"
+        src.write_text(f"слово{i}", encoding="utf-8")
+        files.append(src)
+
+    # две записи; первой пользовались давно, второй — недавно
+    for i, src in enumerate(files[:2], start=1):
+        before = set(cache_dir.glob("*.freq"))
+        cache.put(src, {"x" * 200: i})
+        (entry,) = set(cache_dir.glob("*.freq")) - before
+        os.utime(entry, ns=(i, i))
+
+    entry_size = entry.stat().st_size
+    cache.max_bytes = entry_size * 2
+    cache.put(files[2], {"x" * 200: 3})
+
+    assert len(list(cache_dir.glob("*.freq"))) == 2
+    assert cache.get(files[0]) is None
+    assert cache.get(files[1]) == {"x" * 200: 2}
+    assert cache.get(files[2]) == {"x" * 200: 3}
+
+
+def test_put_scans_cache_dir_only_now_and_then(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = FreqCache(tmp_path / "cache", max_bytes=1 << 20)
+    scans = []
+    original = FreqCache._evict
+    monkeypatch.setattr(
+        FreqCache, "_evict", lambda self: scans.append(1) or original(self)
+    )
+    for i in range(200):
+        src = tmp_path / f"f{i}.txt"
+        src.write_text(f"слово{i}", encoding="utf-8")
+        cache.put(src, {f"слово{i}": 1})
+    assert len(list((tmp_path / "cache").glob("*.freq"))) == 200
+    assert len(scans) < 10
+
+
+def test_put_does_not_reread_the_file_by_default(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src = tmp_path / "text.txt"
+    src.write_text("привет мир", encoding="utf-8")
+
+    def no_digest(path: object) -> bytes:
+        raise AssertionError("файл прочитан второй раз")
+
+    monkeypatch.setattr("src.lib.text_cache.file_digest", no_digest)
+    cache = FreqCache(tmp_path / "cache")
+    assert count_freq_cached(src, lambda: {"мир": 1}, cache) == {"мир": 1}
+    assert cache.get(src) == {"мир": 1}
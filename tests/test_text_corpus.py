@@ -0,0 +1,83 @@
+import csv
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.lib.text_corpus import count_corpus, glob_root, iter_input_files
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    root = tmp_path / "corpus"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("Привет мир", encoding="utf-8")
+    (root / "sub" / "b.txt").write_text("привет ёжик\nмир", encoding="utf-8")
+    (root / "skip.log").write_text("не берём", encoding="utf-8")
+    return root
+
+
+def test_iter_input_files_dirs_globs_and_paths(corpus: Path) -> None:
+    found = {p.relative_to(corpus).as_posix() for p, _ in iter_input_files([corpus])}
+    assert found == {"a.txt", "sub/b.txt"}
+
+    found = [p.name for p, _ in iter_input_files([str(corpus / "*.log")])]
+    assert found == ["skip.log"]
+
+    missing = corpus / "missing.txt"
+    assert [p for p, _ in iter_input_files([missing])] == [missing]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_count_corpus_aggregate_and_per_file(
+    corpus: Path, tmp_path: Path, jobs: int
+) -> None:
+    per_file = tmp_path / "per"
+    files = iter_input_files([corpus, corpus / "missing.txt"])
+    results = list(count_corpus(files, jobs=jobs, per_file_dir=per_file))
+
+    errors = [r for r in results if r.error is not None]
+    assert [r.path.name for r in errors] == ["missing.txt"]
+
+    total: Counter = Counter()
+    for r in results:
+        if r.error is None:
+            total.update(r.freq)
+            assert r.size > 0 and r.seconds >= 0
+    assert total == {"привет": 2, "мир": 2, "ежик": 1}
+
+    with (per_file / "sub" / "b.txt.csv").open(encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [
+            ["word", "count"],
+            ["ежик", "1"],
+            ["мир", "1"],
+            ["привет", "1"],
+        ]
+
+
+def test_glob_root_keeps_subdirs_and_clashes_are_rejected(tmp_path: Path) -> None:
+    assert glob_root("corp/**/*.txt") == Path("corp")
+    assert glob_root("*.txt") == Path(".")
+
+    corp = tmp_path / "corp"
+    for sub in ("a", "b"):
+        (corp / sub).mkdir(parents=True)
+        (corp / sub / "x.txt").write_text(f"слово {sub}", encoding="utf-8")
+
+    per_file = tmp_path / "per"
+    files = iter_input_files([str(corp / "**" / "*.txt")])
+    results = list(count_corpus(files, per_file_dir=per_file))
+    assert all(r.error is None for r in results)
+    assert sorted(p.relative_to(per_file).as_posix() for p in per_file.rglob("*")) == [
+        "a",
+        "a/x.txt.csv",
+        "b",
+        "b/x.txt.csv",
+    ]
+
+    # обычные пути: корень — свой каталог, оба хотят per/x.txt.csv
+    files = iter_input_files([corp / "a" / "x.txt", corp / "b" / "x.txt"])
+    results = list(count_corpus(files, per_file_dir=tmp_path / "flat"))
+    assert [r.error is None for r in results] == [True, False]
+    lines = (tmp_path / "flat" / "x.txt.csv").read_text(encoding="utf-8").split()
+    assert "a,1" in lines and "b,1" not in lines  # первый файл не перезаписан
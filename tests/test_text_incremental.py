@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from src.lib.text import count_freq, normalize, tokenize
+from src.lib.text_incremental import count_freq_incremental
+
+
+def _full(path: Path) -> dict[str, int]:
+    return count_freq(tokenize(normalize(path.read_text(encoding="utf-8"))))
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_incremental_matches_full_on_appends(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    state = tmp_path / "state" / "app.state"
+    log.write_text("Ёжик пришёл\nпо-настоящему ", encoding="utf-8")
+
+    for piece in ["круто\nпри", "вет-мир ", "ЁЛКА\n", "", "по-", "настоящему"]:
+        _append(log, piece)
+        got = count_freq_incremental(log, state)
+        assert got == _full(log)
+        assert list(got) == list(_full(log))
+    assert state.exists()
+
+
+def test_incremental_rebuilds_after_truncate_and_rewrite(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    state = tmp_path / "app.state"
+    log.write_text("один два три\n" * 50, encoding="utf-8")
+    assert count_freq_incremental(log, state) == _full(log)
+
+    # обрезали (logrotate copytruncate)
+    log.write_text("четыре\n", encoding="utf-8")
+    assert count_freq_incremental(log, state) == {"четыре": 1}
+
+    # переписали начало, размер стал больше прежнего offset
+    log.write_text("пять шесть семь\n" * 60, encoding="utf-8")
+    assert count_freq_incremental(log, state) == _full(log)
+
+
+def test_incremental_rebuilds_after_rotation(tmp_path: Path) -> None:
+    log = tmp_path / "app.log"
+    state = tmp_path / "app.state"
+    log.write_text("старый файл\n", encoding="utf-8")
+    count_freq_incremental(log, state)
+
+    log.rename(tmp_path / "app.log.1")
+    log.write_text("старый файл\nновый\n", encoding="utf-8")
+    assert count_freq_incremental(log, state) == _full(log)
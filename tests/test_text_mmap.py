@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from src.lib.text import count_freq, normalize, tokenize
+from src.lib.text_mmap import count_freq_mmap, iter_tokens_mmap
+
+TEXT = (
+    "Ёжик по-настоящему круто-круто!\r\nHello,\x00world​мир a-😀 --x-- "
+    "«ёлка»—палка 2025 год; emoji 😀 не\x85слово\nпо-\nнастоящему ΣΑΣ Straße\n"
+)
+
+
+@pytest.mark.parametrize("window", [1, 7, 1 << 20])
+def test_iter_tokens_mmap_matches_pipeline(tmp_path: Path, window: int) -> None:
+    src = tmp_path / "text.txt"
+    src.write_bytes((TEXT * 10).encode("utf-8"))
+
+    expected = tokenize(normalize(src.read_text(encoding="utf-8")))
+    assert list(iter_tokens_mmap(src, window=window)) == expected
+    freq = count_freq_mmap(src, window=window)
+    assert freq == count_freq(expected)
+    assert list(freq) == list(count_freq(expected))
+
+
+def test_iter_tokens_mmap_empty_file(tmp_path: Path) -> None:
+    src = tmp_path / "empty.txt"
+    src.write_bytes(b"")
+    assert list(iter_tokens_mmap(src)) == []
+    assert count_freq_mmap(src) == {}
+
+
+def test_iter_tokens_mmap_rejects_non_utf8(tmp_path: Path) -> None:
+    src = tmp_path / "text.txt"
+    src.write_bytes("привет".encode("cp1251"))
+    with pytest.raises(ValueError):
+        list(iter_tokens_mmap(src, encoding="cp1251"))
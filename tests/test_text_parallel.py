@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from src.lib.text import count_freq, merge_counts, normalize, tokenize
+from src.lib.text_parallel import count_freq_parallel, split_offsets, splittable
+
+TEXT = (
+    "Ёжик по-настоящему круто-круто!\r\nHello,\x00world\u200bмир "
+    "2025 год; emoji 😀 не слово\nпо-\nнастоящему   ЁЛКА-палка ёлка\n"
+) * 20
+
+
+def test_merge_counts_keeps_order() -> None:
+    """слияние частей даёт те же частоты и порядок, что и один проход"""
+    parts = [{"b": 1, "a": 2}, {"a": 1, "c": 1}, {"d": 3}, {"b": 1}, {"e": 1}]
+    merged = merge_counts(parts)
+    assert merged == {"b": 2, "a": 3, "c": 1, "d": 3, "e": 1}
+    assert list(merged) == ["b", "a", "c", "d", "e"]
+    assert merge_counts([]) == {}
+
+
+def test_split_offsets_cut_after_whitespace(tmp_path: Path) -> None:
+    src = tmp_path / "text.txt"
+    data = TEXT.encode("utf-8")
+    src.write_bytes(data)
+
+    ranges = split_offsets(src, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1 : end] in (b" ", b"\t", b"\n", b"\r")
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1251"])
+def test_count_freq_parallel_matches_serial(tmp_path: Path, encoding: str) -> None:
+    text = TEXT.replace("😀", "").replace("\u200b", " ")  # нет в cp1251
+    src = tmp_path / "text.txt"
+    src.write_bytes(text.encode(encoding))
+
+    expected = count_freq(tokenize(normalize(src.read_text(encoding=encoding))))
+    got = count_freq_parallel(src, 3, encoding=encoding, min_part_size=1)
+    assert got == expected
+    assert list(got) == list(expected)
+
+
+def test_splittable() -> None:
+    assert splittable("utf-8")
+    assert splittable("cp1251")
+    assert not splittable("utf-16")
+    assert not splittable("no-such-codec")
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+
+from src.lab08.models import Student
+from src.lab09.group import Group, StorageFormatError
+from src.lab09.wal import WalGroup
+from tests.conftest import ROWS
+
+
+def _fios(group: Group) -> list[str]:
+    return [s.fio for s in group.list()]
+
+
+def test_changes_go_to_log_and_replay(storage: Path) -> None:
+    csv_text = storage.read_text(encoding="utf-8")
+    group = WalGroup(storage)
+    group.add(Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7))
+    group.update("Иванов Иван", gpa=5)
+    group.remove("Сидоров Пётр")
+
+    assert storage.read_text(encoding="utf-8") == csv_text  # CSV не переписан
+    reopened = WalGroup(storage)
+    assert _fios(reopened) == ["Иванов Иван", "Петрова Анна", "Беляев Тимофей"]
+    assert reopened.get("Иванов Иван")[0].gpa == 5.0
+    assert reopened.stats()["count"] == 3
+
+
+def test_compact_writes_csv_and_clears_log(storage: Path) -> None:
+    group = WalGroup(storage, compact_after=3)
+    group.remove("Сидоров Пётр")
+    group.update("Петрова Анна", group="БИВТ-21-1")
+    assert len(group.log_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    group.add(Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7))
+    assert len(group.log_path.read_text(encoding="utf-8").splitlines()) == 1
+    assert _fios(Group(storage)) == ["Иванов Иван", "Петрова Анна", "Беляев Тимофей"]
+    assert [s.fio for s in WalGroup(storage).by_group("БИВТ-21-1")] == [
+        "Иванов Иван",
+        "Петрова Анна",
+    ]
+
+
+def test_torn_tail_is_dropped_whole(storage: Path) -> None:
+    group = WalGroup(storage)
+    group.remove("Иванов Иван")
+    with group.batch():
+        group.remove("Петрова Анна")
+        group.remove("Сидоров Пётр")
+    log = group.log_path.read_bytes()
+    group.log_path.write_bytes(log[:-5])  # сбой посреди записи batch
+
+    reopened = WalGroup(storage)
+    assert _fios(reopened) == ["Петрова Анна", "Сидоров Пётр"]
+    assert group.log_path.read_bytes() == log[:-5]  # чтение файл не правит
+    reopened.add(Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7))
+    assert _fios(WalGroup(storage)) == [
+        "Петрова Анна",
+        "Сидоров Пётр",
+        "Беляев Тимофей",
+    ]
+
+
+def test_batch_rollback_leaves_log_untouched(storage: Path) -> None:
+    group = WalGroup(storage)
+    group.list()  # журнал с заголовком появляется при первом чтении
+    log = group.log_path.read_bytes()
+    with pytest.raises(ValueError):
+        with group.batch():
+            group.remove("Иванов Иван")
+            group.update("Петрова Анна", gpa="abc")
+    assert group.log_path.read_bytes() == log
+    assert _fios(group) == [r[0] for r in ROWS]
+
+
+def test_interrupted_compact_and_foreign_csv(storage: Path) -> None:
+    group = WalGroup(storage)
+    group.remove("Иванов Иван")
+    # сбой после подмены CSV, до очистки журнала: журнал уже в CSV
+    group._reset_log = lambda digest: None  # type: ignore[method-assign]
+    group.compact()
+    reopened = WalGroup(storage)
+    assert _fios(reopened) == ["Петрова Анна", "Сидоров Пётр"]
+    assert len(reopened.log_path.read_text(encoding="utf-8").splitlines()) == 1
+
+    reopened.remove("Петрова Анна")
+    with storage.open("a", encoding="utf-8") as f:
+        f.write("Беляев Тимофей,2003-09-09,БИВТ-21-2,4.7\n")
+    with pytest.raises(StorageFormatError):
+        WalGroup(storage).list()
+
+
+def test_corrupt_line_in_the_middle_is_an_error(storage: Path) -> None:
+    group = WalGroup(storage)
+    group.remove("Иванов Иван")
+    group.remove("Петрова Анна")
+    lines = group.log_path.read_bytes().splitlines(keepends=True)
+    lines[1] = b'[["del", 0\n'
+    group.log_path.write_bytes(b"".join(lines))
+    with pytest.raises(StorageFormatError):
+        WalGroup(storage).list()
+
+
+def test_first_batch_on_fresh_store(
+    storage: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loads = []
+    original = WalGroup._load_rows
+    monkeypatch.setattr(
+        WalGroup, "_load_rows", lambda self: loads.append(1) or original(self)
+    )
+    group = WalGroup(storage)
+    with group.batch():  # журнала ещё нет: он создаётся при первом чтении
+        group.add(Student("Беляев Тимофей", "2003-09-09", "БИВТ-21-2", 4.7))
+    group.list()
+    assert loads == [1]
+    assert _fios(WalGroup(storage))[-1] == "Беляев Тимофей"
+
+    # то же после сбоя посреди compact: журнал пересоздаётся при чтении
+    group.remove("Иванов Иван")
+    monkeypatch.setattr(group, "_reset_log", lambda digest: None)
+    group.compact()
+    reopened = WalGroup(storage)
+    with reopened.batch():
+        reopened.remove("Петрова Анна")
+    assert _fios(WalGroup(storage)) == ["Сидоров Пётр", "Беляев Тимофей"]
+
+
+def test_compact_inside_batch_is_refused(storage: Path) -> None:
+    group = WalGroup(storage)
+    csv_text = storage.read_text(encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with group.batch():
+            group.remove("Иванов Иван")
+            group.compact()
+    assert storage.read_text(encoding="utf-8") == csv_text
+    assert _fios(WalGroup(storage)) == [r[0] for r in ROWS]
+
+
+def test_compact_moves_find_index(storage: Path) -> None:
+    group = WalGroup(storage)
+    group.add_many(
+        Student(f"Студент {n}", "2003-09-09", "БИВТ-21-2", 4.0) for n in range(50)
+    )
+    assert len(group.find("студент 4")) == 11
+    group.remove_many(["Иванов Иван"] + [f"Студент {n}" for n in range(0, 50, 3)])
+    group.update_many({"Студент 4": {"fio": "Студентка 4"}})
+    group.compact()
+    assert group._grams is not None  # перенесён, а не сброшен до следующего find
+    names = [s.fio.casefold() for s in group.list()]
+    for needle in ("студент 4", "ка 4", "ов", "анна"):
+        assert [s.fio.casefold() for s in group.find(needle)] == [
+            n for n in names if needle in n
+        ]